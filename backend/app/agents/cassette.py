@@ -0,0 +1,164 @@
+"""
+Record and replay provider calls ("cassettes") for offline benchmarks and
+regression tests.
+
+A cassette is a JSON Lines file, gzip-compressed when its name ends in
+``.gz``, with one record per provider call: the request key, the model and
+prompt template, the response text, token usage and latency. Prompts are
+not stored, only a SHA-256 of the prompt and prompt cache key, so
+cassettes hold no resume text.
+
+``RecordingClient`` wraps an OpenAI client and appends a record for every
+successful ``responses.create`` call. ``ReplayClient`` stands in for the
+OpenAI client and answers from a cassette. It can sleep for the recorded
+latency, scaled by ``latency_scale``. Calls with the same key are replayed
+in recorded order, starting over after the last one.
+"""
+import gzip
+import hashlib
+import json
+import logging
+import threading
+import time
+from dataclasses import asdict, dataclass
+from types import SimpleNamespace
+from typing import Any, Optional
+
+from app.core.runtime_metrics import runtime_metrics
+
+logger = logging.getLogger("ai_job_assistant.cassette")
+
+
+class CassetteMiss(LookupError):
+    """The cassette has no recording for a request."""
+
+
+@dataclass
+class CassetteRecord:
+    key: str
+    model: str
+    prompt_cache_key: Optional[str]
+    input_chars: int
+    text: str
+    input_tokens: int
+    output_tokens: int
+    cached_tokens: int
+    latency_ms: float
+
+
+def request_key(input: str, prompt_cache_key: Optional[str] = None) -> str:
+    """Replay key of a request. The model is left out so recordings replay under any model."""
+    digest = hashlib.sha256((prompt_cache_key or "").encode() + b"\0" + input.encode())
+    return digest.hexdigest()
+
+
+def _open(path: str, mode: str):
+    if path.endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+def load_cassette(path: str) -> list[CassetteRecord]:
+    with _open(path, "r") as handle:
+        return [CassetteRecord(**json.loads(line)) for line in handle if line.strip()]
+
+
+class RecordingClient:
+    """An OpenAI client wrapper that appends every successful call to a cassette."""
+
+    def __init__(self, client: Any, path: str) -> None:
+        self.path = path
+        self.responses = _RecordingResponses(client.responses, path)
+        self._client = client
+
+    def with_options(self, **options) -> Any:
+        return self._client.with_options(**options)
+
+    @property
+    def models(self) -> Any:
+        return self._client.models
+
+
+class _RecordingResponses:
+    # One lock for all recorders: several endpoints may share a cassette.
+    _lock = threading.Lock()
+
+    def __init__(self, responses: Any, path: str) -> None:
+        self._responses = responses
+        self._path = path
+
+    def create(self, *, model: str, input: str, prompt_cache_key: Optional[str] = None, **kwargs):
+        started = time.perf_counter()
+        response = self._responses.create(
+            model=model, input=input, prompt_cache_key=prompt_cache_key, **kwargs
+        )
+        latency_ms = (time.perf_counter() - started) * 1000
+
+        usage = getattr(response, "usage", None)
+        details = getattr(usage, "input_tokens_details", None)
+        record = CassetteRecord(
+            key=request_key(input, prompt_cache_key),
+            model=model,
+            prompt_cache_key=prompt_cache_key,
+            input_chars=len(input),
+            text=response.output[0].content[0].text,
+            input_tokens=getattr(usage, "input_tokens", 0) or 0,
+            output_tokens=getattr(usage, "output_tokens", 0) or 0,
+            cached_tokens=getattr(details, "cached_tokens", 0) or 0,
+            latency_ms=round(latency_ms, 3),
+        )
+        line = json.dumps(asdict(record), separators=(",", ":")) + "\n"
+        with self._lock:
+            # Opened per record so the file stays valid if the process dies;
+            # appended gzip members are read back as one stream.
+            with _open(self._path, "a") as handle:
+                handle.write(line)
+        return response
+
+
+class ReplayClient:
+    """Serves responses.create() calls from a cassette instead of the network."""
+
+    def __init__(self, records: list[CassetteRecord], latency_scale: float = 0.0) -> None:
+        self.latency_scale = latency_scale
+        self.responses = self
+        self._records: dict[str, list[CassetteRecord]] = {}
+        for record in records:
+            self._records.setdefault(record.key, []).append(record)
+        self._next: dict[str, int] = {}
+        self._lock = threading.Lock()
+        self.models = SimpleNamespace(list=lambda: [])
+
+    @classmethod
+    def from_path(cls, path: str, latency_scale: float = 0.0) -> "ReplayClient":
+        records = load_cassette(path)
+        logger.info("cassette loaded path=%s records=%d", path, len(records))
+        return cls(records, latency_scale)
+
+    def with_options(self, **options) -> "ReplayClient":
+        return self
+
+    def create(self, *, model: str, input: str, prompt_cache_key: Optional[str] = None, **kwargs):
+        key = request_key(input, prompt_cache_key)
+        with self._lock:
+            recorded = self._records.get(key)
+            if not recorded:
+                runtime_metrics.incr("cassette.misses")
+                raise CassetteMiss(
+                    f"no recording for prompt template={prompt_cache_key} chars={len(input)}"
+                )
+            index = self._next.get(key, 0)
+            self._next[key] = (index + 1) % len(recorded)
+        record = recorded[index]
+        runtime_metrics.incr("cassette.hits")
+
+        if self.latency_scale > 0:
+            time.sleep(record.latency_ms * self.latency_scale / 1000)
+        return SimpleNamespace(
+            output=[SimpleNamespace(content=[SimpleNamespace(text=record.text)])],
+            usage=SimpleNamespace(
+                input_tokens=record.input_tokens,
+                output_tokens=record.output_tokens,
+                input_tokens_details=SimpleNamespace(cached_tokens=record.cached_tokens),
+            ),
+        )
@@ -1,13 +1,31 @@
+from concurrent.futures import ThreadPoolExecutor
+import contextvars
 from enum import Enum
 import logging
+import threading
+import time
 from typing import Optional, Tuple
-from openai import OpenAI
 
+from app.agents.provider_pool import ProviderPool, build_pool
+from app.agents.prompts import (
+    INTERVIEW_ANSWER,
+    RESUME_SUMMARY,
+    RESUME_SUMMARY_PART,
+    RESUME_SUMMARY_REDUCE,
+    PromptTemplate,
+)
 from app.core.config import settings
+from app.core.rate_limit import LLMQuotaExceeded, charge_llm_call, charge_llm_tokens
+from app.core.request_context import add_timing, timed
+from app.core.runtime_metrics import runtime_metrics
+from app.services.resume_parser import ParsedResume, compact_resume_text, is_section_heading
 
 logger = logging.getLogger("ai_job_assistant.agent")
 
-client = OpenAI(api_key=settings.openai_api_key) if settings.openai_api_key else None
+# Built on first use so the openai SDK is only imported when that provider is
+# actually selected (stub deployments and test collection never load it).
+pool: Optional[ProviderPool] = None
+_pool_lock = threading.Lock()
 
 
 class LLMProvider(str, Enum):
@@ -15,17 +33,30 @@ class LLMProvider(str, Enum):
     OPENAI = "openai"
 
 
-def summarize_resume(resume_text: str) -> tuple[str, str]:
+def summarize_resume(
+    resume_text: str, parsed: Optional[ParsedResume] = None
+) -> tuple[str, str]:
+    """
+    Summarize a resume. When the locally parsed facts are passed in, the
+    provider prompt leads with them and omits the raw skills section.
+    """
+    with timed("provider"):
+        return _summarize_resume(resume_text, parsed)
+
+
+def _summarize_resume(
+    resume_text: str, parsed: Optional[ParsedResume]
+) -> tuple[str, str]:
     provider = _get_provider()
 
     if provider is LLMProvider.STUB:
-        return _summarize_resume_stub(resume_text), "stub"
+        return _summarize_resume_stub(resume_text, parsed), "stub"
 
     if provider is LLMProvider.OPENAI:
-        return _summarize_resume_openai(resume_text)
+        return _summarize_resume_openai(resume_text, parsed)
 
     logger.warning("unknown llm provider %s, falling back to stub", settings.llm_provider)
-    return _summarize_resume_stub(resume_text), "stub"
+    return _summarize_resume_stub(resume_text, parsed), "stub"
 
 
 def generate_interview_answer(
@@ -33,6 +64,21 @@ def generate_interview_answer(
     job_title: Optional[str] = None,
     company_name: Optional[str] = None,
     resume_summary: Optional[str] = None,
+) -> tuple[str, str]:
+    with timed("provider"):
+        return _generate_interview_answer(
+            question=question,
+            job_title=job_title,
+            company_name=company_name,
+            resume_summary=resume_summary,
+        )
+
+
+def _generate_interview_answer(
+    question: str,
+    job_title: Optional[str],
+    company_name: Optional[str],
+    resume_summary: Optional[str],
 ) -> tuple[str, str]:
     provider = _get_provider()
 
@@ -61,6 +107,49 @@ def generate_interview_answer(
     ), "stub"
 
 
+def get_pool() -> Optional[ProviderPool]:
+    """Return the shared provider pool, creating it on first call."""
+    global pool
+    if pool is None:
+        with _pool_lock:
+            if pool is None:
+                pool = build_pool(settings)
+    return pool
+
+
+def provider_status() -> list[dict]:
+    """Per-endpoint stats of the provider pool, for /status."""
+    if _get_provider() is not LLMProvider.OPENAI:
+        return []
+    provider_pool = get_pool()
+    return provider_pool.snapshot() if provider_pool is not None else []
+
+
+def warm_up() -> None:
+    """
+    Prepare the configured provider during application startup.
+
+    For OpenAI this imports the SDK and builds each endpoint's client up
+    front so the first request does not pay for it. With PREWARM_PROVIDER
+    enabled it also makes one cheap API call per endpoint to open a pooled
+    connection.
+    """
+    if _get_provider() is not LLMProvider.OPENAI:
+        return
+
+    provider_pool = get_pool()
+    if provider_pool is None:
+        return
+
+    for endpoint, openai_client in provider_pool.clients():
+        if not settings.prewarm_provider:
+            continue
+        try:
+            openai_client.with_options(timeout=5.0, max_retries=0).models.list()
+        except Exception as exc:
+            logger.warning("OpenAI connection pre-warm failed endpoint=%s: %s", endpoint.name, exc)
+
+
 def _get_provider() -> LLMProvider:
     try:
         return LLMProvider(settings.llm_provider)
@@ -69,15 +158,23 @@ def _get_provider() -> LLMProvider:
         return LLMProvider.STUB
 
 
-def _summarize_resume_stub(resume_text: str) -> str:
+def _summarize_resume_stub(
+    resume_text: str, parsed: Optional[ParsedResume] = None
+) -> str:
     lines = [line.strip() for line in resume_text.splitlines() if line.strip()]
     word_count = len(resume_text.split())
     line_count = len(lines)
 
-    return (
+    summary = (
         f"Basic analysis only. Approximate word count: {word_count}. "
         f"Non-empty line count: {line_count}."
     )
+    if parsed is not None:
+        if parsed.years_experience is not None:
+            summary += f" Years of experience: about {parsed.years_experience:g}."
+        if parsed.skills:
+            summary += f" Skills: {', '.join(parsed.skills[:10])}."
+    return summary
 
 
 def _generate_interview_answer_stub(
@@ -108,34 +205,221 @@ def _generate_interview_answer_stub(
     return " | ".join(parts)
 
 
-def _summarize_resume_openai(resume_text: str) -> tuple[str, str]:
-    if not settings.openai_api_key or client is None:
+def _summarize_resume_openai(
+    resume_text: str, parsed: Optional[ParsedResume]
+) -> tuple[str, str]:
+    if get_pool() is None:
         logger.warning(
             "OpenAI provider selected without API key; using stub summarization instead"
         )
-        return _summarize_resume_stub(resume_text), "stub"
+        return _summarize_resume_stub(resume_text, parsed), "stub"
+
+    facts_block = ""
+    prompt_text = resume_text
+    if parsed is not None:
+        prompt_text = compact_resume_text(resume_text, parsed)
+        facts = parsed.prompt_facts()
+        if facts:
+            facts_block = f"EXTRACTED FACTS:\n{facts}"
+
+    if len(prompt_text) > settings.summary_map_reduce_threshold_chars:
+        return _summarize_resume_openai_map_reduce(prompt_text, facts_block, resume_text, parsed)
 
     logger.info(
-        "OpenAI summarization requested with model=%s",
+        "OpenAI summarization requested with model=%s chars=%d original_chars=%d",
         settings.openai_model,
+        len(prompt_text),
+        len(resume_text),
     )
 
-    prompt = (
-        "You are a job coach assistant. Summarize the candidate's resume in 3–5 sentences. "
-        "Focus on their experience level, main skills, and the type of roles they seem suited for.\n\n"
-        f"RESUME:\n{resume_text}"
-    )
+    prompt = RESUME_SUMMARY.render(facts_block, f"RESUME:\n{prompt_text}")
 
     try:
-        response = client.responses.create(
-            model=settings.openai_model,
-            input=prompt,
-        )
-        summary = response.output[0].content[0].text
+        summary = _create_response_text(prompt, RESUME_SUMMARY)
         return summary.strip(), "openai"
+    except LLMQuotaExceeded:
+        raise
     except Exception as exc:
         logger.error("OpenAI summarization failed: %s", exc)
-        return _summarize_resume_stub(resume_text), "stub"
+        return _summarize_resume_stub(resume_text, parsed), "stub"
+
+
+def _summarize_resume_openai_map_reduce(
+    prompt_text: str,
+    facts_block: str,
+    resume_text: str,
+    parsed: Optional[ParsedResume],
+) -> tuple[str, str]:
+    """
+    Summarize a long resume in two stages.
+
+    The resume is split into section-aligned chunks, each chunk is summarized
+    in parallel (bounded by summary_map_concurrency), and the partial
+    summaries are reduced into the final 3–5 sentence summary. The parsed
+    facts, when present, are only sent with the reduce prompt. Stage
+    timings go to the summary.split/map/reduce histograms and to the
+    request's Server-Timing.
+    """
+    started = time.perf_counter()
+    chunks = _chunk_resume(prompt_text, settings.summary_chunk_chars)
+    split_ms = (time.perf_counter() - started) * 1000
+
+    logger.info(
+        "OpenAI map-reduce summarization requested with model=%s chars=%d chunks=%d",
+        settings.openai_model,
+        len(prompt_text),
+        len(chunks),
+    )
+
+    map_prompts = [
+        RESUME_SUMMARY_PART.render(f"RESUME PART {index} OF {len(chunks)}:\n{chunk}")
+        for index, chunk in enumerate(chunks, start=1)
+    ]
+
+    try:
+        map_started = time.perf_counter()
+        workers = max(1, min(settings.summary_map_concurrency, len(map_prompts)))
+        with ThreadPoolExecutor(max_workers=workers) as map_pool:
+            # Run each map call in a copy of the caller's context so token
+            # usage is still charged to the current request.
+            futures = [
+                map_pool.submit(
+                    contextvars.copy_context().run,
+                    _create_response_text,
+                    prompt,
+                    RESUME_SUMMARY_PART,
+                )
+                for prompt in map_prompts
+            ]
+            partials = [future.result().strip() for future in futures]
+        map_ms = (time.perf_counter() - map_started) * 1000
+
+        reduce_started = time.perf_counter()
+        numbered = "\n".join(
+            f"{index}. {partial}" for index, partial in enumerate(partials, start=1)
+        )
+        reduce_prompt = RESUME_SUMMARY_REDUCE.render(facts_block, f"PART SUMMARIES:\n{numbered}")
+        summary = _create_response_text(reduce_prompt, RESUME_SUMMARY_REDUCE)
+        reduce_ms = (time.perf_counter() - reduce_started) * 1000
+    except LLMQuotaExceeded:
+        raise
+    except Exception as exc:
+        logger.error("OpenAI map-reduce summarization failed: %s", exc)
+        return _summarize_resume_stub(resume_text, parsed), "stub"
+
+    for stage, elapsed_ms in (("split", split_ms), ("map", map_ms), ("reduce", reduce_ms)):
+        runtime_metrics.observe(f"summary.{stage}", elapsed_ms)
+        add_timing(f"summary_{stage}", elapsed_ms)
+    logger.info(
+        "OpenAI map-reduce summarization timings chunks=%d split_ms=%.2f map_ms=%.2f reduce_ms=%.2f",
+        len(chunks),
+        split_ms,
+        map_ms,
+        reduce_ms,
+    )
+    return summary.strip(), "openai"
+
+
+def _chunk_resume(resume_text: str, max_chars: int) -> list[str]:
+    """
+    Pack resume sections into chunks of at most max_chars characters.
+
+    Whole sections are kept together where they fit; a section longer than
+    max_chars is split on line boundaries (and a single overlong line is cut).
+    """
+    chunks: list[str] = []
+    current = ""
+
+    for section in _split_resume_sections(resume_text):
+        for piece in _split_oversized(section, max_chars):
+            if current and len(current) + 1 + len(piece) > max_chars:
+                chunks.append(current)
+                current = piece
+            else:
+                current = f"{current}\n{piece}" if current else piece
+
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def _split_resume_sections(resume_text: str) -> list[str]:
+    sections: list[list[str]] = [[]]
+    for line in resume_text.splitlines():
+        if is_section_heading(line) and any(part.strip() for part in sections[-1]):
+            sections.append([])
+        sections[-1].append(line)
+
+    return [
+        "\n".join(lines).strip()
+        for lines in sections
+        if any(line.strip() for line in lines)
+    ]
+
+
+def _split_oversized(text: str, max_chars: int) -> list[str]:
+    if len(text) <= max_chars:
+        return [text]
+
+    pieces: list[str] = []
+    current = ""
+    for line in text.splitlines():
+        while len(line) > max_chars:
+            if current:
+                pieces.append(current)
+                current = ""
+            pieces.append(line[:max_chars])
+            line = line[max_chars:]
+        if current and len(current) + 1 + len(line) > max_chars:
+            pieces.append(current)
+            current = line
+        else:
+            current = f"{current}\n{line}" if current else line
+
+    if current.strip():
+        pieces.append(current)
+    return pieces
+
+
+def _create_response_text(prompt: str, template: PromptTemplate) -> str:
+    """
+    Send a rendered prompt. The template id is passed as the prompt cache
+    key so requests sharing its instructions are routed to the same cache,
+    and token usage, including the cached part of the input, is counted
+    per template version. The call is charged to the client's daily LLM
+    quota before it is sent (failovers and hedges are not charged again).
+    """
+    charge_llm_call()
+    started = time.perf_counter()
+    try:
+        response = get_pool().call(
+            lambda client, endpoint: client.responses.create(
+                model=endpoint.model,
+                input=prompt,
+                prompt_cache_key=template.id,
+            ),
+            kind=template.id,
+        )
+    except Exception:
+        runtime_metrics.incr("provider.errors")
+        raise
+    finally:
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        runtime_metrics.incr("provider.calls")
+        runtime_metrics.observe("provider.call", elapsed_ms)
+        runtime_metrics.observe(f"prompt.{template.id}.call", elapsed_ms)
+
+    usage = getattr(response, "usage", None)
+    if usage is not None:
+        details = getattr(usage, "input_tokens_details", None)
+        cached_tokens = getattr(details, "cached_tokens", None) or 0
+        runtime_metrics.incr("provider.input_tokens", usage.input_tokens)
+        runtime_metrics.incr("provider.output_tokens", usage.output_tokens)
+        runtime_metrics.incr("provider.cached_tokens", cached_tokens)
+        runtime_metrics.incr(f"prompt.{template.id}.input_tokens", usage.input_tokens)
+        runtime_metrics.incr(f"prompt.{template.id}.cached_tokens", cached_tokens)
+        charge_llm_tokens(usage.input_tokens + usage.output_tokens)
+    return response.output[0].content[0].text
 
 
 def _generate_interview_answer_openai(
@@ -144,7 +428,7 @@ def _generate_interview_answer_openai(
     company_name: Optional[str],
     resume_summary: Optional[str],
 ) -> tuple[str, str]:
-    if not settings.openai_api_key or client is None:
+    if get_pool() is None:
         logger.warning(
             "OpenAI provider selected without API key; using stub answer generation instead"
         )
@@ -162,52 +446,32 @@ def _generate_interview_answer_openai(
         company_name,
     )
 
-    role_line = f"Target role: {job_title}." if job_title else ""
-    company_line = f"Company: {company_name}." if company_name else ""
-
-    resume_block = ""
     if resume_summary:
-        resume_block = (
-            "The candidate background summary is between the markers "
-            "<SUMMARY_START> and <SUMMARY_END>.\n"
-            "<SUMMARY_START>\n"
-            f"{resume_summary}\n"
-            "<SUMMARY_END>\n\n"
-        )
+        resume_block = f"<SUMMARY_START>\n{resume_summary}\n<SUMMARY_END>"
     else:
         resume_block = (
             "No background summary is available. "
-            "Give a helpful but general answer that could apply to a junior backend developer.\n\n"
+            "Give a helpful but general answer that could apply to a junior backend developer."
         )
-
-    prompt = (
-        "You are an interview coach helping a candidate prepare for a job interview.\n"
-        "You are writing the answer AS THE CANDIDATE, in first person (using 'I').\n"
-        "Follow these rules strictly:\n"
-        "1) When a background summary is provided, you must base the answer ONLY on information in that summary.\n"
-        "2) Do NOT claim that the summary is missing or unavailable when it is present.\n"
-        "3) Do NOT mention the words 'summary', 'candidate', 'markers', 'AI', or how you generated the answer.\n"
-        "4) Do NOT invent projects, responsibilities, technologies, or domains that are not clearly supported by the summary.\n"
-        "5) If a detail is not in the summary, keep that part of the answer general.\n\n"
-        f"{role_line}\n"
-        f"{company_line}\n"
-        f"{resume_block}"
-        "Write a spoken-style answer to the interview question below.\n"
-        "Structure the answer as:\n"
-        "1) One sentence that directly answers the question.\n"
-        "2) 2–3 short, concrete examples that clearly match the background from the summary.\n"
-        "3) One sentence that connects their experience back to the role and company.\n\n"
-        f"Interview question: {question}"
+    target_lines = []
+    if job_title:
+        target_lines.append(f"Target role: {job_title}.")
+    if company_name:
+        target_lines.append(f"Company: {company_name}.")
+
+    # Static instructions first, then the summary (shared by every question
+    # about the same resume), then what is specific to this question.
+    prompt = INTERVIEW_ANSWER.render(
+        resume_block,
+        "\n".join(target_lines),
+        f"Interview question: {question}",
     )
 
-
     try:
-        response = client.responses.create(
-            model=settings.openai_model,
-            input=prompt,
-        )
-        answer = response.output[0].content[0].text
+        answer = _create_response_text(prompt, INTERVIEW_ANSWER)
         return answer.strip(), "openai"
+    except LLMQuotaExceeded:
+        raise
     except Exception as exc:
         logger.error("OpenAI answer generation failed: %s", exc)
         return _generate_interview_answer_stub(
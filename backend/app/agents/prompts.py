@@ -0,0 +1,85 @@
+"""
+Versioned prompt templates for the OpenAI provider.
+
+Each template's instructions are a fixed string that is sent first and
+never varies between requests, so the provider's automatic prompt caching
+can reuse it. Per-request content follows, ordered from the most to the
+least reusable (a resume summary is sent with many questions, a question
+only once). Change the wording by adding a new version rather than editing
+one in place, so cached-token and latency counters stay comparable per
+version.
+"""
+from dataclasses import dataclass
+from typing import Optional
+
+
+@dataclass(frozen=True)
+class PromptTemplate:
+    name: str
+    version: int
+    instructions: str
+
+    @property
+    def id(self) -> str:
+        """Stable identifier, used in metrics and as the prompt cache key."""
+        return f"{self.name}.v{self.version}"
+
+    def render(self, *sections: Optional[str]) -> str:
+        """The instructions followed by the non-empty sections, in order."""
+        return "\n\n".join([self.instructions, *(section for section in sections if section)])
+
+
+RESUME_SUMMARY = PromptTemplate(
+    name="resume_summary",
+    version=2,
+    instructions=(
+        "You are a job coach assistant. Summarize the candidate's resume in 3–5 sentences. "
+        "Focus on their experience level, main skills, and the type of roles they seem suited for. "
+        "When EXTRACTED FACTS are given, they were read from the resume by a parser; "
+        "use them together with the resume text."
+    ),
+)
+
+RESUME_SUMMARY_PART = PromptTemplate(
+    name="resume_summary_part",
+    version=2,
+    instructions=(
+        "You are a job coach assistant. The text below is one part of a candidate's resume. "
+        "Summarize the facts it contains in 2–3 sentences: "
+        "roles, years of experience, skills, and notable achievements. "
+        "Do not speculate about parts of the resume you cannot see."
+    ),
+)
+
+RESUME_SUMMARY_REDUCE = PromptTemplate(
+    name="resume_summary_reduce",
+    version=2,
+    instructions=(
+        "You are a job coach assistant. Below are summaries of consecutive parts of one "
+        "candidate's resume. Combine them into a single summary of 3–5 sentences. "
+        "Focus on their experience level, main skills, and the type of roles they seem suited for."
+    ),
+)
+
+INTERVIEW_ANSWER = PromptTemplate(
+    name="interview_answer",
+    version=2,
+    instructions=(
+        "You are an interview coach helping a candidate prepare for a job interview.\n"
+        "You are writing the answer AS THE CANDIDATE, in first person (using 'I').\n"
+        "Follow these rules strictly:\n"
+        "1) When a background summary is provided, you must base the answer ONLY on information in that summary.\n"
+        "2) Do NOT claim that the summary is missing or unavailable when it is present.\n"
+        "3) Do NOT mention the words 'summary', 'candidate', 'markers', 'AI', or how you generated the answer.\n"
+        "4) Do NOT invent projects, responsibilities, technologies, or domains that are not clearly supported by the summary.\n"
+        "5) If a detail is not in the summary, keep that part of the answer general.\n\n"
+        "Write a spoken-style answer to the interview question given at the end.\n"
+        "Structure the answer as:\n"
+        "1) One sentence that directly answers the question.\n"
+        "2) 2–3 short, concrete examples that clearly match the background from the summary.\n"
+        "3) One sentence that connects their experience back to the role and company.\n\n"
+        "The candidate background summary, when available, is between the markers "
+        "<SUMMARY_START> and <SUMMARY_END>. The target role and company, when known, "
+        "come right before the question."
+    ),
+)
@@ -0,0 +1,466 @@
+"""
+Pool of OpenAI-compatible endpoints (regions, proxies, the local fake).
+
+Each call goes to one endpoint picked at random, in proportion to its
+configured weight scaled by how fast it has recently been (an EWMA of its
+call latency). When the call fails with a connection error, a timeout, a
+429, a 5xx, or a 401, 403 or 404 (a key or model the endpoint does not
+accept), the next endpoint is tried. After PROVIDER_FAILURE_THRESHOLD
+failures in a row an endpoint is left out for PROVIDER_COOLDOWN_SECONDS,
+then tried again.
+
+With hedging on, a call that has not returned within a percentile of the
+recent latency of its kind of request gets a second, identical request,
+sent to the next endpoint in line (or the same one when there is only
+one). The first successful response wins. Hedges are limited by a budget:
+each call earns HEDGE_BUDGET_PERCENT / 100 of a hedge.
+
+Hedged calls run their attempts on the pool's own executor, sized from
+HEDGE_MAX_WORKERS and never below ADMISSION_MAX_PROVIDER_CALLS. The hedge
+delay is counted from when the first attempt starts running, so time
+queued for a worker never triggers a hedge, and no hedge is sent while
+every worker is busy.
+"""
+import contextvars
+import logging
+import math
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, Callable, Optional, TypeVar
+
+from app.agents.cassette import CassetteMiss, RecordingClient, ReplayClient
+from app.core.admission import admission
+from app.core.config import Settings
+from app.core.runtime_metrics import runtime_metrics
+
+logger = logging.getLogger("ai_job_assistant.provider_pool")
+
+T = TypeVar("T")
+
+# 4xx errors another endpoint may not return: timeouts and rate limits, and
+# auth and not-found errors, which come from one endpoint's key, deployment
+# or model name. Other 4xx (400, 422) are about the request itself and would
+# fail the same way everywhere, so they are final.
+_RETRYABLE_STATUS = {401, 403, 404, 408, 409, 429}
+# Latencies kept per kind of request to compute the hedge delay from.
+_LATENCY_WINDOW = 500
+# Unused hedge budget is capped so a quiet period cannot save up a burst.
+_MAX_HEDGE_TOKENS = 10.0
+
+
+@dataclass
+class ProviderEndpoint:
+    name: str
+    api_key: Optional[str]
+    model: str
+    base_url: Optional[str] = None
+    weight: float = 1.0
+    # A prebuilt OpenAI client; built from api_key and base_url when None.
+    client: Any = field(default=None, repr=False)
+
+
+@dataclass
+class _EndpointState:
+    endpoint: ProviderEndpoint
+    ewma_ms: Optional[float] = None
+    calls: int = 0
+    errors: int = 0
+    consecutive_failures: int = 0
+    unhealthy_until: float = 0.0
+
+
+def is_retryable(exc: BaseException) -> bool:
+    """Whether another endpoint might succeed where this one failed."""
+    if isinstance(exc, CassetteMiss):
+        # Every endpoint replays the same cassette, and a missing recording
+        # says nothing about the endpoint's health.
+        return False
+    status_code = getattr(exc, "status_code", None)
+    if status_code is None:
+        # Connection errors and timeouts carry no status.
+        return True
+    return status_code >= 500 or status_code in _RETRYABLE_STATUS
+
+
+class ProviderPool:
+    def __init__(
+        self,
+        endpoints: list[ProviderEndpoint],
+        ewma_alpha: float = 0.2,
+        failure_threshold: int = 3,
+        cooldown_seconds: float = 30.0,
+        hedge_percentile: Optional[float] = None,
+        hedge_budget_percent: float = 5.0,
+        hedge_min_samples: int = 20,
+        hedge_workers: int = 32,
+        record_path: Optional[str] = None,
+        rng: Optional[random.Random] = None,
+    ) -> None:
+        if not endpoints:
+            raise ValueError("a provider pool needs at least one endpoint")
+        names = [endpoint.name for endpoint in endpoints]
+        if len(set(names)) != len(names):
+            raise ValueError("provider endpoint names must be unique")
+        if any(endpoint.weight <= 0 for endpoint in endpoints):
+            raise ValueError("provider endpoint weights must be positive")
+        if hedge_percentile is not None and not 0 < hedge_percentile < 100:
+            raise ValueError("hedge_percentile must be between 0 and 100")
+        self.ewma_alpha = ewma_alpha
+        self.failure_threshold = failure_threshold
+        self.cooldown_seconds = cooldown_seconds
+        self.hedge_percentile = hedge_percentile
+        self.hedge_budget_percent = hedge_budget_percent
+        self.hedge_min_samples = hedge_min_samples
+        self.hedge_workers = hedge_workers
+        # Cassette that clients built by the pool record their calls to.
+        self.record_path = record_path
+        self._states = [_EndpointState(endpoint) for endpoint in endpoints]
+        self._rng = rng or random.Random()
+        self._lock = threading.Lock()
+        self._client_lock = threading.Lock()
+        self._latencies: dict[str, deque] = {}
+        self._hedge_tokens = 0.0
+        self._executor: Optional[ThreadPoolExecutor] = None
+        # Attempts submitted to the executor and not finished yet.
+        self._executor_busy = 0
+
+    @property
+    def endpoints(self) -> list[ProviderEndpoint]:
+        return [state.endpoint for state in self._states]
+
+    def call(self, request: Callable[[Any, ProviderEndpoint], T], kind: str = "") -> T:
+        """
+        Run ``request(client, endpoint)`` on the preferred endpoint, failing
+        over to the others in order. Raises the last error when all fail.
+
+        ``kind`` groups calls with similar latency (e.g. one prompt template)
+        for the hedge delay.
+        """
+        route = self._route()
+        delay = self._hedge_delay(kind)
+        if delay is None:
+            return self._call_in_order(request, route, kind)
+        return self._call_hedged(request, route, kind, delay)
+
+    def _call_in_order(
+        self,
+        request: Callable[[Any, ProviderEndpoint], T],
+        route: list,
+        kind: str,
+    ) -> T:
+        last_error: Optional[BaseException] = None
+        for attempt, state in enumerate(route):
+            if attempt:
+                runtime_metrics.incr("provider.failovers")
+            try:
+                return self._attempt(request, state, kind)
+            except Exception as exc:
+                if not is_retryable(exc):
+                    raise
+                last_error = exc
+        assert last_error is not None
+        raise last_error
+
+    def _call_hedged(
+        self,
+        request: Callable[[Any, ProviderEndpoint], T],
+        route: list,
+        kind: str,
+        delay_ms: float,
+    ) -> T:
+        """
+        Like _call_in_order, but with the attempts on the pool's executor so
+        the calling thread can return a hedge that answers first. The losing
+        request is abandoned; the synchronous SDK cannot abort it, so it
+        runs to the end on its thread and its result is dropped.
+        """
+        executor = self._get_executor()
+        remaining = list(route)
+        pending: dict[Future, bool] = {}
+        started = threading.Event()
+
+        def run(state: _EndpointState, first_attempt: bool) -> T:
+            if first_attempt:
+                started.set()
+            try:
+                return self._attempt(request, state, kind)
+            finally:
+                with self._lock:
+                    self._executor_busy -= 1
+
+        def submit(state: _EndpointState, hedge: bool, first_attempt: bool = False) -> None:
+            with self._lock:
+                self._executor_busy += 1
+            context = contextvars.copy_context()
+            pending[executor.submit(context.run, run, state, first_attempt)] = hedge
+
+        first = remaining.pop(0)
+        submit(first, hedge=False, first_attempt=True)
+        # The hedge clock starts when the first attempt starts running.
+        started.wait()
+        hedge_due: Optional[float] = delay_ms / 1000
+        last_error: Optional[BaseException] = None
+        try:
+            while pending:
+                done, _ = wait(pending, timeout=hedge_due, return_when=FIRST_COMPLETED)
+                if not done:
+                    hedge_due = None
+                    if not self._has_idle_worker():
+                        # A hedge would only queue behind the busy workers.
+                        runtime_metrics.incr("provider.hedges_no_capacity")
+                    elif self._take_hedge_token():
+                        runtime_metrics.incr("provider.hedges")
+                        submit(remaining.pop(0) if remaining else first, hedge=True)
+                    else:
+                        runtime_metrics.incr("provider.hedges_over_budget")
+                    continue
+                for future in done:
+                    hedge = pending.pop(future)
+                    try:
+                        result = future.result()
+                    except Exception as exc:
+                        if not is_retryable(exc):
+                            raise
+                        last_error = exc
+                        continue
+                    if hedge:
+                        runtime_metrics.incr("provider.hedge_wins")
+                    return result
+                if not pending and remaining:
+                    runtime_metrics.incr("provider.failovers")
+                    submit(remaining.pop(0), hedge=False)
+        finally:
+            for future in pending:
+                future.cancel()
+        assert last_error is not None
+        raise last_error
+
+    def _attempt(
+        self,
+        request: Callable[[Any, ProviderEndpoint], T],
+        state: _EndpointState,
+        kind: str,
+    ) -> T:
+        started = time.perf_counter()
+        try:
+            with admission.provider_call():
+                result = request(self._client(state.endpoint), state.endpoint)
+        except Exception as exc:
+            retryable = is_retryable(exc)
+            self._record_failure(state, counts_against_health=retryable)
+            if retryable:
+                logger.warning(
+                    "provider endpoint failed name=%s error=%s", state.endpoint.name, exc
+                )
+            raise
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        self._record_success(state, elapsed_ms)
+        # Abandoned hedged attempts are recorded too when they finish, so the
+        # window keeps the real tail rather than the hedged one.
+        self._record_latency(kind, elapsed_ms)
+        return result
+
+    def _hedge_delay(self, kind: str) -> Optional[float]:
+        """The hedge delay in ms for ``kind``, or None when not hedging."""
+        if self.hedge_percentile is None:
+            return None
+        with self._lock:
+            # Every call earns its share of the hedge budget.
+            self._hedge_tokens = min(
+                _MAX_HEDGE_TOKENS, self._hedge_tokens + self.hedge_budget_percent / 100
+            )
+            latencies = self._latencies.get(kind)
+            if latencies is None or len(latencies) < self.hedge_min_samples:
+                return None
+            ordered = sorted(latencies)
+        index = min(len(ordered) - 1, math.ceil(self.hedge_percentile / 100 * len(ordered)) - 1)
+        return ordered[index]
+
+    def _take_hedge_token(self) -> bool:
+        with self._lock:
+            if self._hedge_tokens < 1:
+                return False
+            self._hedge_tokens -= 1
+            return True
+
+    def _record_latency(self, kind: str, elapsed_ms: float) -> None:
+        if self.hedge_percentile is None:
+            return
+        with self._lock:
+            latencies = self._latencies.get(kind)
+            if latencies is None:
+                latencies = self._latencies[kind] = deque(maxlen=_LATENCY_WINDOW)
+            latencies.append(elapsed_ms)
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            with self._client_lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.hedge_workers, thread_name_prefix="provider-call"
+                    )
+        return self._executor
+
+    def _has_idle_worker(self) -> bool:
+        with self._lock:
+            return self._executor_busy < self.hedge_workers
+
+    def snapshot(self) -> list[dict]:
+        """Per-endpoint health and stats for /status. Never includes keys."""
+        now = time.monotonic()
+        with self._lock:
+            return [
+                {
+                    "name": state.endpoint.name,
+                    "base_url": state.endpoint.base_url,
+                    "model": state.endpoint.model,
+                    "weight": state.endpoint.weight,
+                    "healthy": state.unhealthy_until <= now,
+                    "ewma_ms": round(state.ewma_ms, 2) if state.ewma_ms is not None else None,
+                    "calls": state.calls,
+                    "errors": state.errors,
+                    "consecutive_failures": state.consecutive_failures,
+                }
+                for state in self._states
+            ]
+
+    def _route(self) -> list[_EndpointState]:
+        """
+        Endpoints in the order to try them: one picked at random by effective
+        weight, then the other healthy ones by effective weight. When every
+        endpoint is cooling down, all are tried, soonest to recover first,
+        rather than failing without a call.
+        """
+        now = time.monotonic()
+        with self._lock:
+            healthy = [state for state in self._states if state.unhealthy_until <= now]
+            if not healthy:
+                return sorted(self._states, key=lambda state: state.unhealthy_until)
+            weights = self._effective_weights(healthy)
+            first = self._rng.choices(range(len(healthy)), weights=weights)[0]
+        rest = sorted(
+            (index for index in range(len(healthy)) if index != first),
+            key=lambda index: weights[index],
+            reverse=True,
+        )
+        return [healthy[first], *(healthy[index] for index in rest)]
+
+    @staticmethod
+    def _effective_weights(states: list[_EndpointState]) -> list[float]:
+        # Weight scaled by the fastest endpoint's latency over this one's.
+        # Endpoints without samples yet count as the fastest, so they are tried.
+        latencies = [state.ewma_ms for state in states if state.ewma_ms]
+        fastest = min(latencies) if latencies else 1.0
+        return [
+            state.endpoint.weight * fastest / (state.ewma_ms or fastest)
+            for state in states
+        ]
+
+    def _record_success(self, state: _EndpointState, elapsed_ms: float) -> None:
+        with self._lock:
+            state.calls += 1
+            state.consecutive_failures = 0
+            state.unhealthy_until = 0.0
+            if state.ewma_ms is None:
+                state.ewma_ms = elapsed_ms
+            else:
+                state.ewma_ms += self.ewma_alpha * (elapsed_ms - state.ewma_ms)
+
+    def _record_failure(self, state: _EndpointState, counts_against_health: bool) -> None:
+        with self._lock:
+            state.calls += 1
+            state.errors += 1
+            if not counts_against_health:
+                return
+            state.consecutive_failures += 1
+            if state.consecutive_failures < self.failure_threshold:
+                return
+            state.unhealthy_until = time.monotonic() + self.cooldown_seconds
+        runtime_metrics.incr("provider.endpoint_ejections")
+        logger.warning(
+            "provider endpoint marked unhealthy name=%s cooldown_s=%s",
+            state.endpoint.name,
+            self.cooldown_seconds,
+        )
+
+    def _client(self, endpoint: ProviderEndpoint) -> Any:
+        if endpoint.client is None:
+            with self._client_lock:
+                if endpoint.client is None:
+                    from openai import OpenAI
+
+                    options = {}
+                    if len(self._states) > 1:
+                        # Fail over right away instead of retrying one endpoint.
+                        options["max_retries"] = 0
+                    client = OpenAI(
+                        api_key=endpoint.api_key, base_url=endpoint.base_url, **options
+                    )
+                    if self.record_path:
+                        client = RecordingClient(client, self.record_path)
+                    endpoint.client = client
+        return endpoint.client
+
+    def clients(self) -> list[tuple[ProviderEndpoint, Any]]:
+        """Every endpoint with its client, building clients as needed."""
+        return [(state.endpoint, self._client(state.endpoint)) for state in self._states]
+
+
+def build_pool(config: Settings) -> Optional[ProviderPool]:
+    """
+    The pool described by OPENAI_ENDPOINTS, or a single endpoint from
+    OPENAI_API_KEY, OPENAI_BASE_URL and OPENAI_MODEL. Endpoints without an
+    API key are left out; None when no endpoint has one.
+
+    With LLM_CASSETTE_MODE=replay the pool has a single endpoint that
+    answers from the cassette at LLM_CASSETTE_PATH and needs no key; with
+    record, every endpoint's calls are appended to that cassette.
+    """
+    options = {
+        "ewma_alpha": config.provider_ewma_alpha,
+        "failure_threshold": config.provider_failure_threshold,
+        "cooldown_seconds": config.provider_cooldown_seconds,
+        "hedge_percentile": config.hedge_percentile if config.hedge_requests else None,
+        "hedge_budget_percent": config.hedge_budget_percent,
+        "hedge_min_samples": config.hedge_min_samples,
+        # Room for every provider call admission lets through.
+        "hedge_workers": max(config.hedge_max_workers, config.admission_max_provider_calls),
+    }
+    mode = config.llm_cassette_mode
+    if mode not in ("off", "record", "replay"):
+        raise ValueError(f"unknown LLM_CASSETTE_MODE {mode!r}")
+    if mode != "off" and not config.llm_cassette_path:
+        raise ValueError("LLM_CASSETTE_PATH is required to record or replay a cassette")
+    if mode == "replay":
+        client = ReplayClient.from_path(
+            config.llm_cassette_path, latency_scale=config.llm_cassette_latency_scale
+        )
+        endpoint = ProviderEndpoint("cassette", None, config.openai_model, client=client)
+        return ProviderPool([endpoint], **options)
+
+    specs = config.openai_endpoints or [
+        {
+            "name": "default",
+            "api_key": config.openai_api_key,
+            "base_url": config.openai_base_url,
+        }
+    ]
+    endpoints = [
+        ProviderEndpoint(
+            name=spec.get("name") or f"endpoint-{index}",
+            api_key=spec.get("api_key"),
+            model=spec.get("model") or config.openai_model,
+            base_url=spec.get("base_url") or None,
+            weight=float(spec.get("weight", 1.0)),
+        )
+        for index, spec in enumerate(specs, start=1)
+        if spec.get("api_key")
+    ]
+    if not endpoints:
+        return None
+    record_path = config.llm_cassette_path if mode == "record" else None
+    return ProviderPool(endpoints, record_path=record_path, **options)
@@ -1,7 +1,8 @@
 import logging
 
 from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, Header, HTTPException, status, Query
+from fastapi.responses import Response
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import Session
 
@@ -9,8 +10,21 @@ from app.agents.job_assistant import generate_interview_answer
 from app.core.db import get_db
 from app.models import InterviewAnswer, ResumeAnalysis, User
 from app.schemas import GenerateAnswerRequest, InterviewAnswerRead
-from app.core.config import settings
+from app.core.admission import admit_generation_request, record_queue_wait
 from app.core.auth import get_current_user_optional
+from app.core.rate_limit import (
+    enforce_llm_quota,
+    limit_generate_requests,
+    limit_read_requests,
+)
+from app.core.responses import serialized_response
+from app.services.read_queries import answer_read_columns
+from app.schemas.answer import interview_answer_adapter, interview_answer_list_adapter
+from app.schemas.dashboard import ResponseInclude, interview_answer_with_dashboard_adapter
+from app.services.activity_rollups import provider_fallback, record_activity
+from app.services.dashboard import build_dashboard
+from app.services.idempotency import MAX_KEY_LENGTH, request_fingerprint, run_idempotent
+from app.services.metrics_cache import invalidate_metrics
 
 router = APIRouter(
     prefix="/api",
@@ -24,12 +38,36 @@ logger = logging.getLogger("ai_job_assistant.answers")
     "/generate/answer",
     response_model=InterviewAnswerRead,
     status_code=status.HTTP_201_CREATED,
+    dependencies=[
+        Depends(admit_generation_request),
+        Depends(record_queue_wait),
+        Depends(limit_generate_requests),
+        Depends(enforce_llm_quota),
+    ],
 )
 def generate_answer(
     payload: GenerateAnswerRequest,
+    include: ResponseInclude | None = Query(default=None),
+    idempotency_key: str | None = Header(default=None, min_length=1, max_length=MAX_KEY_LENGTH),
     db: Session = Depends(get_db),
     current_user: User | None = Depends(get_current_user_optional),
-) -> InterviewAnswerRead:
+) -> Response:
+    return run_idempotent(
+        db,
+        idempotency_key,
+        "generate.answer",
+        current_user.id if current_user is not None else None,
+        request_fingerprint(payload.model_dump(mode="json"), include),
+        lambda: _generate_answer(payload, include, db, current_user),
+    )
+
+
+def _generate_answer(
+    payload: GenerateAnswerRequest,
+    include: ResponseInclude | None,
+    db: Session,
+    current_user: User | None,
+) -> Response:
     if current_user is not None and payload.user_id is not None:
         if current_user.id != payload.user_id:
             logger.warning(
@@ -47,7 +85,10 @@ def generate_answer(
         payload.user_id = current_user.id
 
     user = None
-    if payload.user_id is not None:
+    if current_user is not None and payload.user_id == current_user.id:
+        # Already loaded by get_current_user_optional; avoid a second lookup.
+        user = current_user
+    elif payload.user_id is not None:
         user = db.query(User).filter(User.id == payload.user_id).first()
         if not user:
             logger.warning("generate answer for missing user_id=%s", payload.user_id)
@@ -87,6 +128,12 @@ def generate_answer(
                 detail="Resume analysis does not belong to the specified user.",
             )
 
+    if include is ResponseInclude.DASHBOARD and payload.user_id is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="include=dashboard requires a user.",
+        )
+
     resume_summary = resume_analysis.summary if resume_analysis is not None else None
 
     answer_text, provider_used = generate_interview_answer(
@@ -107,6 +154,12 @@ def generate_answer(
 
     db.add(interview_answer)
     try:
+        record_activity(
+            db,
+            user_id=payload.user_id,
+            answers=1,
+            provider_fallbacks=provider_fallback(provider_used),
+        )
         db.commit()
         db.refresh(interview_answer)
     except SQLAlchemyError as exc:
@@ -122,6 +175,7 @@ def generate_answer(
             detail="Could not generate interview answer.",
         )
 
+    invalidate_metrics(interview_answer.user_id)
     logger.info(
         "generated interview answer id=%s user_id=%s resume_analysis_id=%s",
         interview_answer.id,
@@ -129,7 +183,7 @@ def generate_answer(
         interview_answer.resume_analysis_id,
     )
 
-    return InterviewAnswerRead(
+    result = InterviewAnswerRead(
         id=interview_answer.id,
         user_id=interview_answer.user_id,
         resume_analysis_id=interview_answer.resume_analysis_id,
@@ -141,10 +195,28 @@ def generate_answer(
         provider=provider_used,
     )
 
+    if include is ResponseInclude.DASHBOARD:
+        # Returned directly: the declared response_model would drop the
+        # extra dashboard field.
+        return serialized_response(
+            interview_answer_with_dashboard_adapter,
+            {
+                **result.model_dump(),
+                "dashboard": build_dashboard(
+                    db, payload.user_id, interview_answer.resume_analysis_id
+                ),
+            },
+            status_code=status.HTTP_201_CREATED,
+        )
+    return serialized_response(
+        interview_answer_adapter, result, status_code=status.HTTP_201_CREATED
+    )
+
 
 @router.get(
     "/answers",
     response_model=List[InterviewAnswerRead],
+    dependencies=[Depends(limit_read_requests)],
 )
 def list_answers(
     db: Session = Depends(get_db),
@@ -152,8 +224,8 @@ def list_answers(
     offset: int = Query(0, ge=0),
     user_id: int | None = Query(default=None, ge=1),
     current_user: User | None = Depends(get_current_user_optional),
-) -> List[InterviewAnswerRead]:
-    query = db.query(InterviewAnswer)
+) -> Response:
+    query = db.query(*answer_read_columns())
 
     # Resolve effective user_id using header + query rules
     effective_user_id = user_id
@@ -185,32 +257,20 @@ def list_answers(
         .all()
     )
 
-    return [
-        InterviewAnswerRead(
-            id=a.id,
-            user_id=a.user_id,
-            resume_analysis_id=a.resume_analysis_id,
-            question=a.question,
-            job_title=a.job_title,
-            company_name=a.company_name,
-            answer=a.answer,
-            created_at=a.created_at,
-            provider=settings.llm_provider,
-        )
-        for a in answers
-    ]
+    return serialized_response(interview_answer_list_adapter, answers)
 
 
 @router.get(
     "/answers/{answer_id}",
     response_model=InterviewAnswerRead,
+    dependencies=[Depends(limit_read_requests)],
 )
 def get_answer(
     answer_id: int,
     db: Session = Depends(get_db),
-) -> InterviewAnswerRead:
+) -> Response:
     answer = (
-        db.query(InterviewAnswer)
+        db.query(*answer_read_columns())
         .filter(InterviewAnswer.id == answer_id)
         .first()
     )
@@ -220,17 +280,7 @@ def get_answer(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Interview answer not found.",
         )
-    return InterviewAnswerRead(
-        id=answer.id,
-        user_id=answer.user_id,
-        resume_analysis_id=answer.resume_analysis_id,
-        question=answer.question,
-        job_title=answer.job_title,
-        company_name=answer.company_name,
-        answer=answer.answer,
-        created_at=answer.created_at,
-        provider=settings.llm_provider,
-    )
+    return serialized_response(interview_answer_adapter, answer)
 
 
 @router.delete(
@@ -287,6 +337,7 @@ def delete_answer(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Could not delete interview answer.",
         )
+    invalidate_metrics(answer.user_id)
 
     logger.info(
         "deleted interview answer id=%s user_id=%s",
@@ -0,0 +1,46 @@
+import logging
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import Response
+from sqlalchemy.orm import Session
+
+from app.core.auth import get_current_user_optional
+from app.core.db import get_db
+from app.core.rate_limit import limit_read_requests
+from app.core.responses import serialized_response
+from app.models import User
+from app.schemas.dashboard import DashboardRead, dashboard_adapter
+from app.services.dashboard import DEFAULT_DASHBOARD_LIMIT, build_dashboard
+
+router = APIRouter(
+    prefix="/api",
+    tags=["dashboard"],
+)
+
+logger = logging.getLogger("ai_job_assistant.dashboard")
+
+
+@router.get(
+    "/dashboard",
+    response_model=DashboardRead,
+    dependencies=[Depends(limit_read_requests)],
+)
+def get_dashboard(
+    resume_analysis_id: int | None = Query(default=None, ge=1),
+    limit: int = Query(DEFAULT_DASHBOARD_LIMIT, ge=1, le=50),
+    db: Session = Depends(get_db),
+    current_user: User | None = Depends(get_current_user_optional),
+) -> Response:
+    """
+    The header user's metrics, recent analyses and recent answers, plus the
+    answers for resume_analysis_id when given, in one round trip.
+    """
+    if current_user is None:
+        logger.warning("dashboard requested without authenticated user")
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Authentication required to view the dashboard.",
+        )
+
+    dashboard = build_dashboard(db, current_user.id, resume_analysis_id, limit)
+    return serialized_response(dashboard_adapter, dashboard)
@@ -0,0 +1,201 @@
+import csv
+import io
+import json
+import logging
+import zlib
+from enum import Enum
+from typing import Iterator
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.auth import get_current_user_optional
+from app.core.rate_limit import limit_read_requests
+from app.core.db import get_db
+from app.models import InterviewAnswer, ResumeAnalysis, User
+
+router = APIRouter(
+    prefix="/api",
+    tags=["export"],
+)
+
+logger = logging.getLogger("ai_job_assistant.export")
+
+# Rows fetched per round trip from the server-side cursor.
+EXPORT_BATCH_SIZE = 500
+# Encoded output is buffered up to this size before being handed to the client.
+EXPORT_FLUSH_BYTES = 64 * 1024
+
+CSV_COLUMNS = [
+    "record_type",
+    "id",
+    "user_id",
+    "resume_analysis_id",
+    "resume_text",
+    "summary",
+    "question",
+    "job_title",
+    "company_name",
+    "answer",
+    "created_at",
+]
+
+
+class ExportFormat(str, Enum):
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+
+def _iter_records(db: Session, user_id: int) -> Iterator[dict]:
+    """
+    Yield every resume analysis and interview answer owned by the user.
+
+    Plain column selects are used instead of ORM entities so rows never enter
+    the session identity map, and yield_per keeps a server-side cursor open so
+    only one batch is held in memory at a time.
+    """
+    analyses = db.execute(
+        select(
+            ResumeAnalysis.id,
+            ResumeAnalysis.user_id,
+            ResumeAnalysis.resume_text,
+            ResumeAnalysis.summary,
+            ResumeAnalysis.created_at,
+        )
+        .where(ResumeAnalysis.user_id == user_id)
+        .order_by(ResumeAnalysis.id)
+        .execution_options(yield_per=EXPORT_BATCH_SIZE)
+    )
+    for row in analyses:
+        yield {
+            "record_type": "resume_analysis",
+            "id": row.id,
+            "user_id": row.user_id,
+            "resume_text": row.resume_text,
+            "summary": row.summary,
+            "created_at": row.created_at.isoformat(),
+        }
+
+    answers = db.execute(
+        select(
+            InterviewAnswer.id,
+            InterviewAnswer.user_id,
+            InterviewAnswer.resume_analysis_id,
+            InterviewAnswer.question,
+            InterviewAnswer.job_title,
+            InterviewAnswer.company_name,
+            InterviewAnswer.answer,
+            InterviewAnswer.created_at,
+        )
+        .where(InterviewAnswer.user_id == user_id)
+        .order_by(InterviewAnswer.id)
+        .execution_options(yield_per=EXPORT_BATCH_SIZE)
+    )
+    for row in answers:
+        yield {
+            "record_type": "interview_answer",
+            "id": row.id,
+            "user_id": row.user_id,
+            "resume_analysis_id": row.resume_analysis_id,
+            "question": row.question,
+            "job_title": row.job_title,
+            "company_name": row.company_name,
+            "answer": row.answer,
+            "created_at": row.created_at.isoformat(),
+        }
+
+
+def _iter_ndjson(records: Iterator[dict]) -> Iterator[str]:
+    for record in records:
+        yield json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n"
+
+
+def _iter_csv(records: Iterator[dict]) -> Iterator[str]:
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=CSV_COLUMNS, lineterminator="\n")
+
+    writer.writeheader()
+    for record in records:
+        writer.writerow(record)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate(0)
+
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def _iter_chunks(lines: Iterator[str], use_gzip: bool) -> Iterator[bytes]:
+    """
+    Coalesce encoded lines into chunks of roughly EXPORT_FLUSH_BYTES and
+    optionally gzip them incrementally.
+    """
+    compressor = zlib.compressobj(wbits=31) if use_gzip else None
+    pending: list[bytes] = []
+    pending_size = 0
+
+    for line in lines:
+        data = line.encode("utf-8")
+        pending.append(data)
+        pending_size += len(data)
+        if pending_size < EXPORT_FLUSH_BYTES:
+            continue
+
+        chunk = b"".join(pending)
+        pending.clear()
+        pending_size = 0
+        if compressor is not None:
+            chunk = compressor.compress(chunk)
+        if chunk:
+            yield chunk
+
+    chunk = b"".join(pending)
+    if compressor is not None:
+        chunk = compressor.compress(chunk) + compressor.flush()
+    if chunk:
+        yield chunk
+
+
+@router.get("/export", dependencies=[Depends(limit_read_requests)])
+def export_user_data(
+    format: ExportFormat = Query(default=ExportFormat.NDJSON),
+    gzip: bool = Query(default=False),
+    db: Session = Depends(get_db),
+    current_user: User | None = Depends(get_current_user_optional),
+) -> StreamingResponse:
+    if current_user is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Authentication required to export data.",
+        )
+
+    records = _iter_records(db, current_user.id)
+    if format is ExportFormat.CSV:
+        lines = _iter_csv(records)
+        media_type = "text/csv; charset=utf-8"
+    else:
+        lines = _iter_ndjson(records)
+        media_type = "application/x-ndjson"
+
+    headers = {
+        "Content-Disposition": (
+            f'attachment; filename="export-user-{current_user.id}.{format.value}"'
+        ),
+    }
+    if gzip:
+        headers["Content-Encoding"] = "gzip"
+
+    logger.info(
+        "export started user_id=%s format=%s gzip=%s",
+        current_user.id,
+        format.value,
+        gzip,
+    )
+
+    return StreamingResponse(
+        _iter_chunks(lines, use_gzip=gzip),
+        media_type=media_type,
+        headers=headers,
+    )
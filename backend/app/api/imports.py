@@ -0,0 +1,99 @@
+import logging
+
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Request, status
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from app.core.auth import get_current_user_optional
+from app.core.rate_limit import (
+    charge_llm_calls_to,
+    client_key,
+    enforce_llm_quota,
+    limit_generate_requests,
+)
+from app.core.db import get_db
+from app.models import User
+from app.schemas import ImportReport
+from app.services.bulk_import import (
+    DEFAULT_CHUNK_SIZE,
+    NDJSONImporter,
+    NDJSONLineSplitter,
+    backfill_pending_summaries,
+)
+from app.services.metrics_cache import invalidate_metrics
+
+router = APIRouter(
+    prefix="/api",
+    tags=["import"],
+)
+
+logger = logging.getLogger("ai_job_assistant.import")
+
+
+def _run_summary_backfill(bind: Engine, analysis_ids: list[int], quota_key: str) -> None:
+    # The request session is closed by the time background tasks run. Only
+    # the rows this import deferred are summarized, charged to its client.
+    with Session(bind=bind) as db, charge_llm_calls_to(quota_key):
+        summarized = backfill_pending_summaries(db, analysis_ids=analysis_ids)
+    logger.info("deferred summary backfill finished summarized=%s", summarized)
+
+
+@router.post(
+    "/import",
+    response_model=ImportReport,
+    dependencies=[
+        Depends(limit_generate_requests),
+        Depends(enforce_llm_quota),
+    ],
+)
+async def import_user_data(
+    request: Request,
+    background_tasks: BackgroundTasks,
+    defer_summaries: bool = Query(default=False),
+    chunk_size: int = Query(DEFAULT_CHUNK_SIZE, ge=1, le=10000),
+    db: Session = Depends(get_db),
+    current_user: User | None = Depends(get_current_user_optional),
+) -> ImportReport:
+    """
+    Import NDJSON records (the format produced by GET /api/export) for the
+    current user. The body is parsed as it arrives and written in chunks;
+    database work runs in the threadpool so the event loop keeps serving.
+    """
+    if current_user is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Authentication required to import data.",
+        )
+
+    importer = NDJSONImporter(
+        db,
+        user_id=current_user.id,
+        defer_summaries=defer_summaries,
+        chunk_size=chunk_size,
+    )
+    splitter = NDJSONLineSplitter()
+
+    async for chunk in request.stream():
+        lines = splitter.feed(chunk)
+        if lines:
+            await run_in_threadpool(importer.feed_lines, lines)
+    await run_in_threadpool(importer.feed_lines, splitter.close())
+    report = await run_in_threadpool(importer.finish)
+    invalidate_metrics(current_user.id)
+
+    if report.summaries_pending:
+        background_tasks.add_task(
+            _run_summary_backfill,
+            db.get_bind(),
+            importer.pending_ids,
+            client_key(request, current_user),
+        )
+
+    logger.info(
+        "import request finished user_id=%s lines=%s failed=%s",
+        current_user.id,
+        report.lines_read,
+        report.failed_lines,
+    )
+    return report
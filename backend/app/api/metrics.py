@@ -1,24 +1,28 @@
+from datetime import datetime, timedelta, timezone
 from typing import Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from pydantic import BaseModel
 from sqlalchemy.orm import Session
 
 from app.core.db import get_db
 from app.core.auth import get_current_user_optional
+from app.core.rate_limit import limit_read_requests
+from app.core.runtime_metrics import estimate_percentile, runtime_metrics
+from app.schemas.metrics import ActivityTimeseries, MetricsBucket, MetricsScope, MetricsSummary
+from app.services.activity_rollups import bucket_count, query_timeseries
+from app.services.metrics_cache import cached_metrics_summary
 from app.models.user import User
 from app.models.resume_analysis import ResumeAnalysis
 from app.models.interview_answer import InterviewAnswer
 
 router = APIRouter()
 
-
-class MetricsSummary(BaseModel):
-    total_users: int
-    total_resume_analyses: int
-    total_answers: int
-    user_resume_analyses: Optional[int] = None
-    user_answers: Optional[int] = None
+MAX_TIMESERIES_POINTS = 1000
+DEFAULT_TIMESERIES_RANGE = {
+    MetricsBucket.HOUR: timedelta(hours=48),
+    MetricsBucket.DAY: timedelta(days=30),
+}
 
 
 class UserMetricsSummary(BaseModel):
@@ -27,40 +31,38 @@ class UserMetricsSummary(BaseModel):
     answers: int
 
 
-@router.get("/summary", response_model=MetricsSummary)
+class LatencySummary(BaseModel):
+    count: int
+    mean_ms: Optional[float] = None
+    p50_ms: Optional[float] = None
+    p95_ms: Optional[float] = None
+    p99_ms: Optional[float] = None
+
+
+class RuntimeMetricsSummary(BaseModel):
+    workers: int
+    counters: dict[str, float]
+    latencies: dict[str, LatencySummary]
+
+
+@router.get(
+    "/summary",
+    response_model=MetricsSummary,
+    dependencies=[Depends(limit_read_requests)],
+)
 def get_metrics_summary(
     db: Session = Depends(get_db),
     current_user: User | None = Depends(get_current_user_optional),
 ) -> MetricsSummary:
-    total_users = db.query(User).count()
-    total_resume_analyses = db.query(ResumeAnalysis).count()
-    total_answers = db.query(InterviewAnswer).count()
-
-    user_resume_analyses: Optional[int] = None
-    user_answers: Optional[int] = None
-
-    if current_user is not None:
-        user_resume_analyses = (
-            db.query(ResumeAnalysis)
-            .filter(ResumeAnalysis.user_id == current_user.id)
-            .count()
-        )
-        user_answers = (
-            db.query(InterviewAnswer)
-            .filter(InterviewAnswer.user_id == current_user.id)
-            .count()
-        )
+    user_id = current_user.id if current_user is not None else None
+    return cached_metrics_summary(db, user_id)
 
-    return MetricsSummary(
-        total_users=total_users,
-        total_resume_analyses=total_resume_analyses,
-        total_answers=total_answers,
-        user_resume_analyses=user_resume_analyses,
-        user_answers=user_answers,
-    )
 
-
-@router.get("/user", response_model=UserMetricsSummary)
+@router.get(
+    "/user",
+    response_model=UserMetricsSummary,
+    dependencies=[Depends(limit_read_requests)],
+)
 def get_user_metrics(
     db: Session = Depends(get_db),
     current_user: User | None = Depends(get_current_user_optional),
@@ -86,4 +88,82 @@ def get_user_metrics(
         user_id=current_user.id,
         resume_analyses=resume_count,
         answers=answer_count,
-    )
\ No newline at end of file
+    )
+
+
+@router.get(
+    "/timeseries",
+    response_model=ActivityTimeseries,
+    dependencies=[Depends(limit_read_requests)],
+)
+def get_activity_timeseries(
+    bucket: MetricsBucket = Query(MetricsBucket.DAY),
+    scope: MetricsScope = Query(MetricsScope.GLOBAL),
+    start: Optional[datetime] = Query(default=None),
+    end: Optional[datetime] = Query(default=None),
+    db: Session = Depends(get_db),
+    current_user: User | None = Depends(get_current_user_optional),
+) -> ActivityTimeseries:
+    """
+    Analyses, answers, new users and provider fallbacks per hour or day,
+    for everyone or for the header user, read from the activity rollups.
+    """
+    if scope is MetricsScope.USER and current_user is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Authentication required for per-user metrics.",
+        )
+
+    end = end or datetime.now(timezone.utc)
+    if end.tzinfo is None:
+        end = end.replace(tzinfo=timezone.utc)
+    start = start or end - DEFAULT_TIMESERIES_RANGE[bucket]
+    if start.tzinfo is None:
+        start = start.replace(tzinfo=timezone.utc)
+
+    if start > end:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="start must not be after end.",
+        )
+    if bucket_count(bucket, start, end) > MAX_TIMESERIES_POINTS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Too many buckets; request at most {MAX_TIMESERIES_POINTS} points.",
+        )
+
+    user_id = current_user.id if scope is MetricsScope.USER else None
+    return ActivityTimeseries(
+        bucket=bucket,
+        scope=scope,
+        user_id=user_id,
+        start=start,
+        end=end,
+        points=query_timeseries(db, bucket, start, end, user_id),
+    )
+
+
+@router.get("/runtime", response_model=RuntimeMetricsSummary)
+def get_runtime_metrics() -> RuntimeMetricsSummary:
+    """
+    Request counters and latency percentiles, summed across every worker
+    process when METRICS_MULTIPROC_DIR is shared between them.
+    """
+    merged = runtime_metrics.aggregate()
+
+    latencies = {}
+    for name, histogram in merged["histograms"].items():
+        count = histogram["count"]
+        latencies[name] = LatencySummary(
+            count=count,
+            mean_ms=histogram["sum"] / count if count else None,
+            p50_ms=estimate_percentile(histogram, 50),
+            p95_ms=estimate_percentile(histogram, 95),
+            p99_ms=estimate_percentile(histogram, 99),
+        )
+
+    return RuntimeMetricsSummary(
+        workers=merged["workers"],
+        counters=merged["counters"],
+        latencies=latencies,
+    )
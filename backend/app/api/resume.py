@@ -1,16 +1,56 @@
 import logging
 
 from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, Header, HTTPException, Request, status, Query
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import Response
+from pydantic import ValidationError
+from sqlalchemy import func, select
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import FormData, UploadFile
+from starlette.formparsers import MultiPartException, MultiPartParser
 
 from app.agents.job_assistant import summarize_resume
+from app.core.config import settings
 from app.core.db import get_db
 from app.models import ResumeAnalysis, User, InterviewAnswer
 from app.schemas import ResumeAnalyzeRequest, ResumeAnalysisRead, InterviewAnswerRead
-from app.core.config import settings
+from app.core.admission import admit_generation_request, record_queue_wait
 from app.core.auth import get_current_user_optional
+from app.core.rate_limit import (
+    enforce_llm_quota,
+    limit_generate_requests,
+    limit_read_requests,
+)
+from app.core.request_context import timed
+from app.core.responses import serialized_response
+from app.core.runtime_metrics import runtime_metrics
+from app.services.read_queries import (
+    analysis_read_columns,
+    answer_read_columns,
+    answer_stats_subquery,
+)
+from app.schemas.answer import interview_answer_list_adapter
+from app.schemas.dashboard import ResponseInclude, resume_analysis_with_dashboard_adapter
+from app.schemas.resume import (
+    SkillMatch,
+    resume_analysis_adapter,
+    ResumeAnalysisListItem,
+    resume_analysis_list_adapter,
+    resume_analysis_list_item_adapter,
+)
+from app.services.activity_rollups import provider_fallback, record_activity
+from app.services.dashboard import build_dashboard
+from app.services.idempotency import MAX_KEY_LENGTH, request_fingerprint, run_idempotent
+from app.services.metrics_cache import invalidate_metrics
+from app.services.near_duplicates import find_near_duplicate, index_fingerprints
+from app.services.purge import delete_analyses
+from app.services.resume_files import ResumeFileError, extract_in_pool, file_suffix
+from app.services.resume_parser import canonical_skill, parse_resume
+from app.services.simhash import simhash
+from app.services.skill_index import MAX_SEARCH_SKILLS, index_skills, search_by_skills
 
 router = APIRouter(
     prefix="/api/resume",
@@ -24,12 +64,161 @@ logger = logging.getLogger("ai_job_assistant.resume")
     "/analyze",
     response_model=ResumeAnalysisRead,
     status_code=status.HTTP_201_CREATED,
+    dependencies=[
+        Depends(admit_generation_request),
+        Depends(record_queue_wait),
+        Depends(limit_generate_requests),
+        Depends(enforce_llm_quota),
+    ],
 )
 def analyze_resume(
     payload: ResumeAnalyzeRequest,
+    include: ResponseInclude | None = Query(default=None),
+    idempotency_key: str | None = Header(default=None, min_length=1, max_length=MAX_KEY_LENGTH),
+    db: Session = Depends(get_db),
+    current_user: User | None = Depends(get_current_user_optional),
+) -> Response:
+    return run_idempotent(
+        db,
+        idempotency_key,
+        "resume.analyze",
+        current_user.id if current_user is not None else None,
+        request_fingerprint(payload.model_dump(mode="json"), include),
+        lambda: _analyze_resume(payload, include, db, current_user),
+    )
+
+
+# Room for the multipart boundaries, part headers and form fields around
+# the file itself.
+UPLOAD_OVERHEAD_BYTES = 64 * 1024
+
+
+class _UploadTooLarge(MultiPartException):
+    # A MultiPartException so the parser closes its spooled files.
+    def __init__(self) -> None:
+        super().__init__("Uploaded file is too large.")
+
+
+async def _read_upload_form(request: Request) -> FormData:
+    """
+    Parse the multipart body as it arrives. The file part is spooled to a
+    temporary file (in memory up to 1 MB, then on disk), and the body is cut
+    off as soon as it exceeds the upload limit, whatever Content-Length says.
+    """
+    if not request.headers.get("content-type", "").startswith("multipart/form-data"):
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail="Upload must be multipart/form-data.",
+        )
+    limit = settings.upload_max_bytes + UPLOAD_OVERHEAD_BYTES
+    too_large = HTTPException(
+        status_code=status.HTTP_413_CONTENT_TOO_LARGE,
+        detail="Uploaded file is too large.",
+    )
+    declared = request.headers.get("content-length", "")
+    if declared.isdigit() and int(declared) > limit:
+        raise too_large
+
+    async def limited_stream():
+        received = 0
+        async for chunk in request.stream():
+            received += len(chunk)
+            if received > limit:
+                raise _UploadTooLarge
+            yield chunk
+
+    parser = MultiPartParser(request.headers, limited_stream(), max_files=1, max_fields=10)
+    try:
+        return await parser.parse()
+    except _UploadTooLarge:
+        raise too_large
+    except MultiPartException as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=exc.message)
+
+
+@router.post(
+    "/upload",
+    response_model=ResumeAnalysisRead,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[
+        Depends(admit_generation_request),
+        Depends(record_queue_wait),
+        Depends(limit_generate_requests),
+        Depends(enforce_llm_quota),
+    ],
+)
+async def upload_resume(
+    request: Request,
+    include: ResponseInclude | None = Query(default=None),
+    idempotency_key: str | None = Header(default=None, min_length=1, max_length=MAX_KEY_LENGTH),
     db: Session = Depends(get_db),
     current_user: User | None = Depends(get_current_user_optional),
-) -> ResumeAnalysisRead:
+) -> Response:
+    """
+    Analyze an uploaded .txt, .md or .docx resume. Takes multipart form
+    data with a ``file`` part and the optional ``user_id`` and
+    ``reuse_similar_summary`` fields of the analyze body.
+
+    The body is parsed on the event loop as it streams in, text extraction
+    runs in the resume_files process pool, and the extracted text goes
+    through the same path as POST /api/resume/analyze in the threadpool.
+    """
+    form = await _read_upload_form(request)
+    try:
+        upload = form.get("file")
+        if not isinstance(upload, UploadFile):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Upload must include a file part named 'file'.",
+            )
+        suffix = file_suffix(upload.filename)
+        if suffix is None:
+            raise HTTPException(
+                status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+                detail="Unsupported file type. Upload a .txt, .md or .docx file.",
+            )
+        if upload.size is not None and upload.size > settings.upload_max_bytes:
+            raise HTTPException(
+                status_code=status.HTTP_413_CONTENT_TOO_LARGE,
+                detail="Uploaded file is too large.",
+            )
+        data = await upload.read()
+        fields = {
+            name: value for name, value in form.items() if name != "file" and value != ""
+        }
+    finally:
+        await form.close()
+
+    with timed("extract"):
+        try:
+            resume_text = await extract_in_pool(data, suffix)
+        except ResumeFileError as exc:
+            logger.warning("unreadable resume upload suffix=%s error=%s", suffix, exc)
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
+    runtime_metrics.incr(f"upload.{suffix[1:]}")
+
+    try:
+        payload = ResumeAnalyzeRequest.model_validate({**fields, "resume_text": resume_text})
+    except ValidationError as exc:
+        raise RequestValidationError(exc.errors(include_url=False, include_input=False))
+
+    return await run_in_threadpool(
+        run_idempotent,
+        db,
+        idempotency_key,
+        "resume.upload",
+        current_user.id if current_user is not None else None,
+        request_fingerprint(payload.model_dump(mode="json"), include),
+        lambda: _analyze_resume(payload, include, db, current_user),
+    )
+
+
+def _analyze_resume(
+    payload: ResumeAnalyzeRequest,
+    include: ResponseInclude | None,
+    db: Session,
+    current_user: User | None,
+) -> Response:
     if current_user is not None and payload.user_id is not None:
         if current_user.id != payload.user_id:
             logger.warning(
@@ -47,7 +236,10 @@ def analyze_resume(
         payload.user_id = current_user.id
 
     user = None
-    if payload.user_id is not None:
+    if current_user is not None and payload.user_id == current_user.id:
+        # Already loaded by get_current_user_optional; avoid a second lookup.
+        user = current_user
+    elif payload.user_id is not None:
         user = db.query(User).filter(User.id == payload.user_id).first()
         if not user:
             logger.warning("resume analysis for missing user_id=%s", payload.user_id)
@@ -56,15 +248,56 @@ def analyze_resume(
                 detail="User not found.",
             )
 
-    summary_text, provider_used = summarize_resume(payload.resume_text)
+    if include is ResponseInclude.DASHBOARD and payload.user_id is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="include=dashboard requires a user.",
+        )
+
+    with timed("parse"):
+        parsed = parse_resume(payload.resume_text)
+
+    # A user's resumes are fingerprinted so a near-duplicate of an earlier
+    # one (a fixed typo, a changed date) can reuse its summary instead of
+    # calling the LLM again.
+    fingerprint = None
+    duplicate = None
+    if payload.user_id is not None:
+        with timed("simhash"):
+            fingerprint = simhash(payload.resume_text)
+        if settings.near_duplicate_reuse and payload.reuse_similar_summary:
+            duplicate = find_near_duplicate(
+                db, payload.user_id, payload.resume_text, fingerprint
+            )
+
+    if duplicate is not None:
+        summary_text, provider_used = duplicate.summary, "reused"
+        logger.info(
+            "reusing summary of near-duplicate analysis id=%s similarity=%s",
+            duplicate.analysis_id,
+            duplicate.similarity,
+        )
+    else:
+        summary_text, provider_used = summarize_resume(payload.resume_text, parsed)
 
     analysis = ResumeAnalysis(
         user_id=payload.user_id,
         resume_text=payload.resume_text,
         summary=summary_text,
+        parsed=parsed.to_dict(),
     )
     db.add(analysis)
     try:
+        db.flush()
+        index_skills(db, [(analysis.id, analysis.user_id, parsed.skills)])
+        if fingerprint is not None:
+            index_fingerprints(db, [(analysis.id, analysis.user_id, fingerprint)])
+        record_activity(
+            db,
+            user_id=payload.user_id,
+            analyses=1,
+            provider_fallbacks=0 if duplicate is not None else provider_fallback(provider_used),
+        )
         db.commit()
         db.refresh(analysis)
     except SQLAlchemyError as exc:
@@ -79,21 +312,40 @@ def analyze_resume(
             detail="Could not analyze resume.",
         )
 
+    invalidate_metrics(analysis.user_id)
     logger.info("created resume analysis id=%s user_id=%s", analysis.id, analysis.user_id)
 
-    return ResumeAnalysisRead(
+    result = ResumeAnalysisRead(
         id=analysis.id,
         user_id=analysis.user_id,
         resume_text=analysis.resume_text,
         summary=analysis.summary,
         created_at=analysis.created_at,
         provider=provider_used,
+        parsed=analysis.parsed,
+        reused_from_id=duplicate.analysis_id if duplicate is not None else None,
+    )
+
+    if include is ResponseInclude.DASHBOARD:
+        # Returned directly: the declared response_model would drop the
+        # extra dashboard field.
+        return serialized_response(
+            resume_analysis_with_dashboard_adapter,
+            {
+                **result.model_dump(),
+                "dashboard": build_dashboard(db, payload.user_id, analysis.id),
+            },
+            status_code=status.HTTP_201_CREATED,
+        )
+    return serialized_response(
+        resume_analysis_adapter, result, status_code=status.HTTP_201_CREATED
     )
 
 
 @router.get(
     "",
-    response_model=List[ResumeAnalysisRead],
+    response_model=List[ResumeAnalysisListItem],
+    dependencies=[Depends(limit_read_requests)],
 )
 def list_resume_analyses(
     db: Session = Depends(get_db),
@@ -101,8 +353,13 @@ def list_resume_analyses(
     offset: int = Query(0, ge=0),
     user_id: int | None = Query(default=None, ge=1),
     current_user: User | None = Depends(get_current_user_optional),
-) -> List[ResumeAnalysisRead]:
-    query = db.query(ResumeAnalysis)
+) -> Response:
+    """
+    A page of analyses, newest first, each with its answer_count and
+    last_answer_at. The page is selected first and the answer stats are
+    grouped over that page only, in the same statement.
+    """
+    page = select(ResumeAnalysis.id)
 
     # Resolve effective user_id using header + query rules
     effective_user_id = user_id
@@ -124,39 +381,85 @@ def list_resume_analyses(
         effective_user_id = current_user.id
 
     if effective_user_id is not None:
-        query = query.filter(ResumeAnalysis.user_id == effective_user_id)
+        page = page.where(ResumeAnalysis.user_id == effective_user_id)
+
+    order = (ResumeAnalysis.created_at.desc(), ResumeAnalysis.id.desc())
+    page = page.order_by(*order).offset(offset).limit(limit).cte("page")
+    stats = answer_stats_subquery(select(page.c.id))
 
     analyses = (
-        query
-        .order_by(ResumeAnalysis.created_at.desc())
-        .offset(offset)
-        .limit(limit)
+        db.query(
+            *analysis_read_columns(),
+            func.coalesce(stats.c.answer_count, 0).label("answer_count"),
+            stats.c.last_answer_at,
+        )
+        .join(page, page.c.id == ResumeAnalysis.id)
+        .outerjoin(stats, stats.c.resume_analysis_id == ResumeAnalysis.id)
+        .order_by(*order)
         .all()
     )
 
-    return [
-        ResumeAnalysisRead(
-            id=a.id,
-            user_id=a.user_id,
-            resume_text=a.resume_text,
-            summary=a.summary,
-            created_at=a.created_at,
-            provider=settings.llm_provider,
+    return serialized_response(resume_analysis_list_item_adapter, analyses)
+
+
+# Declared before /{analysis_id} so "search" is not parsed as an id.
+@router.get(
+    "/search",
+    response_model=List[ResumeAnalysisRead],
+    dependencies=[Depends(limit_read_requests)],
+)
+def search_resume_analyses(
+    skills: List[str] = Query(..., min_length=1, max_length=MAX_SEARCH_SKILLS),
+    match: SkillMatch = Query(SkillMatch.ALL),
+    db: Session = Depends(get_db),
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    user_id: int | None = Query(default=None, ge=1),
+    current_user: User | None = Depends(get_current_user_optional),
+) -> Response:
+    if current_user is not None and user_id is not None and current_user.id != user_id:
+        logger.warning(
+            "search resume analyses with mismatched header and query "
+            "header_user_id=%s query_user_id=%s",
+            current_user.id,
+            user_id,
+        )
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Query user_id does not match authenticated user.",
+        )
+    effective_user_id = current_user.id if current_user is not None else user_id
+
+    canonical = {term: canonical_skill(term) for term in skills}
+    unknown = [term for term, skill in canonical.items() if skill is None]
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown skills: {', '.join(unknown)}.",
         )
-        for a in analyses
-    ]
+
+    analyses = search_by_skills(
+        db,
+        list(dict.fromkeys(canonical.values())),
+        match_all=match is SkillMatch.ALL,
+        user_id=effective_user_id,
+        limit=limit,
+        offset=offset,
+    )
+    return serialized_response(resume_analysis_list_adapter, analyses)
 
 
 @router.get(
     "/{analysis_id}",
     response_model=ResumeAnalysisRead,
+    dependencies=[Depends(limit_read_requests)],
 )
 def get_resume_analysis(
     analysis_id: int,
     db: Session = Depends(get_db),
-) -> ResumeAnalysisRead:
+) -> Response:
     analysis = (
-        db.query(ResumeAnalysis)
+        db.query(*analysis_read_columns())
         .filter(ResumeAnalysis.id == analysis_id)
         .first()
     )
@@ -166,28 +469,22 @@ def get_resume_analysis(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Resume analysis not found.",
         )
-    return ResumeAnalysisRead(
-        id=analysis.id,
-        user_id=analysis.user_id,
-        resume_text=analysis.resume_text,
-        summary=analysis.summary,
-        created_at=analysis.created_at,
-        provider=settings.llm_provider,
-    )
+    return serialized_response(resume_analysis_adapter, analysis)
 
 
 @router.get(
     "/{analysis_id}/answers",
     response_model=List[InterviewAnswerRead],
+    dependencies=[Depends(limit_read_requests)],
 )
 def list_answers_for_resume(
     analysis_id: int,
     db: Session = Depends(get_db),
     limit: int = Query(20, ge=1, le=100),
     offset: int = Query(0, ge=0),
-) -> List[InterviewAnswerRead]:
+) -> Response:
     analysis = (
-        db.query(ResumeAnalysis)
+        db.query(ResumeAnalysis.id)
         .filter(ResumeAnalysis.id == analysis_id)
         .first()
     )
@@ -199,7 +496,7 @@ def list_answers_for_resume(
         )
 
     answers = (
-        db.query(InterviewAnswer)
+        db.query(*answer_read_columns())
         .filter(InterviewAnswer.resume_analysis_id == analysis_id)
         .order_by(InterviewAnswer.created_at.desc())
         .offset(offset)
@@ -207,21 +504,7 @@ def list_answers_for_resume(
         .all()
     )
 
-    return [
-        InterviewAnswerRead(
-            id=a.id,
-            user_id=a.user_id,
-            resume_analysis_id=a.resume_analysis_id,
-            question=a.question,
-            job_title=a.job_title,
-            company_name=a.company_name,
-            answer=a.answer,
-            created_at=a.created_at,
-            # For list-style endpoints, provider reflects the currently configured provider.
-            provider=settings.llm_provider,
-        )
-        for a in answers
-    ]
+    return serialized_response(interview_answer_list_adapter, answers)
 
 
 @router.delete(
@@ -264,11 +547,12 @@ def delete_resume_analysis(
             detail="You do not have permission to delete this resume analysis.",
         )
 
+    # Read before the commit expires the deleted instance.
+    owner_id = analysis.user_id
     try:
-        db.query(InterviewAnswer).filter(
-            InterviewAnswer.resume_analysis_id == analysis_id
-        ).delete(synchronize_session=False)
-        db.delete(analysis)
+        # Answers and index rows are deleted explicitly: older databases
+        # lack the ON DELETE CASCADE keys.
+        delete_analyses(db, [analysis_id])
         db.commit()
     except SQLAlchemyError as exc:
         db.rollback()
@@ -281,10 +565,11 @@ def delete_resume_analysis(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Could not delete resume analysis.",
         )
+    invalidate_metrics(owner_id)
 
     logger.info(
         "deleted resume analysis id=%s user_id=%s",
-        analysis.id,
-        analysis.user_id,
+        analysis_id,
+        owner_id,
     )
     return None
\ No newline at end of file
@@ -4,9 +4,14 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import Session
 
+from app.core.auth import get_current_user_optional
+from app.core.rate_limit import limit_read_requests
 from app.core.db import get_db
 from app.models import User
-from app.schemas import UserCreate, UserRead
+from app.schemas import UserCreate, UserDataPurgeRead, UserRead
+from app.services.activity_rollups import record_activity
+from app.services.metrics_cache import invalidate_metrics
+from app.services.purge import purge_user_data
 
 router = APIRouter(
     prefix="/api/users",
@@ -32,6 +37,7 @@ def create_user(user_in: UserCreate, db: Session = Depends(get_db)) -> UserRead:
     )
     db.add(user)
     try:
+        record_activity(db, users=1)
         db.commit()
         db.refresh(user)
     except SQLAlchemyError as exc:
@@ -42,11 +48,16 @@ def create_user(user_in: UserCreate, db: Session = Depends(get_db)) -> UserRead:
             detail="Could not create user.",
         )
 
+    invalidate_metrics()
     logger.info("created user id=%s email=%s", user.id, user.email)
     return user
 
 
-@router.get("/{user_id}", response_model=UserRead)
+@router.get(
+    "/{user_id}",
+    response_model=UserRead,
+    dependencies=[Depends(limit_read_requests)],
+)
 def get_user(user_id: int, db: Session = Depends(get_db)) -> UserRead:
     user = db.query(User).filter(User.id == user_id).first()
     if not user:
@@ -56,3 +67,44 @@ def get_user(user_id: int, db: Session = Depends(get_db)) -> UserRead:
             detail="User not found.",
         )
     return user
+
+
+@router.delete("/{user_id}/data", response_model=UserDataPurgeRead)
+def purge_user_data_endpoint(
+    user_id: int,
+    db: Session = Depends(get_db),
+    current_user: User | None = Depends(get_current_user_optional),
+) -> UserDataPurgeRead:
+    if current_user is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Authentication required to delete user data.",
+        )
+
+    if current_user.id != user_id:
+        logger.warning(
+            "forbidden purge of user data user_id=%s header_user_id=%s",
+            user_id,
+            current_user.id,
+        )
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You do not have permission to delete this user's data.",
+        )
+
+    try:
+        result = purge_user_data(db, user_id)
+    except SQLAlchemyError as exc:
+        db.rollback()
+        logger.error("failed to purge user data user_id=%s error=%s", user_id, exc)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Could not delete user data.",
+        )
+    invalidate_metrics(user_id)
+
+    return UserDataPurgeRead(
+        user_id=user_id,
+        resume_analyses_deleted=result.resume_analyses_deleted,
+        answers_deleted=result.answers_deleted,
+    )
@@ -0,0 +1,202 @@
+"""
+Command line entry points for maintenance tasks.
+
+Usage (from backend/):
+
+    python -m app.cli import data.ndjson [--user-id 1] [--defer-summaries] [--keep-ids]
+    python -m app.cli backfill-summaries
+    python -m app.cli parse-resumes
+    python -m app.cli rebuild-skill-index
+    python -m app.cli rebuild-fingerprints
+    python -m app.cli rebuild-rollups
+"""
+import argparse
+import sys
+from typing import BinaryIO
+
+from app.core.db import SessionLocal, engine
+from app.core.logging_config import setup_logging
+from app.core.schema import init_schema
+from app.schemas import ImportReport
+from app.services.bulk_import import (
+    DEFAULT_CHUNK_SIZE,
+    NDJSONImporter,
+    NDJSONLineSplitter,
+    backfill_parsed_resumes,
+    backfill_pending_summaries,
+)
+from app.services import activity_rollups, near_duplicates
+from app.services.skill_index import REBUILD_BATCH_SIZE, rebuild_skill_index
+
+READ_SIZE = 1024 * 1024
+
+
+def _print_progress(report: ImportReport) -> None:
+    print(
+        f"lines={report.lines_read} "
+        f"resume_analyses={report.resume_analyses_imported} "
+        f"answers={report.answers_imported} "
+        f"failed={report.failed_lines}",
+        file=sys.stderr,
+    )
+
+
+def _read_chunks(stream: BinaryIO):
+    while True:
+        chunk = stream.read(READ_SIZE)
+        if not chunk:
+            return
+        yield chunk
+
+
+def run_import(args: argparse.Namespace) -> int:
+    with SessionLocal() as db:
+        importer = NDJSONImporter(
+            db,
+            user_id=args.user_id,
+            defer_summaries=args.defer_summaries,
+            keep_ids=args.keep_ids,
+            chunk_size=args.chunk_size,
+            progress=_print_progress,
+        )
+        splitter = NDJSONLineSplitter()
+
+        stream = sys.stdin.buffer if args.path == "-" else open(args.path, "rb")
+        try:
+            for chunk in _read_chunks(stream):
+                importer.feed_lines(splitter.feed(chunk))
+            importer.feed_lines(splitter.close())
+        finally:
+            if stream is not sys.stdin.buffer:
+                stream.close()
+        report = importer.finish()
+
+        for error in report.errors:
+            print(f"line {error.line}: {error.error}", file=sys.stderr)
+        if report.errors_truncated:
+            print("(further errors omitted)", file=sys.stderr)
+        print(report.model_dump_json(exclude={"errors"}))
+
+        if args.backfill and report.summaries_pending:
+            summarized = backfill_pending_summaries(db, analysis_ids=importer.pending_ids)
+            print(f"summarized={summarized}", file=sys.stderr)
+
+    return 1 if report.failed_lines else 0
+
+
+def run_backfill(args: argparse.Namespace) -> int:
+    with SessionLocal() as db:
+        summarized = backfill_pending_summaries(db, batch_size=args.batch_size)
+    print(f"summarized={summarized}")
+    return 0
+
+
+def run_parse(args: argparse.Namespace) -> int:
+    with SessionLocal() as db:
+        parsed = backfill_parsed_resumes(db, batch_size=args.batch_size)
+    print(f"parsed={parsed}")
+    return 0
+
+
+def run_rebuild_skill_index(args: argparse.Namespace) -> int:
+    with SessionLocal() as db:
+        indexed = rebuild_skill_index(db, batch_size=args.batch_size)
+    print(f"indexed={indexed}")
+    return 0
+
+
+def run_rebuild_fingerprints(args: argparse.Namespace) -> int:
+    with SessionLocal() as db:
+        indexed = near_duplicates.rebuild_fingerprints(db, batch_size=args.batch_size)
+    print(f"indexed={indexed}")
+    return 0
+
+
+def run_rebuild_rollups(args: argparse.Namespace) -> int:
+    with SessionLocal() as db:
+        counted = activity_rollups.rebuild_activity_rollups(db, batch_size=args.batch_size)
+    print(f"counted={counted}")
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m app.cli")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    import_cmd = commands.add_parser("import", help="Bulk import NDJSON records.")
+    import_cmd.add_argument("path", help="NDJSON file to import, or - for stdin.")
+    import_cmd.add_argument(
+        "--user-id",
+        type=int,
+        default=None,
+        help="Scope every record to this user (default: keep user_id from each record).",
+    )
+    import_cmd.add_argument(
+        "--defer-summaries",
+        action="store_true",
+        help="Store resumes without a summary now and summarize them later.",
+    )
+    import_cmd.add_argument(
+        "--keep-ids",
+        action="store_true",
+        help="Insert records with the ids in the file (restoring a trusted export).",
+    )
+    import_cmd.add_argument(
+        "--backfill",
+        action="store_true",
+        help="Summarize deferred resumes right after the import finishes.",
+    )
+    import_cmd.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    import_cmd.set_defaults(handler=run_import)
+
+    backfill_cmd = commands.add_parser(
+        "backfill-summaries",
+        help="Summarize resume analyses imported with --defer-summaries.",
+    )
+    backfill_cmd.add_argument("--batch-size", type=int, default=50)
+    backfill_cmd.set_defaults(handler=run_backfill)
+
+    parse_cmd = commands.add_parser(
+        "parse-resumes",
+        help="Fill in parsed resume data for rows missing it or parsed by an older version.",
+    )
+    parse_cmd.add_argument("--batch-size", type=int, default=500)
+    parse_cmd.set_defaults(handler=run_parse)
+
+    index_cmd = commands.add_parser(
+        "rebuild-skill-index",
+        help="Rebuild the skill search index from stored resume analyses.",
+    )
+    index_cmd.add_argument("--batch-size", type=int, default=REBUILD_BATCH_SIZE)
+    index_cmd.set_defaults(handler=run_rebuild_skill_index)
+
+    fingerprints_cmd = commands.add_parser(
+        "rebuild-fingerprints",
+        help="Rebuild the near-duplicate resume fingerprint index.",
+    )
+    fingerprints_cmd.add_argument(
+        "--batch-size", type=int, default=near_duplicates.REBUILD_BATCH_SIZE
+    )
+    fingerprints_cmd.set_defaults(handler=run_rebuild_fingerprints)
+
+    rollups_cmd = commands.add_parser(
+        "rebuild-rollups",
+        help="Recompute activity rollups from stored rows (provider fallbacks are kept).",
+    )
+    rollups_cmd.add_argument(
+        "--batch-size", type=int, default=activity_rollups.REBUILD_BATCH_SIZE
+    )
+    rollups_cmd.set_defaults(handler=run_rebuild_rollups)
+
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    setup_logging()
+    init_schema(engine)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,123 @@
+import logging
+import math
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+from fastapi import HTTPException, Request, status
+
+from app.core.config import settings
+from app.core.runtime_metrics import runtime_metrics
+
+logger = logging.getLogger("ai_job_assistant.admission")
+
+# Queue wait samples kept at most, however busy the window is.
+_MAX_SAMPLES = 1000
+
+
+class AdmissionController:
+    """
+    Load signals for admitting generation requests: provider calls in flight
+    and how long admitted requests recently waited for a threadpool worker.
+
+    Queue wait samples older than window_seconds are dropped, so once
+    requests are shed and no new samples arrive, the signal clears by itself.
+    """
+
+    def __init__(self, window_seconds: float) -> None:
+        self.window_seconds = window_seconds
+        self._provider_calls = 0
+        self._waits: deque[tuple[float, float]] = deque(maxlen=_MAX_SAMPLES)
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def provider_call(self) -> Iterator[None]:
+        with self._lock:
+            self._provider_calls += 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._provider_calls -= 1
+
+    @property
+    def provider_calls(self) -> int:
+        return self._provider_calls
+
+    def record_queue_wait(self, wait_ms: float, now: Optional[float] = None) -> None:
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            self._waits.append((now, wait_ms))
+
+    def queue_wait_ms(self, now: Optional[float] = None) -> float:
+        """Mean queue wait over the window; 0 without recent samples."""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            while self._waits and self._waits[0][0] <= now - self.window_seconds:
+                self._waits.popleft()
+            if not self._waits:
+                return 0.0
+            return sum(wait for _, wait in self._waits) / len(self._waits)
+
+    def shed_reason(self) -> Optional[str]:
+        """Why a new generation request should be shed, or None to admit it."""
+        if self._provider_calls >= settings.admission_max_provider_calls:
+            return "provider_calls"
+        if self.queue_wait_ms() > settings.admission_max_queue_wait_ms:
+            return "queue_wait"
+        return None
+
+    def snapshot(self) -> dict:
+        return {
+            "provider_calls": self._provider_calls,
+            "queue_wait_ms": round(self.queue_wait_ms(), 2),
+        }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._waits.clear()
+
+
+admission = AdmissionController(settings.admission_window_seconds)
+
+
+async def admit_generation_request(request: Request) -> None:
+    """
+    Shed generation requests with a fast 503 while the provider or the
+    threadpool is overloaded.
+
+    This dependency is async so it runs on the event loop as soon as the
+    request arrives, before the request queues for a threadpool worker.
+    Reads are not checked and keep being served.
+    """
+    if not settings.admission_control_enabled:
+        return
+
+    reason = admission.shed_reason()
+    if reason is not None:
+        runtime_metrics.incr("admission.shed")
+        runtime_metrics.incr(f"admission.shed.{reason}")
+        logger.warning("generation request shed reason=%s path=%s", reason, request.url.path)
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Server is busy. Try again shortly.",
+            headers={"Retry-After": str(max(1, math.ceil(settings.admission_retry_after_seconds)))},
+        )
+    request.state.admitted_at = time.perf_counter()
+
+
+def record_queue_wait(request: Request) -> None:
+    """
+    Record how long the admitted request waited for a threadpool worker.
+
+    Sync, and listed right after admit_generation_request, so it runs as
+    soon as the request gets a worker thread.
+    """
+    admitted_at = getattr(request.state, "admitted_at", None)
+    if admitted_at is None:
+        return
+    wait_ms = (time.perf_counter() - admitted_at) * 1000
+    admission.record_queue_wait(wait_ms)
+    runtime_metrics.observe("admission.queue_wait", wait_ms)
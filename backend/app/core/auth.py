@@ -5,6 +5,7 @@ from fastapi import Depends, Header, HTTPException, status
 from sqlalchemy.orm import Session
 
 from app.core.db import get_db
+from app.core.request_context import timed
 from app.models.user import User
 
 logger = logging.getLogger("ai_job_assistant.auth")
@@ -23,7 +24,8 @@ def get_current_user_optional(
     if x_user_id is None:
         return None
 
-    user = db.query(User).filter(User.id == x_user_id).first()
+    with timed("auth"):
+        user = db.query(User).filter(User.id == x_user_id).first()
     if not user:
         logger.warning("invalid X-User-Id header user_id=%s", x_user_id)
         raise HTTPException(
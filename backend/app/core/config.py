@@ -1,10 +1,14 @@
 from dataclasses import dataclass
+import json
 import os
 
 from dotenv import load_dotenv
 
 load_dotenv()
 
+# Upper bound for IDEMPOTENCY_WAIT_SECONDS.
+MAX_IDEMPOTENCY_WAIT_SECONDS = 30.0
+
 @dataclass
 class Settings:
     app_env: str
@@ -14,6 +18,61 @@ class Settings:
     llm_provider: str
     openai_api_key: str | None
     openai_model: str
+    openai_base_url: str | None
+    openai_endpoints: list[dict]
+    provider_ewma_alpha: float
+    provider_failure_threshold: int
+    provider_cooldown_seconds: float
+    hedge_requests: bool
+    hedge_percentile: float
+    hedge_budget_percent: float
+    hedge_min_samples: int
+    hedge_max_workers: int
+    admission_control_enabled: bool
+    admission_max_provider_calls: int
+    admission_max_queue_wait_ms: float
+    admission_window_seconds: float
+    admission_retry_after_seconds: float
+    llm_cassette_mode: str
+    llm_cassette_path: str | None
+    llm_cassette_latency_scale: float
+    summary_map_reduce_threshold_chars: int
+    summary_chunk_chars: int
+    summary_map_concurrency: int
+    near_duplicate_reuse: bool
+    near_duplicate_max_distance: int
+    near_duplicate_min_similarity: float
+    upload_max_bytes: int
+    upload_extract_workers: int
+    prewarm_provider: bool
+    web_concurrency: int | None
+    metrics_multiproc_dir: str | None
+    debug_query_headers: bool
+    n_plus_one_threshold: int
+    rate_limit_enabled: bool
+    generate_rate_per_minute: float
+    generate_burst: int
+    read_rate_per_minute: float
+    read_burst: int
+    daily_llm_calls: int
+    daily_llm_tokens: int
+    rate_limit_max_keys: int
+    rate_limit_idle_seconds: int
+    metrics_cache_ttl_seconds: float
+    metrics_cache_stale_seconds: float
+    metrics_cache_max_entries: int
+    idempotency_ttl_seconds: int
+    idempotency_lock_seconds: int
+    idempotency_wait_seconds: float
+    idempotency_sweep_seconds: int
+
+    def __post_init__(self) -> None:
+        # A duplicate request holds a worker thread while it waits.
+        if not 0 <= self.idempotency_wait_seconds <= MAX_IDEMPOTENCY_WAIT_SECONDS:
+            raise ValueError(
+                "IDEMPOTENCY_WAIT_SECONDS must be between 0 and "
+                f"{MAX_IDEMPOTENCY_WAIT_SECONDS:g}."
+            )
 
 
 def load_settings() -> Settings:
@@ -25,6 +84,58 @@ def load_settings() -> Settings:
         llm_provider=os.getenv("LLM_PROVIDER", "stub"),
         openai_api_key=os.getenv("OPENAI_API_KEY"),
         openai_model=os.getenv("OPENAI_MODEL", "gpt-4o-mini"),
+        openai_base_url=os.getenv("OPENAI_BASE_URL") or None,
+        # JSON list of {"name", "base_url", "api_key", "model", "weight"};
+        # when empty, one endpoint is built from the OPENAI_* settings above.
+        openai_endpoints=json.loads(os.getenv("OPENAI_ENDPOINTS") or "[]"),
+        provider_ewma_alpha=float(os.getenv("PROVIDER_EWMA_ALPHA", "0.2")),
+        provider_failure_threshold=int(os.getenv("PROVIDER_FAILURE_THRESHOLD", "3")),
+        provider_cooldown_seconds=float(os.getenv("PROVIDER_COOLDOWN_SECONDS", "30")),
+        hedge_requests=os.getenv("HEDGE_REQUESTS", "false").lower() == "true",
+        hedge_percentile=float(os.getenv("HEDGE_PERCENTILE", "95")),
+        hedge_budget_percent=float(os.getenv("HEDGE_BUDGET_PERCENT", "5")),
+        hedge_min_samples=int(os.getenv("HEDGE_MIN_SAMPLES", "20")),
+        hedge_max_workers=int(os.getenv("HEDGE_MAX_WORKERS", "64")),
+        admission_control_enabled=os.getenv("ADMISSION_CONTROL_ENABLED", "true").lower() == "true",
+        admission_max_provider_calls=int(os.getenv("ADMISSION_MAX_PROVIDER_CALLS", "32")),
+        admission_max_queue_wait_ms=float(os.getenv("ADMISSION_MAX_QUEUE_WAIT_MS", "1000")),
+        admission_window_seconds=float(os.getenv("ADMISSION_WINDOW_SECONDS", "5")),
+        admission_retry_after_seconds=float(os.getenv("ADMISSION_RETRY_AFTER_SECONDS", "2")),
+        llm_cassette_mode=os.getenv("LLM_CASSETTE_MODE", "off").lower(),
+        llm_cassette_path=os.getenv("LLM_CASSETTE_PATH") or None,
+        llm_cassette_latency_scale=float(os.getenv("LLM_CASSETTE_LATENCY_SCALE", "0")),
+        summary_map_reduce_threshold_chars=int(
+            os.getenv("SUMMARY_MAP_REDUCE_THRESHOLD_CHARS", "12000")
+        ),
+        summary_chunk_chars=int(os.getenv("SUMMARY_CHUNK_CHARS", "4000")),
+        summary_map_concurrency=int(os.getenv("SUMMARY_MAP_CONCURRENCY", "4")),
+        near_duplicate_reuse=os.getenv("NEAR_DUPLICATE_REUSE", "true").lower() == "true",
+        # Band lookups find every fingerprint within 7 bits (8 bands).
+        near_duplicate_max_distance=int(os.getenv("NEAR_DUPLICATE_MAX_DISTANCE", "7")),
+        near_duplicate_min_similarity=float(os.getenv("NEAR_DUPLICATE_MIN_SIMILARITY", "0.9")),
+        upload_max_bytes=int(os.getenv("UPLOAD_MAX_BYTES", str(2 * 1024 * 1024))),
+        upload_extract_workers=int(os.getenv("UPLOAD_EXTRACT_WORKERS", "2")),
+        prewarm_provider=os.getenv("PREWARM_PROVIDER", "false").lower() == "true",
+        web_concurrency=int(os.getenv("WEB_CONCURRENCY", "0")) or None,
+        metrics_multiproc_dir=os.getenv("METRICS_MULTIPROC_DIR") or None,
+        debug_query_headers=os.getenv("DEBUG_QUERY_HEADERS", "false").lower() == "true",
+        n_plus_one_threshold=int(os.getenv("N_PLUS_ONE_THRESHOLD", "5")),
+        rate_limit_enabled=os.getenv("RATE_LIMIT_ENABLED", "true").lower() == "true",
+        generate_rate_per_minute=float(os.getenv("GENERATE_RATE_PER_MINUTE", "10")),
+        generate_burst=int(os.getenv("GENERATE_BURST", "5")),
+        read_rate_per_minute=float(os.getenv("READ_RATE_PER_MINUTE", "120")),
+        read_burst=int(os.getenv("READ_BURST", "60")),
+        daily_llm_calls=int(os.getenv("DAILY_LLM_CALLS", "200")),
+        daily_llm_tokens=int(os.getenv("DAILY_LLM_TOKENS", "500000")),
+        rate_limit_max_keys=int(os.getenv("RATE_LIMIT_MAX_KEYS", "10000")),
+        rate_limit_idle_seconds=int(os.getenv("RATE_LIMIT_IDLE_SECONDS", "900")),
+        metrics_cache_ttl_seconds=float(os.getenv("METRICS_CACHE_TTL_SECONDS", "5")),
+        metrics_cache_stale_seconds=float(os.getenv("METRICS_CACHE_STALE_SECONDS", "60")),
+        metrics_cache_max_entries=int(os.getenv("METRICS_CACHE_MAX_ENTRIES", "10000")),
+        idempotency_ttl_seconds=int(os.getenv("IDEMPOTENCY_TTL_SECONDS", "86400")),
+        idempotency_lock_seconds=int(os.getenv("IDEMPOTENCY_LOCK_SECONDS", "300")),
+        idempotency_wait_seconds=float(os.getenv("IDEMPOTENCY_WAIT_SECONDS", "1")),
+        idempotency_sweep_seconds=int(os.getenv("IDEMPOTENCY_SWEEP_SECONDS", "600")),
     )
 
 
@@ -0,0 +1,106 @@
+import logging
+import re
+import time
+import uuid
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+from app.core.request_context import (
+    RequestContext,
+    reset_request_context,
+    set_request_context,
+)
+from app.core.runtime_metrics import runtime_metrics
+
+logger = logging.getLogger("ai_job_assistant.api")
+
+# Incoming request ids are echoed back only when they look like an id.
+_REQUEST_ID_RE = re.compile(r"^[A-Za-z0-9._-]{1,128}$")
+
+
+class RequestTimingMiddleware:
+    """
+    Pure ASGI middleware that assigns a request id, times the request and
+    reports the sub-timings collected on the RequestContext.
+
+    Unlike an ``@app.middleware("http")`` function it does not wrap the
+    request in BaseHTTPMiddleware, so it adds no extra task or body
+    buffering and streaming responses pass straight through.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        incoming_id = Headers(scope=scope).get("x-request-id", "")
+        request_id = incoming_id if _REQUEST_ID_RE.match(incoming_id) else uuid.uuid4().hex
+        context = RequestContext(request_id=request_id)
+        token = set_request_context(context)
+        status_code = 500
+
+        async def send_with_timing(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                headers = MutableHeaders(scope=message)
+                headers["X-Request-Id"] = request_id
+                headers.append("Server-Timing", context.server_timing(context.elapsed_ms()))
+                if settings.debug_query_headers:
+                    headers["X-DB-Query-Count"] = str(context.query_count)
+                    headers["X-DB-Time-Ms"] = f"{context.timings.get('db', 0.0):.2f}"
+                for name, value in context.response_headers:
+                    headers.append(name, value)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            duration_ms = (time.perf_counter() - context.started) * 1000
+            reset_request_context(token)
+
+            runtime_metrics.incr("http.requests")
+            runtime_metrics.incr(f"http.responses.{status_code // 100}xx")
+            runtime_metrics.observe("http.request", duration_ms)
+            runtime_metrics.incr("db.statements", context.query_count)
+            runtime_metrics.observe("db.request", context.timings.get("db", 0.0))
+            _check_repeated_statements(scope, context)
+
+            timings = f"queries={context.query_count} " + " ".join(
+                f"{name}_ms={value:.2f}" for name, value in context.timings.items()
+            )
+            logger.info(
+                "request completed method=%s path=%s status=%d duration_ms=%.2f "
+                "request_id=%s %s",
+                scope["method"],
+                scope["path"],
+                status_code,
+                duration_ms,
+                request_id,
+                timings,
+            )
+
+
+def _check_repeated_statements(scope: Scope, context: RequestContext) -> None:
+    """
+    Flag likely N+1 patterns: the same parameterized statement executed many
+    times while serving a single request.
+    """
+    statement, repeats = context.most_repeated_statement()
+    if statement is None or repeats < settings.n_plus_one_threshold:
+        return
+
+    runtime_metrics.incr("db.n_plus_one_requests")
+    logger.warning(
+        "possible N+1 query pattern method=%s path=%s request_id=%s repeats=%d statement=%s",
+        scope["method"],
+        scope["path"],
+        context.request_id,
+        repeats,
+        " ".join(statement.split())[:200],
+    )
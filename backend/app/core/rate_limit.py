@@ -0,0 +1,364 @@
+import logging
+import math
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+from typing import Iterator, Optional
+
+from fastapi import Depends, HTTPException, Request, status
+
+from app.core.auth import get_current_user_optional
+from app.core.config import settings
+from app.core.request_context import (
+    RequestContext,
+    get_request_context,
+    reset_request_context,
+    set_request_context,
+)
+from app.core.runtime_metrics import runtime_metrics
+from app.models.user import User
+
+logger = logging.getLogger("ai_job_assistant.rate_limit")
+
+
+@dataclass
+class RateLimitDecision:
+    allowed: bool
+    limit: int
+    remaining: int
+    # Seconds until the bucket is full again.
+    reset_seconds: float
+    # Seconds until the next request would be allowed (0 when allowed).
+    retry_after: float
+    window_seconds: float
+
+    def headers(self) -> dict[str, str]:
+        headers = {
+            "RateLimit-Limit": str(self.limit),
+            "RateLimit-Remaining": str(self.remaining),
+            "RateLimit-Reset": str(math.ceil(self.reset_seconds)),
+            "RateLimit-Policy": f"{self.limit};w={math.ceil(self.window_seconds)}",
+        }
+        if not self.allowed:
+            headers["Retry-After"] = str(max(1, math.ceil(self.retry_after)))
+        return headers
+
+
+class TokenBucketLimiter:
+    """
+    In-process token buckets keyed by client.
+
+    Buckets are kept in least-recently-used order. Buckets idle for longer
+    than idle_seconds (and at least long enough to have refilled, so nothing
+    is forgotten) are dropped on each hit, and the oldest buckets are dropped
+    once there are more than max_keys, so memory stays bounded.
+    """
+
+    def __init__(self, max_keys: int, idle_seconds: float) -> None:
+        self.max_keys = max_keys
+        self.idle_seconds = idle_seconds
+        self._buckets: OrderedDict[str, list[float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def hit(
+        self,
+        key: str,
+        capacity: int,
+        refill_per_second: float,
+        cost: float = 1,
+        now: Optional[float] = None,
+    ) -> RateLimitDecision:
+        now = time.monotonic() if now is None else now
+        refill_per_second = max(refill_per_second, 1e-9)
+        full_after = capacity / refill_per_second
+
+        with self._lock:
+            self._evict_idle(now, max(self.idle_seconds, full_after))
+
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                while len(self._buckets) >= self.max_keys:
+                    self._buckets.popitem(last=False)
+                bucket = [float(capacity), now]
+                self._buckets[key] = bucket
+            else:
+                self._buckets.move_to_end(key)
+                bucket[0] = min(capacity, bucket[0] + (now - bucket[1]) * refill_per_second)
+                bucket[1] = now
+
+            allowed = bucket[0] >= cost
+            if allowed:
+                bucket[0] -= cost
+            tokens = bucket[0]
+
+        return RateLimitDecision(
+            allowed=allowed,
+            limit=capacity,
+            remaining=int(tokens),
+            reset_seconds=(capacity - tokens) / refill_per_second,
+            retry_after=0.0 if allowed else (cost - tokens) / refill_per_second,
+            window_seconds=full_after,
+        )
+
+    def reset(self) -> None:
+        with self._lock:
+            self._buckets.clear()
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+    def _evict_idle(self, now: float, idle_seconds: float) -> None:
+        while self._buckets:
+            key, (_, last_seen) = next(iter(self._buckets.items()))
+            if now - last_seen < idle_seconds:
+                break
+            del self._buckets[key]
+
+
+class DailyQuota:
+    """
+    Per-client LLM call and token usage for the current UTC day.
+
+    Entries are kept in least-recently-used order; usage from previous days
+    is dropped as soon as it reaches the front, and at most max_keys clients
+    are tracked.
+    """
+
+    def __init__(self, max_keys: int) -> None:
+        self.max_keys = max_keys
+        self._usage: OrderedDict[str, list] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def usage(self, key: str, today: Optional[date] = None) -> tuple[int, int]:
+        today = today or _utc_today()
+        with self._lock:
+            entry = self._usage.get(key)
+            if entry is None or entry[0] != today:
+                return 0, 0
+            return entry[1], entry[2]
+
+    def record(self, key: str, calls: int, tokens: int, today: Optional[date] = None) -> None:
+        if not calls and not tokens:
+            return
+        today = today or _utc_today()
+        with self._lock:
+            entry = self._entry(key, today)
+            entry[1] += calls
+            entry[2] += tokens
+
+    def try_charge_call(
+        self, key: str, max_calls: int, max_tokens: int, today: Optional[date] = None
+    ) -> bool:
+        """
+        Charge one call unless the client has already used max_calls calls or
+        max_tokens tokens today (0 means no limit). Checking and charging
+        happen under one lock, so concurrent calls cannot all slip through.
+        """
+        today = today or _utc_today()
+        with self._lock:
+            entry = self._entry(key, today)
+            if (max_calls and entry[1] >= max_calls) or (max_tokens and entry[2] >= max_tokens):
+                return False
+            entry[1] += 1
+            return True
+
+    def reset(self) -> None:
+        with self._lock:
+            self._usage.clear()
+
+    def __len__(self) -> int:
+        return len(self._usage)
+
+    def _entry(self, key: str, today: date) -> list:
+        # Called with the lock held.
+        self._evict_stale(today)
+        entry = self._usage.get(key)
+        if entry is None:
+            while len(self._usage) >= self.max_keys:
+                self._usage.popitem(last=False)
+            entry = [today, 0, 0]
+            self._usage[key] = entry
+        else:
+            self._usage.move_to_end(key)
+        return entry
+
+    def _evict_stale(self, today: date) -> None:
+        while self._usage:
+            key, entry = next(iter(self._usage.items()))
+            if entry[0] == today:
+                break
+            del self._usage[key]
+
+
+def _utc_today() -> date:
+    return datetime.now(timezone.utc).date()
+
+
+def _seconds_until_utc_midnight() -> int:
+    now = datetime.now(timezone.utc)
+    midnight = datetime.combine(now.date() + timedelta(days=1), datetime.min.time(), timezone.utc)
+    return max(1, math.ceil((midnight - now).total_seconds()))
+
+
+def client_key(request: Request, current_user: Optional[User]) -> str:
+    """Rate-limit key: the header user when present, else the client address."""
+    if current_user is not None:
+        return f"user:{current_user.id}"
+    host = request.client.host if request.client else "unknown"
+    return f"ip:{host}"
+
+
+generate_limiter = TokenBucketLimiter(
+    settings.rate_limit_max_keys, settings.rate_limit_idle_seconds
+)
+read_limiter = TokenBucketLimiter(
+    settings.rate_limit_max_keys, settings.rate_limit_idle_seconds
+)
+llm_quota = DailyQuota(settings.rate_limit_max_keys)
+
+
+def _enforce(
+    limiter: TokenBucketLimiter,
+    scope: str,
+    request: Request,
+    current_user: Optional[User],
+    burst: int,
+    rate_per_minute: float,
+) -> None:
+    if not settings.rate_limit_enabled:
+        return
+
+    key = client_key(request, current_user)
+    decision = limiter.hit(key, capacity=burst, refill_per_second=rate_per_minute / 60)
+    headers = decision.headers()
+
+    if not decision.allowed:
+        runtime_metrics.incr(f"rate_limit.{scope}.rejected")
+        logger.warning("rate limit exceeded scope=%s key=%s path=%s", scope, key, request.url.path)
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Rate limit exceeded. Try again later.",
+            headers=headers,
+        )
+
+    context = get_request_context()
+    if context is not None:
+        context.response_headers.extend(headers.items())
+
+
+def limit_generate_requests(
+    request: Request,
+    current_user: User | None = Depends(get_current_user_optional),
+) -> None:
+    """Token-bucket limit for endpoints that call the LLM provider."""
+    _enforce(
+        generate_limiter,
+        "generate",
+        request,
+        current_user,
+        settings.generate_burst,
+        settings.generate_rate_per_minute,
+    )
+
+
+def limit_read_requests(
+    request: Request,
+    current_user: User | None = Depends(get_current_user_optional),
+) -> None:
+    """Token-bucket limit for read endpoints."""
+    _enforce(
+        read_limiter,
+        "read",
+        request,
+        current_user,
+        settings.read_burst,
+        settings.read_rate_per_minute,
+    )
+
+
+class LLMQuotaExceeded(HTTPException):
+    """429 for a client that has used up today's LLM call or token quota."""
+
+    def __init__(self) -> None:
+        super().__init__(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Daily LLM quota exceeded. Try again tomorrow.",
+            headers={"Retry-After": str(_seconds_until_utc_midnight())},
+        )
+
+
+def _quota_exhausted(key: str) -> bool:
+    calls, tokens = llm_quota.usage(key)
+    return bool(
+        (settings.daily_llm_calls and calls >= settings.daily_llm_calls)
+        or (settings.daily_llm_tokens and tokens >= settings.daily_llm_tokens)
+    )
+
+
+def _reject_over_quota(key: str) -> None:
+    runtime_metrics.incr("rate_limit.llm_quota.rejected")
+    calls, tokens = llm_quota.usage(key)
+    logger.warning("daily llm quota exceeded key=%s calls=%d tokens=%d", key, calls, tokens)
+    raise LLMQuotaExceeded()
+
+
+def enforce_llm_quota(
+    request: Request,
+    current_user: User | None = Depends(get_current_user_optional),
+) -> None:
+    """
+    Reject the request when the client has used up today's LLM call or token
+    quota, and charge the provider calls it makes to that client.
+
+    The calls themselves are charged by charge_llm_call() as they are sent,
+    so a request that makes many of them (a bulk import, a map-reduce
+    summary) stops once the quota is reached rather than after it finishes.
+    """
+    if not settings.rate_limit_enabled:
+        return
+
+    key = client_key(request, current_user)
+    if _quota_exhausted(key):
+        _reject_over_quota(key)
+
+    context = get_request_context()
+    if context is not None:
+        context.llm_quota_key = key
+
+
+@contextmanager
+def charge_llm_calls_to(key: str) -> Iterator[None]:
+    """
+    Charge the provider calls made inside the block to ``key``'s quota, for
+    work that runs after its request has returned (background tasks).
+    """
+    token = set_request_context(RequestContext(request_id="background", llm_quota_key=key))
+    try:
+        yield
+    finally:
+        reset_request_context(token)
+
+
+def charge_llm_call() -> None:
+    """
+    Charge one provider call to the current client's daily quota, before it
+    is sent. Raises LLMQuotaExceeded when the quota is used up. Does nothing
+    outside a request that enforce_llm_quota admitted (CLI jobs, tests).
+    """
+    context = get_request_context()
+    key = context.llm_quota_key if context is not None else None
+    if key is None or not settings.rate_limit_enabled:
+        return
+    if not llm_quota.try_charge_call(key, settings.daily_llm_calls, settings.daily_llm_tokens):
+        _reject_over_quota(key)
+
+
+def charge_llm_tokens(tokens: int) -> None:
+    """Add the tokens a provider call used to the current client's quota."""
+    context = get_request_context()
+    key = context.llm_quota_key if context is not None else None
+    if key is not None and settings.rate_limit_enabled:
+        llm_quota.record(key, 0, tokens)
@@ -0,0 +1,93 @@
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Iterator, Optional
+
+
+@dataclass
+class RequestContext:
+    """
+    Per-request state shared by the timing middleware and the code it wraps.
+
+    The object is stored in a context variable; sync endpoints and
+    dependencies run in the threadpool with a copy of the context, so they
+    see the same object and their timings land on it.
+    """
+
+    request_id: str
+    started: float = field(default_factory=time.perf_counter)
+    timings: dict[str, float] = field(default_factory=dict)
+    response_headers: list[tuple[str, str]] = field(default_factory=list)
+    query_count: int = 0
+    statements: Counter = field(default_factory=Counter, repr=False)
+    # Daily LLM quota key the request's provider calls are charged to
+    # (set by enforce_llm_quota).
+    llm_quota_key: Optional[str] = None
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def add_timing(self, name: str, duration_ms: float) -> None:
+        with self._lock:
+            self.timings[name] = self.timings.get(name, 0.0) + duration_ms
+
+    def record_query(self, statement: str, duration_ms: float) -> None:
+        with self._lock:
+            self.timings["db"] = self.timings.get("db", 0.0) + duration_ms
+            self.query_count += 1
+            self.statements[statement] += 1
+
+    def most_repeated_statement(self) -> tuple[Optional[str], int]:
+        with self._lock:
+            if not self.statements:
+                return None, 0
+            return self.statements.most_common(1)[0]
+
+    def elapsed_ms(self) -> float:
+        return (time.perf_counter() - self.started) * 1000
+
+    def server_timing(self, total_ms: float) -> str:
+        parts = [f"{name};dur={value:.2f}" for name, value in self.timings.items()]
+        parts.append(f"total;dur={total_ms:.2f}")
+        return ", ".join(parts)
+
+
+_current_request: ContextVar[Optional[RequestContext]] = ContextVar(
+    "current_request", default=None
+)
+
+
+def get_request_context() -> Optional[RequestContext]:
+    return _current_request.get()
+
+
+def set_request_context(context: Optional[RequestContext]):
+    return _current_request.set(context)
+
+
+def reset_request_context(token) -> None:
+    _current_request.reset(token)
+
+
+def add_timing(name: str, duration_ms: float) -> None:
+    """Add to a named sub-timing of the current request (no-op outside one)."""
+    context = _current_request.get()
+    if context is not None:
+        context.add_timing(name, duration_ms)
+
+
+def record_query(statement: str, duration_ms: float) -> None:
+    """Count a SQL statement against the current request (no-op outside one)."""
+    context = _current_request.get()
+    if context is not None:
+        context.record_query(statement, duration_ms)
+
+
+@contextmanager
+def timed(name: str) -> Iterator[None]:
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        add_timing(name, (time.perf_counter() - started) * 1000)
@@ -0,0 +1,196 @@
+import glob
+import json
+import logging
+import math
+import os
+import threading
+from typing import Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger("ai_job_assistant.metrics")
+
+# Upper bounds (ms) of the latency histogram buckets; the last bucket is open.
+LATENCY_BUCKETS_MS: tuple[float, ...] = (
+    5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, math.inf,
+)
+
+_FILE_PREFIX = "worker-"
+
+
+class RuntimeMetrics:
+    """
+    In-process counters and latency histograms.
+
+    With a shared directory configured (METRICS_MULTIPROC_DIR), each process
+    periodically writes its snapshot to ``worker-<pid>.json`` in that
+    directory, and ``aggregate`` merges the files of every worker so totals
+    cover the whole deployment rather than the process that served the call.
+    Files of exited workers are kept so counters never go backwards.
+
+    The files are written by a background thread (``start_flushing``) and
+    once more at shutdown, never from ``incr`` or ``observe``, so recording
+    a metric does no file IO on the event loop.
+    """
+
+    def __init__(self, directory: Optional[str] = None, flush_interval: float = 1.0) -> None:
+        self.directory = directory
+        self.flush_interval = flush_interval
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._counters: dict[str, float] = {}
+        self._histograms: dict[str, dict] = {}
+        self._dirty = False
+        self._flusher: Optional[threading.Thread] = None
+        self._stop_flushing = threading.Event()
+
+    def incr(self, name: str, amount: float = 1) -> None:
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + amount
+            self._dirty = True
+
+    def observe(self, name: str, value_ms: float) -> None:
+        with self._lock:
+            histogram = self._histograms.get(name)
+            if histogram is None:
+                histogram = {
+                    "buckets": [0] * len(LATENCY_BUCKETS_MS),
+                    "count": 0,
+                    "sum": 0.0,
+                }
+                self._histograms[name] = histogram
+            for index, bound in enumerate(LATENCY_BUCKETS_MS):
+                if value_ms <= bound:
+                    histogram["buckets"][index] += 1
+                    break
+            histogram["count"] += 1
+            histogram["sum"] += value_ms
+            self._dirty = True
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "counters": dict(self._counters),
+                "histograms": {
+                    name: {
+                        "buckets": list(h["buckets"]),
+                        "count": h["count"],
+                        "sum": h["sum"],
+                    }
+                    for name, h in self._histograms.items()
+                },
+            }
+
+    def aggregate(self) -> dict:
+        """Merge this process's live snapshot with every other worker's file."""
+        snapshots = [self.snapshot()]
+        if self.directory:
+            own_path = self._path()
+            for path in glob.glob(os.path.join(self.directory, f"{_FILE_PREFIX}*.json")):
+                if path == own_path:
+                    continue
+                try:
+                    with open(path, encoding="utf-8") as fh:
+                        snapshots.append(json.load(fh))
+                except (OSError, ValueError) as exc:
+                    logger.warning("skipping unreadable metrics file %s: %s", path, exc)
+
+        merged: dict = {"workers": len(snapshots), "counters": {}, "histograms": {}}
+        for snap in snapshots:
+            for name, value in snap.get("counters", {}).items():
+                merged["counters"][name] = merged["counters"].get(name, 0) + value
+            for name, h in snap.get("histograms", {}).items():
+                target = merged["histograms"].setdefault(
+                    name,
+                    {"buckets": [0] * len(LATENCY_BUCKETS_MS), "count": 0, "sum": 0.0},
+                )
+                for index, count in enumerate(h["buckets"][: len(LATENCY_BUCKETS_MS)]):
+                    target["buckets"][index] += count
+                target["count"] += h["count"]
+                target["sum"] += h["sum"]
+        return merged
+
+    def flush(self) -> None:
+        """Write this process's snapshot to its file in the shared directory."""
+        if not self.directory:
+            return
+        path = self._path()
+        # Unique per writer, so a flush can never rename another's partial file.
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with self._flush_lock:
+            with self._lock:
+                self._dirty = False
+            try:
+                os.makedirs(self.directory, exist_ok=True)
+                with open(tmp_path, "w", encoding="utf-8") as fh:
+                    json.dump(self.snapshot(), fh)
+                os.replace(tmp_path, path)
+            except OSError as exc:
+                logger.warning("could not write metrics file %s: %s", path, exc)
+
+    def start_flushing(self) -> None:
+        """Flush every flush_interval seconds from a daemon thread. Called at startup."""
+        if not self.directory or self._flusher is not None:
+            return
+        self._stop_flushing.clear()
+        self._flusher = threading.Thread(
+            target=self._flush_loop, name="metrics-flush", daemon=True
+        )
+        self._flusher.start()
+
+    def stop_flushing(self) -> None:
+        """Stop the flush thread and write a final snapshot. Called at shutdown."""
+        flusher, self._flusher = self._flusher, None
+        if flusher is not None:
+            self._stop_flushing.set()
+            flusher.join()
+        self.flush()
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+    def _flush_loop(self) -> None:
+        while not self._stop_flushing.wait(self.flush_interval):
+            # Idle workers leave their file alone.
+            if self._dirty:
+                self.flush()
+
+    def _path(self) -> str:
+        return os.path.join(self.directory, f"{_FILE_PREFIX}{os.getpid()}.json")
+
+
+def estimate_percentile(histogram: dict, percentile: float) -> Optional[float]:
+    """
+    Estimate a percentile (0-100) from histogram buckets by linear
+    interpolation inside the bucket that contains it.
+    """
+    total = histogram["count"]
+    if not total:
+        return None
+
+    rank = total * percentile / 100
+    seen = 0
+    lower = 0.0
+    for bound, count in zip(LATENCY_BUCKETS_MS, histogram["buckets"]):
+        if count and seen + count >= rank:
+            if math.isinf(bound):
+                return lower
+            return lower + (bound - lower) * (rank - seen) / count
+        seen += count
+        if not math.isinf(bound):
+            lower = bound
+    return lower
+
+
+def clear_worker_files(directory: str) -> None:
+    """Remove snapshots left behind by a previous server run."""
+    for path in glob.glob(os.path.join(directory, f"{_FILE_PREFIX}*.json*")):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+runtime_metrics = RuntimeMetrics(settings.metrics_multiproc_dir)
@@ -0,0 +1,73 @@
+"""
+Create the tables and bring databases from older versions up to date.
+
+create_all() creates missing tables (and their indexes) but never alters a
+table that already exists. Columns added to existing tables since are
+listed in ADDED_COLUMNS and added with ALTER TABLE when missing, together
+with their indexes. Afterwards every mapped column is checked, so a schema
+that still differs fails at startup instead of with a 500 on each request.
+"""
+import logging
+
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Engine
+
+import app.models  # noqa: F401  (registers every table on Base.metadata)
+from app.core.db import Base
+
+logger = logging.getLogger("ai_job_assistant.schema")
+
+# (table, column) -> column definition for ALTER TABLE ... ADD COLUMN. The
+# SQL is plain enough for both SQLite and PostgreSQL.
+ADDED_COLUMNS: dict[tuple[str, str], str] = {
+    ("resume_analyses", "summary_pending"): "BOOLEAN NOT NULL DEFAULT FALSE",
+    ("resume_analyses", "parsed"): "JSON",
+}
+
+
+class SchemaError(RuntimeError):
+    """The database schema does not match the models and cannot be upgraded."""
+
+
+def init_schema(engine: Engine) -> list[str]:
+    """
+    Create missing tables, add missing ADDED_COLUMNS and check the result.
+    Returns the columns added, as "table.column". Raises SchemaError when a
+    mapped column is still missing.
+    """
+    Base.metadata.create_all(bind=engine)
+
+    inspector = inspect(engine)
+    added = []
+    with engine.begin() as connection:
+        for (table_name, column), definition in ADDED_COLUMNS.items():
+            existing = {info["name"] for info in inspector.get_columns(table_name)}
+            if column in existing:
+                continue
+            connection.execute(
+                text(f"ALTER TABLE {table_name} ADD COLUMN {column} {definition}")
+            )
+            for index in Base.metadata.tables[table_name].indexes:
+                if column in index.columns:
+                    index.create(connection, checkfirst=True)
+            added.append(f"{table_name}.{column}")
+    if added:
+        logger.warning("database schema upgraded added_columns=%s", ",".join(added))
+
+    check_schema(engine)
+    return added
+
+
+def check_schema(engine: Engine) -> None:
+    """Raise SchemaError listing every mapped column the database lacks."""
+    inspector = inspect(engine)
+    missing = []
+    for table in Base.metadata.sorted_tables:
+        existing = {info["name"] for info in inspector.get_columns(table.name)}
+        missing.extend(
+            f"{table.name}.{column.name}" for column in table.columns if column.name not in existing
+        )
+    if missing:
+        raise SchemaError(
+            "The database schema is out of date; missing columns: " + ", ".join(missing)
+        )
@@ -1,24 +1,72 @@
+import asyncio
 import time
+from contextlib import asynccontextmanager
 
 from fastapi import FastAPI, APIRouter
 from sqlalchemy import text
-from starlette.requests import Request
 from starlette.middleware.cors import CORSMiddleware
 
 from app.api.users import router as users_router
 from app.api.resume import router as resume_router
 from app.api.answers import router as answers_router
-from app.core.db import Base, engine
+from app.api.export import router as export_router
+from app.api.imports import router as imports_router
+from app.api.dashboard import router as dashboard_router
+from app.core.db import SessionLocal, engine
 from app.core.logging_config import get_logger, setup_logging
+from app.core.middleware import RequestTimingMiddleware
+from app.core.responses import FastJSONResponse
 from app.core.config import settings
+from app.core.runtime_metrics import runtime_metrics
+from app.core.schema import init_schema
 from app.api import users, resume, answers, metrics
+from app.agents import job_assistant
+from app.core.admission import admission
+from app.services import resume_files
+from app.services.idempotency import sweep_expired_keys
 
-setup_logging()
 logger = get_logger("ai_job_assistant.api")
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Resource setup lives here rather than at import time so that importing
+    # app.main stays cheap for worker boots and test collection.
+    started = time.perf_counter()
+    setup_logging()
+    # Raises SchemaError on a database that cannot be brought up to date,
+    # so the server does not start with a schema every request would hit.
+    init_schema(engine)
+
+    # Open the first pooled connection and prepare the LLM client before the
+    # first request arrives instead of during it.
+    try:
+        with engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+    except Exception as exc:
+        logger.error("database pre-warm failed: %s", exc)
+    job_assistant.warm_up()
+
+    logger.info(
+        "startup complete provider=%s duration_ms=%.2f",
+        settings.llm_provider,
+        (time.perf_counter() - started) * 1000,
+    )
+    runtime_metrics.start_flushing()
+    sweeper = asyncio.create_task(
+        sweep_expired_keys(SessionLocal, settings.idempotency_sweep_seconds)
+    )
+    yield
+    sweeper.cancel()
+    resume_files.shutdown_pool()
+    runtime_metrics.stop_flushing()
+
+
 app = FastAPI(
     title="AI Job Assistant Backend",
     version="0.1.0",
+    lifespan=lifespan,
+    default_response_class=FastJSONResponse,
 )
 
 origins = [
@@ -32,13 +80,17 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Request-Id", "Server-Timing", "Idempotent-Replayed"],
 )
-
-Base.metadata.create_all(bind=engine)
+# Added last so it is the outermost layer and times everything below it.
+app.add_middleware(RequestTimingMiddleware)
 
 app.include_router(users_router)
 app.include_router(resume_router)
 app.include_router(answers_router)
+app.include_router(export_router)
+app.include_router(imports_router)
+app.include_router(dashboard_router)
 api_router = APIRouter(prefix="/api")
 api_router.include_router(users.router, prefix="/users", tags=["users"])
 api_router.include_router(resume.router, prefix="/resume", tags=["resume"])
@@ -46,22 +98,6 @@ api_router.include_router(answers.router, prefix="/answers", tags=["answers"])
 api_router.include_router(metrics.router, prefix="/metrics", tags=["metrics"])
 app.include_router(api_router)
 
-@app.middleware("http")
-async def request_logging_middleware(request: Request, call_next):
-    start = time.perf_counter()
-    response = await call_next(request)
-    duration_ms = (time.perf_counter() - start) * 1000
-
-    logger.info(
-        "request completed method=%s path=%s status=%d duration_ms=%.2f",
-        request.method,
-        request.url.path,
-                response.status_code,
-        duration_ms,
-    )
-    return response
-
-
 @app.get("/status")
 def get_status():
     db_ok = False
@@ -73,14 +109,20 @@ def get_status():
     except Exception as exc:
         logger.error("database health check failed: %s", exc)
 
-    overall_status = "ok" if db_ok else "degraded"
+    checks = {"database": "ok" if db_ok else "error"}
+    llm_endpoints = job_assistant.provider_status()
+    if llm_endpoints:
+        llm_ok = any(endpoint["healthy"] for endpoint in llm_endpoints)
+        checks["llm_endpoints"] = "ok" if llm_ok else "error"
+
+    overall_status = "ok" if all(check == "ok" for check in checks.values()) else "degraded"
 
     return {
         "status": overall_status,
         "version": app.version,
         "environment": settings.app_env,
         "llm_provider": settings.llm_provider,
-        "checks": {
-            "database": "ok" if db_ok else "error",
-        },
+        "llm_endpoints": llm_endpoints,
+        "admission": admission.snapshot(),
+        "checks": checks,
     }
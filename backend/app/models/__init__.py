@@ -1,5 +1,17 @@
 from app.models.user import User
 from app.models.resume_analysis import ResumeAnalysis
 from app.models.interview_answer import InterviewAnswer
+from app.models.resume_skill import ResumeSkill
+from app.models.resume_fingerprint import ResumeFingerprint
+from app.models.activity_rollup import ActivityRollup
+from app.models.idempotency_key import IdempotencyKey
 
-__all__ = ["User", "ResumeAnalysis", "InterviewAnswer"]
+__all__ = [
+    "User",
+    "ResumeAnalysis",
+    "InterviewAnswer",
+    "ResumeSkill",
+    "ResumeFingerprint",
+    "ActivityRollup",
+    "IdempotencyKey",
+]
@@ -0,0 +1,27 @@
+from sqlalchemy import Column, DateTime, Integer, String
+
+from app.core.db import Base
+
+# user_id of the rows holding totals across all users.
+GLOBAL_SCOPE = 0
+
+
+class ActivityRollup(Base):
+    """
+    Activity counts per hour and per day, for all users (user_id 0) and for
+    each user. Rows are upserted in the same transaction as the writes they
+    count (see app/services/activity_rollups.py), so they reflect what was
+    created and are not reduced when rows are deleted later.
+    """
+
+    __tablename__ = "activity_rollups"
+
+    user_id = Column(Integer, primary_key=True)
+    # "hour" or "day"
+    granularity = Column(String(8), primary_key=True)
+    # Start of the bucket in UTC, stored without a timezone.
+    bucket_start = Column(DateTime, primary_key=True)
+    analyses = Column(Integer, nullable=False, default=0)
+    answers = Column(Integer, nullable=False, default=0)
+    users = Column(Integer, nullable=False, default=0)
+    provider_fallbacks = Column(Integer, nullable=False, default=0)
@@ -0,0 +1,28 @@
+from sqlalchemy import Column, DateTime, Integer, LargeBinary, String
+
+from app.core.db import Base
+
+# user_id of keys sent without an X-User-Id header.
+ANONYMOUS_SCOPE = 0
+
+
+class IdempotencyKey(Base):
+    """
+    An Idempotency-Key seen by one of the LLM-backed POST endpoints. While
+    the first request runs, response_body is NULL and expires_at is a short
+    lease; once it succeeds the response is stored for replay until
+    expires_at (see app/services/idempotency.py).
+    """
+
+    __tablename__ = "idempotency_keys"
+
+    user_id = Column(Integer, primary_key=True)
+    endpoint = Column(String(64), primary_key=True)
+    key = Column(String(255), primary_key=True)
+    # SHA-256 of the request body and options, to reject a reused key.
+    request_hash = Column(String(64), nullable=False)
+    status_code = Column(Integer, nullable=True)
+    media_type = Column(String(64), nullable=True)
+    response_body = Column(LargeBinary, nullable=True)
+    # Naive UTC, like the activity rollup buckets.
+    expires_at = Column(DateTime, nullable=False, index=True)
@@ -8,10 +8,15 @@ class InterviewAnswer(Base):
     __tablename__ = "interview_answers"
 
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=True, index=True)
+    user_id = Column(
+        Integer,
+        ForeignKey("users.id", ondelete="CASCADE"),
+        nullable=True,
+        index=True,
+    )
     resume_analysis_id = Column(
         Integer,
-        ForeignKey("resume_analyses.id"),
+        ForeignKey("resume_analyses.id", ondelete="CASCADE"),
         nullable=True,
         index=True,
     )
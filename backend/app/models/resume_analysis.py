@@ -1,5 +1,5 @@
-from sqlalchemy import Column, DateTime, ForeignKey, Integer, String, Text
-from sqlalchemy.sql import func
+from sqlalchemy import JSON, Boolean, Column, DateTime, ForeignKey, Integer, String, Text
+from sqlalchemy.sql import false, func
 
 from app.core.db import Base
 
@@ -8,9 +8,25 @@ class ResumeAnalysis(Base):
     __tablename__ = "resume_analyses"
 
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=True, index=True)
+    user_id = Column(
+        Integer,
+        ForeignKey("users.id", ondelete="CASCADE"),
+        nullable=True,
+        index=True,
+    )
     resume_text = Column(Text, nullable=False)
     summary = Column(Text, nullable=False)
+    # Set for bulk-imported rows whose summary is filled in later by a backfill.
+    summary_pending = Column(
+        Boolean,
+        nullable=False,
+        default=False,
+        server_default=false(),
+        index=True,
+    )
+    # Output of the local resume parser (ParsedResume.to_dict()); NULL for
+    # rows stored before it existed until `python -m app.cli parse-resumes`.
+    parsed = Column(JSON, nullable=True)
     created_at = Column(
         DateTime(timezone=True),
         server_default=func.now(),
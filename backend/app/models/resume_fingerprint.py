@@ -0,0 +1,32 @@
+from sqlalchemy import BigInteger, Column, ForeignKey, Integer
+
+from app.core.db import Base
+
+
+class ResumeFingerprint(Base):
+    """
+    SimHash band index for finding a user's near-duplicate resumes.
+
+    Each analysis with a user gets one row per band of its 64-bit SimHash
+    (see app/services/simhash.py); ``band`` holds the band number and the
+    band's bits. The primary key serves lookups by user and band. The full
+    fingerprint is repeated on every row, as a signed 64-bit value, so the
+    Hamming distance can be checked without touching resume_analyses.
+    Rows are removed with their analysis by ON DELETE CASCADE.
+    """
+
+    __tablename__ = "resume_fingerprints"
+
+    user_id = Column(
+        Integer,
+        ForeignKey("users.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    band = Column(Integer, primary_key=True)
+    resume_analysis_id = Column(
+        Integer,
+        ForeignKey("resume_analyses.id", ondelete="CASCADE"),
+        primary_key=True,
+        index=True,
+    )
+    simhash = Column(BigInteger, nullable=False)
@@ -0,0 +1,33 @@
+from sqlalchemy import Column, ForeignKey, Index, Integer, String
+
+from app.core.db import Base
+
+
+class ResumeSkill(Base):
+    """
+    Inverted index from canonical skill name to the analyses mentioning it.
+
+    Rows are written with their analysis (see app/services/skill_index.py)
+    and removed with it by ON DELETE CASCADE. The primary key keeps each
+    skill's postings sorted by analysis id; user_id is copied from the
+    analysis so user-scoped searches walk a per-user copy of the postings.
+    """
+
+    __tablename__ = "resume_skills"
+
+    skill = Column(String, primary_key=True)
+    resume_analysis_id = Column(
+        Integer,
+        ForeignKey("resume_analyses.id", ondelete="CASCADE"),
+        primary_key=True,
+        index=True,
+    )
+    user_id = Column(
+        Integer,
+        ForeignKey("users.id", ondelete="CASCADE"),
+        nullable=True,
+    )
+
+    __table_args__ = (
+        Index("ix_resume_skills_user_skill", "user_id", "skill", "resume_analysis_id"),
+    )
@@ -1,12 +1,54 @@
-from app.schemas.user import UserCreate, UserRead
-from app.schemas.resume import ResumeAnalyzeRequest, ResumeAnalysisRead
+from app.schemas.user import UserCreate, UserDataPurgeRead, UserRead
+from app.schemas.resume import (
+    ParsedResumeRead,
+    ResumeAnalyzeRequest,
+    ResumeAnalysisListItem,
+    ResumeAnalysisRead,
+    SkillMatch,
+)
 from app.schemas.answer import GenerateAnswerRequest, InterviewAnswerRead
+from app.schemas.metrics import (
+    ActivityPoint,
+    ActivityTimeseries,
+    MetricsBucket,
+    MetricsScope,
+    MetricsSummary,
+)
+from app.schemas.dashboard import (
+    DashboardRead,
+    InterviewAnswerWithDashboard,
+    ResponseInclude,
+    ResumeAnalysisWithDashboard,
+)
+from app.schemas.imports import (
+    ImportInterviewAnswer,
+    ImportLineError,
+    ImportReport,
+    ImportResumeAnalysis,
+)
 
 __all__ = [
     "UserCreate",
     "UserRead",
+    "UserDataPurgeRead",
     "ResumeAnalyzeRequest",
     "ResumeAnalysisRead",
+    "ResumeAnalysisListItem",
+    "ParsedResumeRead",
+    "SkillMatch",
     "GenerateAnswerRequest",
     "InterviewAnswerRead",
+    "MetricsSummary",
+    "ActivityPoint",
+    "ActivityTimeseries",
+    "MetricsBucket",
+    "MetricsScope",
+    "DashboardRead",
+    "ResumeAnalysisWithDashboard",
+    "InterviewAnswerWithDashboard",
+    "ResponseInclude",
+    "ImportResumeAnalysis",
+    "ImportInterviewAnswer",
+    "ImportLineError",
+    "ImportReport",
 ]
@@ -1,6 +1,6 @@
 from datetime import datetime
 
-from pydantic import BaseModel, Field, ConfigDict
+from pydantic import BaseModel, Field, ConfigDict, TypeAdapter
 
 
 class GenerateAnswerRequest(BaseModel):
@@ -23,3 +23,7 @@ class InterviewAnswerRead(BaseModel):
     answer: str
     created_at: datetime
     provider: str
+
+
+interview_answer_adapter = TypeAdapter(InterviewAnswerRead)
+interview_answer_list_adapter = TypeAdapter(list[InterviewAnswerRead])
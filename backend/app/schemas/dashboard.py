@@ -0,0 +1,34 @@
+from enum import Enum
+from typing import List, Optional
+
+from pydantic import BaseModel, TypeAdapter
+
+from app.schemas.answer import InterviewAnswerRead
+from app.schemas.metrics import MetricsSummary
+from app.schemas.resume import ResumeAnalysisRead
+
+
+class ResponseInclude(str, Enum):
+    DASHBOARD = "dashboard"
+
+
+class DashboardRead(BaseModel):
+    user_id: int
+    metrics: MetricsSummary
+    recent_analyses: List[ResumeAnalysisRead]
+    recent_answers: List[InterviewAnswerRead]
+    resume_analysis_id: Optional[int] = None
+    analysis_answers: List[InterviewAnswerRead] = []
+
+
+class ResumeAnalysisWithDashboard(ResumeAnalysisRead):
+    dashboard: DashboardRead
+
+
+class InterviewAnswerWithDashboard(InterviewAnswerRead):
+    dashboard: DashboardRead
+
+
+dashboard_adapter = TypeAdapter(DashboardRead)
+resume_analysis_with_dashboard_adapter = TypeAdapter(ResumeAnalysisWithDashboard)
+interview_answer_with_dashboard_adapter = TypeAdapter(InterviewAnswerWithDashboard)
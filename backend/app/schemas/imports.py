@@ -0,0 +1,49 @@
+from datetime import datetime
+from typing import Annotated, Literal, Union
+
+from pydantic import BaseModel, Field, TypeAdapter
+
+
+class ImportResumeAnalysis(BaseModel):
+    record_type: Literal["resume_analysis"]
+    id: int | None = Field(default=None, ge=1)
+    user_id: int | None = None
+    resume_text: str = Field(min_length=20)
+    summary: str | None = None
+    created_at: datetime | None = None
+
+
+class ImportInterviewAnswer(BaseModel):
+    record_type: Literal["interview_answer"]
+    id: int | None = Field(default=None, ge=1)
+    user_id: int | None = None
+    resume_analysis_id: int | None = None
+    question: str = Field(min_length=5)
+    job_title: str | None = Field(default=None, max_length=100)
+    company_name: str | None = Field(default=None, max_length=100)
+    answer: str = Field(min_length=1)
+    created_at: datetime | None = None
+
+
+ImportRecord = Annotated[
+    Union[ImportResumeAnalysis, ImportInterviewAnswer],
+    Field(discriminator="record_type"),
+]
+
+# Parses and validates one NDJSON line in a single pass.
+import_record_adapter: TypeAdapter[ImportRecord] = TypeAdapter(ImportRecord)
+
+
+class ImportLineError(BaseModel):
+    line: int
+    error: str
+
+
+class ImportReport(BaseModel):
+    lines_read: int = 0
+    resume_analyses_imported: int = 0
+    answers_imported: int = 0
+    failed_lines: int = 0
+    summaries_pending: int = 0
+    errors: list[ImportLineError] = Field(default_factory=list)
+    errors_truncated: bool = False
@@ -0,0 +1,40 @@
+from datetime import datetime
+from enum import Enum
+from typing import Optional
+
+from pydantic import BaseModel
+
+
+class MetricsSummary(BaseModel):
+    total_users: int
+    total_resume_analyses: int
+    total_answers: int
+    user_resume_analyses: Optional[int] = None
+    user_answers: Optional[int] = None
+
+
+class MetricsBucket(str, Enum):
+    HOUR = "hour"
+    DAY = "day"
+
+
+class MetricsScope(str, Enum):
+    GLOBAL = "global"
+    USER = "user"
+
+
+class ActivityPoint(BaseModel):
+    bucket_start: datetime
+    analyses: int = 0
+    answers: int = 0
+    users: int = 0
+    provider_fallbacks: int = 0
+
+
+class ActivityTimeseries(BaseModel):
+    bucket: MetricsBucket
+    scope: MetricsScope
+    user_id: Optional[int] = None
+    start: datetime
+    end: datetime
+    points: list[ActivityPoint]
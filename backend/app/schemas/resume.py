@@ -1,11 +1,36 @@
 from datetime import datetime
+from enum import Enum
 
-from pydantic import BaseModel, Field, ConfigDict
+from pydantic import BaseModel, Field, ConfigDict, TypeAdapter
 
 
 class ResumeAnalyzeRequest(BaseModel):
     user_id: int | None = None
     resume_text: str = Field(min_length=20)
+    # When false, always summarize instead of reusing the summary of a
+    # near-duplicate earlier resume.
+    reuse_similar_summary: bool = True
+
+
+class SkillMatch(str, Enum):
+    ALL = "all"
+    ANY = "any"
+
+
+class ResumeSectionRead(BaseModel):
+    name: str
+    lines: int
+
+
+class ParsedResumeRead(BaseModel):
+    sections: list[ResumeSectionRead]
+    skills: list[str]
+    years_experience: float | None
+    titles: list[str]
+    degrees: list[str]
+    word_count: int
+    line_count: int
+    version: int
 
 
 class ResumeAnalysisRead(BaseModel):
@@ -17,3 +42,16 @@ class ResumeAnalysisRead(BaseModel):
     summary: str
     created_at: datetime
     provider: str
+    parsed: ParsedResumeRead | None = None
+    # Set by analyze when the summary was reused from this earlier analysis.
+    reused_from_id: int | None = None
+
+
+class ResumeAnalysisListItem(ResumeAnalysisRead):
+    answer_count: int = 0
+    last_answer_at: datetime | None = None
+
+
+resume_analysis_adapter = TypeAdapter(ResumeAnalysisRead)
+resume_analysis_list_adapter = TypeAdapter(list[ResumeAnalysisRead])
+resume_analysis_list_item_adapter = TypeAdapter(list[ResumeAnalysisListItem])
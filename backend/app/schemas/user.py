@@ -15,3 +15,9 @@ class UserRead(BaseModel):
     email: EmailStr
     full_name: str
     created_at: datetime
+
+
+class UserDataPurgeRead(BaseModel):
+    user_id: int
+    resume_analyses_deleted: int
+    answers_deleted: int
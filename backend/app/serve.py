@@ -0,0 +1,113 @@
+"""
+Production launcher for the API.
+
+Usage (from backend/):
+
+    python -m app.serve [--host 0.0.0.0] [--port 8000] [--workers N]
+
+Worker count defaults to WEB_CONCURRENCY or the number of usable CPU cores.
+uvloop and httptools are used when installed. With more than one worker,
+runtime metrics are shared through METRICS_MULTIPROC_DIR (a temporary
+directory is created when it is not set) so /api/metrics/runtime reports
+totals across all workers.
+"""
+import argparse
+import importlib
+import importlib.util
+import logging
+import os
+import sys
+import tempfile
+
+import uvicorn
+
+from app.core.config import settings
+from app.core.runtime_metrics import clear_worker_files
+
+logger = logging.getLogger("ai_job_assistant.serve")
+
+APP_IMPORT_PATH = "app.main:app"
+DEFAULT_BACKLOG = 2048
+DEFAULT_KEEP_ALIVE_SECONDS = 5
+
+
+def default_worker_count() -> int:
+    if settings.web_concurrency:
+        return settings.web_concurrency
+    try:
+        cores = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cores = os.cpu_count() or 1
+    return max(1, cores)
+
+
+def build_uvicorn_options(args: argparse.Namespace) -> dict:
+    return {
+        "host": args.host,
+        "port": args.port,
+        "workers": args.workers,
+        "loop": "uvloop" if importlib.util.find_spec("uvloop") else "asyncio",
+        "http": "httptools" if importlib.util.find_spec("httptools") else "h11",
+        "backlog": args.backlog,
+        "timeout_keep_alive": args.keep_alive,
+        "log_level": settings.log_level.lower(),
+        # The access log is written by the request middleware already.
+        "access_log": False,
+    }
+
+
+def prepare_metrics_dir(workers: int) -> str | None:
+    directory = settings.metrics_multiproc_dir
+    if directory is None and workers > 1:
+        directory = tempfile.mkdtemp(prefix="ai-job-assistant-metrics-")
+    if directory is not None:
+        os.makedirs(directory, exist_ok=True)
+        clear_worker_files(directory)
+        # Workers are spawned as new interpreters and read it from the environment.
+        os.environ["METRICS_MULTIPROC_DIR"] = directory
+    return directory
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m app.serve")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--backlog", type=int, default=DEFAULT_BACKLOG)
+    parser.add_argument("--keep-alive", type=int, default=DEFAULT_KEEP_ALIVE_SECONDS)
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    if args.workers is None:
+        args.workers = default_worker_count()
+
+    metrics_dir = prepare_metrics_dir(args.workers)
+
+    # Preload: import the application once in the supervisor so a broken
+    # import fails fast instead of crash-looping every worker, and so bytecode
+    # caches are warm before the workers start.
+    module_name, _, attr = APP_IMPORT_PATH.partition(":")
+    app = getattr(importlib.import_module(module_name), attr)
+
+    options = build_uvicorn_options(args)
+    logger.info(
+        "starting server workers=%s loop=%s http=%s metrics_dir=%s",
+        options["workers"],
+        options["loop"],
+        options["http"],
+        metrics_dir,
+    )
+
+    if args.workers == 1:
+        # A single worker serves the preloaded app object in this process.
+        options.pop("workers")
+        uvicorn.run(app, **options)
+    else:
+        uvicorn.run(APP_IMPORT_PATH, **options)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
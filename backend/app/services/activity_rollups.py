@@ -0,0 +1,187 @@
+import logging
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from sqlalchemy import select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models import ActivityRollup, InterviewAnswer, ResumeAnalysis, User
+from app.models.activity_rollup import GLOBAL_SCOPE
+from app.schemas.metrics import ActivityPoint, MetricsBucket
+
+logger = logging.getLogger("ai_job_assistant.rollups")
+
+COUNTERS = ("analyses", "answers", "users", "provider_fallbacks")
+BUCKET_STEPS = {
+    MetricsBucket.HOUR: timedelta(hours=1),
+    MetricsBucket.DAY: timedelta(days=1),
+}
+REBUILD_BATCH_SIZE = 5000
+
+_rollups = ActivityRollup.__table__
+
+
+def _utc_naive(at: datetime) -> datetime:
+    if at.tzinfo is not None:
+        at = at.astimezone(timezone.utc).replace(tzinfo=None)
+    return at
+
+
+def bucket_start(at: datetime, bucket: MetricsBucket) -> datetime:
+    """Start of the UTC hour or day containing ``at``, without a timezone."""
+    at = _utc_naive(at)
+    if bucket is MetricsBucket.HOUR:
+        return at.replace(minute=0, second=0, microsecond=0)
+    return at.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def provider_fallback(provider_used: str) -> int:
+    """1 when a request was served by a different provider than configured."""
+    return int(provider_used != settings.llm_provider)
+
+
+class ActivityCounts:
+    """
+    Accumulates activity into hourly and daily buckets, globally and per
+    user, and writes it with a single upsert statement.
+    """
+
+    def __init__(self) -> None:
+        self._rows: dict[tuple, dict[str, int]] = defaultdict(lambda: dict.fromkeys(COUNTERS, 0))
+
+    def add(self, at: datetime, user_id: Optional[int] = None, **counts: int) -> None:
+        scopes = {GLOBAL_SCOPE, user_id} if user_id is not None else {GLOBAL_SCOPE}
+        for bucket in BUCKET_STEPS:
+            start = bucket_start(at, bucket)
+            for scope in scopes:
+                row = self._rows[(scope, bucket.value, start)]
+                for name, value in counts.items():
+                    row[name] += value
+
+    def flush(self, db: Session) -> None:
+        """Add the accumulated counts to the rollup table, without committing."""
+        if not self._rows:
+            return
+        # Sorted so concurrent writers lock rows in the same order.
+        rows = [
+            {"user_id": scope, "granularity": granularity, "bucket_start": start, **counts}
+            for (scope, granularity, start), counts in sorted(self._rows.items())
+        ]
+        self._rows.clear()
+
+        dialect = postgresql if db.get_bind().dialect.name == "postgresql" else sqlite
+        stmt = dialect.insert(_rollups)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[_rollups.c.user_id, _rollups.c.granularity, _rollups.c.bucket_start],
+            set_={name: _rollups.c[name] + stmt.excluded[name] for name in COUNTERS},
+        )
+        db.execute(stmt, rows)
+
+
+def record_activity(
+    db: Session,
+    user_id: Optional[int] = None,
+    at: Optional[datetime] = None,
+    **counts: int,
+) -> None:
+    """
+    Count one write in the rollups, in the caller's transaction (one
+    statement). ``counts`` are ActivityRollup counter names, e.g.
+    ``analyses=1``.
+    """
+    activity = ActivityCounts()
+    activity.add(at or datetime.now(timezone.utc), user_id, **counts)
+    activity.flush(db)
+
+
+def query_timeseries(
+    db: Session,
+    bucket: MetricsBucket,
+    start: datetime,
+    end: datetime,
+    user_id: Optional[int] = None,
+) -> list[ActivityPoint]:
+    """
+    One point per bucket from start to end (inclusive, zero-filled), read
+    from the rollups: a 90-day daily series reads at most 90 rows.
+    """
+    first, last = bucket_start(start, bucket), bucket_start(end, bucket)
+    rows = db.execute(
+        select(_rollups.c.bucket_start, *(_rollups.c[name] for name in COUNTERS)).where(
+            _rollups.c.user_id == (GLOBAL_SCOPE if user_id is None else user_id),
+            _rollups.c.granularity == bucket.value,
+            _rollups.c.bucket_start >= first,
+            _rollups.c.bucket_start <= last,
+        )
+    ).all()
+    by_start = {row.bucket_start: row._mapping for row in rows}
+
+    step = BUCKET_STEPS[bucket]
+    points = []
+    current = first
+    while current <= last:
+        counts = by_start.get(current, {})
+        points.append(
+            ActivityPoint(
+                bucket_start=current.replace(tzinfo=timezone.utc),
+                **{name: counts.get(name, 0) for name in COUNTERS},
+            )
+        )
+        current += step
+    return points
+
+
+def bucket_count(bucket: MetricsBucket, start: datetime, end: datetime) -> int:
+    first, last = bucket_start(start, bucket), bucket_start(end, bucket)
+    return (last - first) // BUCKET_STEPS[bucket] + 1
+
+
+def rebuild_activity_rollups(db: Session, batch_size: int = REBUILD_BATCH_SIZE) -> int:
+    """
+    Recompute the analysis, answer and user counts from the stored rows, for
+    data written before the rollups existed or after manual changes.
+
+    provider_fallbacks cannot be derived from stored rows and is kept. Runs
+    in one transaction so readers never see partial counts. Returns the
+    number of rows counted.
+    """
+    sources = (
+        (ResumeAnalysis, "analyses", ResumeAnalysis.user_id),
+        (InterviewAnswer, "answers", InterviewAnswer.user_id),
+        (User, "users", None),
+    )
+    counted = 0
+    try:
+        db.execute(update(_rollups).values(analyses=0, answers=0, users=0))
+        for model, counter, user_column in sources:
+            last_id = 0
+            while True:
+                columns = [model.id, model.created_at]
+                if user_column is not None:
+                    columns.append(user_column)
+                batch = db.execute(
+                    select(*columns).where(model.id > last_id).order_by(model.id).limit(batch_size)
+                ).all()
+                if not batch:
+                    break
+
+                activity = ActivityCounts()
+                for row in batch:
+                    user_id = row[2] if user_column is not None else None
+                    activity.add(row.created_at, user_id, **{counter: 1})
+                activity.flush(db)
+
+                counted += len(batch)
+                last_id = batch[-1].id
+        db.commit()
+    except SQLAlchemyError as exc:
+        db.rollback()
+        logger.error("activity rollup rebuild failed error=%s", exc)
+        raise
+
+    logger.info("activity rollups rebuilt rows=%s", counted)
+    return counted
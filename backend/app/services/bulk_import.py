@@ -0,0 +1,547 @@
+import logging
+from datetime import datetime, timezone
+from typing import Callable, Iterable, Iterator, Optional
+
+from pydantic import ValidationError
+from sqlalchemy import insert, select, text, update
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from app.agents.job_assistant import summarize_resume
+from app.core.rate_limit import LLMQuotaExceeded
+from app.models import InterviewAnswer, ResumeAnalysis
+from app.services.activity_rollups import ActivityCounts
+from app.services.resume_parser import PARSER_VERSION, parse_resume
+from app.services.near_duplicates import index_fingerprints
+from app.services.simhash import simhash
+from app.services.skill_index import index_skills
+from app.schemas.imports import (
+    ImportInterviewAnswer,
+    ImportLineError,
+    ImportReport,
+    ImportResumeAnalysis,
+    import_record_adapter,
+)
+
+logger = logging.getLogger("ai_job_assistant.import")
+
+DEFAULT_CHUNK_SIZE = 1000
+# Lines longer than this are rejected instead of being buffered indefinitely.
+MAX_LINE_BYTES = 5 * 1024 * 1024
+# Upper bound on per-line errors kept in the report; the count keeps growing.
+MAX_REPORTED_ERRORS = 1000
+
+
+class NDJSONLineSplitter:
+    """
+    Split an arbitrary sequence of byte chunks into complete NDJSON lines.
+
+    Only the trailing partial line is buffered between chunks. A line that
+    grows past MAX_LINE_BYTES is dropped and reported as None so the caller
+    can record an error for it without holding it in memory.
+    """
+
+    def __init__(self) -> None:
+        self._buffer = b""
+        self._overflow = False
+
+    def feed(self, chunk: bytes) -> list[Optional[bytes]]:
+        data = self._buffer + chunk
+        parts = data.split(b"\n")
+        self._buffer = parts.pop()
+
+        lines: list[Optional[bytes]] = []
+        for part in parts:
+            if self._overflow:
+                self._overflow = False
+                lines.append(None)
+            else:
+                lines.append(part)
+
+        if len(self._buffer) > MAX_LINE_BYTES:
+            self._buffer = b""
+            self._overflow = True
+        return lines
+
+    def close(self) -> list[Optional[bytes]]:
+        if self._overflow:
+            self._overflow = False
+            return [None]
+        rest, self._buffer = self._buffer, b""
+        return [rest] if rest.strip() else []
+
+
+class NDJSONImporter:
+    """
+    Validate NDJSON records and insert them in chunks.
+
+    Each chunk is written with one executemany-style INSERT per table inside a
+    savepoint and then committed. If a chunk fails (for example a duplicate id
+    or a broken foreign key) it is retried row by row so the offending lines
+    can be reported while the rest of the chunk is still stored.
+
+    When ``user_id`` is set every record is scoped to that user: records for
+    other users are rejected and missing user ids default to it.
+
+    Record ids are only kept with ``keep_ids`` (a trusted restore from the
+    CLI, after which PostgreSQL id sequences are advanced past them).
+    Otherwise the database assigns ids, and an answer's resume_analysis_id
+    must name a resume analysis earlier in the same file; it is rewritten
+    to that analysis's new id.
+    """
+
+    def __init__(
+        self,
+        db: Session,
+        *,
+        user_id: Optional[int] = None,
+        defer_summaries: bool = False,
+        keep_ids: bool = False,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        progress: Optional[Callable[[ImportReport], None]] = None,
+    ) -> None:
+        self.db = db
+        self.user_id = user_id
+        self.defer_summaries = defer_summaries
+        self.keep_ids = keep_ids
+        self.chunk_size = chunk_size
+        self.progress = progress
+        self.report = ImportReport()
+
+        self._analyses: list[tuple[int, dict]] = []
+        self._answers: list[tuple[int, dict]] = []
+        # Without keep_ids: the file's id of each buffered analysis, by line,
+        # and the database id of every analysis imported so far, by file id.
+        self._file_ids: dict[int, int] = {}
+        self._seen_file_ids: set[int] = set()
+        self._imported_ids: dict[int, int] = {}
+        # Database ids of the analyses imported with a deferred summary.
+        self.pending_ids: list[int] = []
+
+    def feed_lines(self, lines: Iterable[Optional[bytes]]) -> None:
+        for line in lines:
+            self.feed_line(line)
+
+    def feed_line(self, raw: Optional[bytes | str]) -> None:
+        self.report.lines_read += 1
+        line_no = self.report.lines_read
+
+        if raw is None:
+            self._record_error(line_no, f"line exceeds {MAX_LINE_BYTES} bytes")
+            return
+        if not raw.strip():
+            return
+
+        try:
+            record = import_record_adapter.validate_json(raw)
+        except ValidationError as exc:
+            first = exc.errors()[0]
+            location = ".".join(str(part) for part in first["loc"])
+            message = f"{location}: {first['msg']}" if location else first["msg"]
+            self._record_error(line_no, message)
+            return
+
+        if self.user_id is not None:
+            if record.user_id is None:
+                record.user_id = self.user_id
+            elif record.user_id != self.user_id:
+                self._record_error(line_no, "user_id does not match authenticated user")
+                return
+
+        if isinstance(record, ImportResumeAnalysis):
+            if not self.keep_ids and record.id is not None:
+                if record.id in self._seen_file_ids:
+                    self._record_error(line_no, "id is repeated in the file")
+                    return
+                self._seen_file_ids.add(record.id)
+                self._file_ids[line_no] = record.id
+            self._analyses.append((line_no, self._analysis_row(record)))
+        else:
+            self._answers.append((line_no, self._answer_row(record)))
+
+        if len(self._analyses) + len(self._answers) >= self.chunk_size:
+            self.flush()
+
+    def finish(self) -> ImportReport:
+        self.flush()
+        if self.keep_ids:
+            _advance_id_sequences(self.db)
+        logger.info(
+            "import finished lines=%s resume_analyses=%s answers=%s failed=%s pending=%s",
+            self.report.lines_read,
+            self.report.resume_analyses_imported,
+            self.report.answers_imported,
+            self.report.failed_lines,
+            self.report.summaries_pending,
+        )
+        return self.report
+
+    def flush(self) -> None:
+        if not self._analyses and not self._answers:
+            return
+
+        analyses, self._analyses = self._analyses, []
+        answers, self._answers = self._answers, []
+
+        # Analyses go first so answers in the same chunk can reference them.
+        inserted = self._insert_chunk(ResumeAnalysis, analyses)
+        self.report.resume_analyses_imported += len(inserted)
+        pending = [analysis_id for _, row, analysis_id in inserted if row["summary_pending"]]
+        self.pending_ids.extend(pending)
+        self.report.summaries_pending += len(pending)
+        for line_no, _, analysis_id in inserted:
+            file_id = self._file_ids.pop(line_no, None)
+            if file_id is not None:
+                self._imported_ids[file_id] = analysis_id
+        self._file_ids.clear()
+
+        answers = self._check_answer_references(answers)
+        self.report.answers_imported += len(self._insert_chunk(InterviewAnswer, answers))
+
+        logger.info(
+            "import progress lines=%s resume_analyses=%s answers=%s failed=%s",
+            self.report.lines_read,
+            self.report.resume_analyses_imported,
+            self.report.answers_imported,
+            self.report.failed_lines,
+        )
+        if self.progress is not None:
+            self.progress(self.report)
+
+    def _analysis_row(self, record: ImportResumeAnalysis) -> dict:
+        # Parsing is local and cheap, so it is never deferred.
+        parsed = parse_resume(record.resume_text)
+        summary = record.summary
+        pending = False
+        if summary is None and not self.defer_summaries:
+            try:
+                summary, _ = summarize_resume(record.resume_text, parsed)
+            except LLMQuotaExceeded:
+                # Stop calling the provider; this and later resumes are
+                # summarized by the backfill once there is quota again.
+                logger.warning("llm quota reached during import, deferring remaining summaries")
+                self.defer_summaries = True
+        if summary is None:
+            summary, pending = "", True
+
+        row = {
+            "user_id": record.user_id,
+            "resume_text": record.resume_text,
+            "summary": summary,
+            "summary_pending": pending,
+            "parsed": parsed.to_dict(),
+            "created_at": record.created_at or datetime.now(timezone.utc),
+        }
+        if self.keep_ids and record.id is not None:
+            row["id"] = record.id
+        return row
+
+    def _answer_row(self, record: ImportInterviewAnswer) -> dict:
+        row = {
+            "user_id": record.user_id,
+            "resume_analysis_id": record.resume_analysis_id,
+            "question": record.question,
+            "job_title": record.job_title,
+            "company_name": record.company_name,
+            "answer": record.answer,
+            "created_at": record.created_at or datetime.now(timezone.utc),
+        }
+        if self.keep_ids and record.id is not None:
+            row["id"] = record.id
+        return row
+
+    def _check_answer_references(
+        self, answers: list[tuple[int, dict]]
+    ) -> list[tuple[int, dict]]:
+        if not self.keep_ids:
+            answers = self._remap_answer_references(answers)
+        referenced = {
+            row["resume_analysis_id"]
+            for _, row in answers
+            if row["resume_analysis_id"] is not None
+        }
+        if not referenced:
+            return answers
+
+        found = dict(
+            self.db.execute(
+                select(ResumeAnalysis.id, ResumeAnalysis.user_id).where(
+                    ResumeAnalysis.id.in_(referenced)
+                )
+            ).all()
+        )
+
+        valid: list[tuple[int, dict]] = []
+        for line_no, row in answers:
+            analysis_id = row["resume_analysis_id"]
+            if analysis_id is None:
+                valid.append((line_no, row))
+            elif analysis_id not in found:
+                self._record_error(line_no, "resume_analysis_id does not exist")
+            elif found[analysis_id] is not None and found[analysis_id] != row["user_id"]:
+                self._record_error(
+                    line_no, "resume analysis does not belong to the record's user"
+                )
+            else:
+                valid.append((line_no, row))
+        return valid
+
+    def _remap_answer_references(
+        self, answers: list[tuple[int, dict]]
+    ) -> list[tuple[int, dict]]:
+        valid: list[tuple[int, dict]] = []
+        for line_no, row in answers:
+            file_id = row["resume_analysis_id"]
+            if file_id is None:
+                valid.append((line_no, row))
+            elif file_id not in self._imported_ids:
+                self._record_error(
+                    line_no, "resume_analysis_id is not an analysis imported earlier in the file"
+                )
+            else:
+                valid.append((line_no, {**row, "resume_analysis_id": self._imported_ids[file_id]}))
+        return valid
+
+    def _insert_chunk(
+        self, model, rows: list[tuple[int, dict]]
+    ) -> list[tuple[int, dict, Optional[int]]]:
+        """
+        Insert rows and return the ones that were stored, as (line, row, id);
+        the id is only known for resume analyses.
+        """
+        if not rows:
+            return []
+
+        try:
+            with self.db.begin_nested():
+                ids: dict[int, int] = {}
+                for group in _group_by_columns(rows):
+                    ids.update(self._insert_group(model, group))
+            self.db.commit()
+            return [(line_no, row, ids.get(line_no)) for line_no, row in rows]
+        except SQLAlchemyError as exc:
+            logger.warning(
+                "import chunk failed table=%s rows=%s, retrying row by row error=%s",
+                model.__tablename__,
+                len(rows),
+                exc,
+            )
+
+        inserted: list[tuple[int, dict, Optional[int]]] = []
+        for line_no, row in rows:
+            try:
+                with self.db.begin_nested():
+                    ids = self._insert_group(model, [(line_no, row)])
+                inserted.append((line_no, row, ids.get(line_no)))
+            except SQLAlchemyError as exc:
+                self._record_error(line_no, _describe_db_error(exc))
+        self.db.commit()
+        return inserted
+
+    def _insert_group(self, model, pairs: list[tuple[int, dict]]) -> dict[int, int]:
+        """Insert rows with the same columns; returns new analysis ids by line."""
+        group = [row for _, row in pairs]
+        # Activity rollups are bucketed by each record's created_at and
+        # written in the same transaction as the rows they count.
+        counter = "analyses" if model is ResumeAnalysis else "answers"
+        activity = ActivityCounts()
+        for row in group:
+            activity.add(row["created_at"], row["user_id"], **{counter: 1})
+
+        if model is not ResumeAnalysis:
+            self.db.execute(insert(model), group)
+            activity.flush(self.db)
+            return {}
+        # Analyses are inserted with RETURNING so their skills and fingerprints
+        # can be indexed in the same transaction.
+        ids = self.db.scalars(
+            insert(ResumeAnalysis).returning(ResumeAnalysis.id, sort_by_parameter_order=True),
+            group,
+        ).all()
+        index_skills(
+            self.db,
+            [
+                (analysis_id, row["user_id"], row["parsed"]["skills"])
+                for analysis_id, row in zip(ids, group)
+            ],
+        )
+        index_fingerprints(
+            self.db,
+            [
+                (analysis_id, row["user_id"], simhash(row["resume_text"]))
+                for analysis_id, row in zip(ids, group)
+                if row["user_id"] is not None
+            ],
+        )
+        activity.flush(self.db)
+        return {line_no: analysis_id for (line_no, _), analysis_id in zip(pairs, ids)}
+
+    def _record_error(self, line_no: int, message: str) -> None:
+        self.report.failed_lines += 1
+        if len(self.report.errors) < MAX_REPORTED_ERRORS:
+            self.report.errors.append(ImportLineError(line=line_no, error=message))
+        else:
+            self.report.errors_truncated = True
+
+
+def backfill_pending_summaries(
+    db: Session,
+    batch_size: int = 50,
+    analysis_ids: Optional[list[int]] = None,
+) -> int:
+    """
+    Summarize resume analyses that were imported with deferred summaries:
+    the rows in ``analysis_ids``, or every pending row when it is None.
+
+    Each row is claimed with a conditional UPDATE on summary_pending before
+    the provider is called, so overlapping backfills never summarize the
+    same row twice; a row whose summary fails is released again. Provider
+    calls are charged to the quota key of the current request context.
+    Returns the number of rows summarized.
+    """
+    done = 0
+    for batch in _pending_summary_batches(db, batch_size, analysis_ids):
+        for analysis_id, resume_text in batch:
+            if not _set_summary_pending(db, analysis_id, claim=True):
+                continue
+            try:
+                summary_text, _ = summarize_resume(resume_text, parse_resume(resume_text))
+            except LLMQuotaExceeded:
+                _set_summary_pending(db, analysis_id, claim=False)
+                logger.warning("summary backfill stopped at the llm quota summarized=%s", done)
+                return done
+            except Exception:
+                _set_summary_pending(db, analysis_id, claim=False)
+                raise
+            db.execute(
+                update(ResumeAnalysis)
+                .where(ResumeAnalysis.id == analysis_id)
+                .values(summary=summary_text)
+            )
+            db.commit()
+            done += 1
+        logger.info("summary backfill progress summarized=%s", done)
+
+    return done
+
+
+def _pending_summary_batches(
+    db: Session, batch_size: int, analysis_ids: Optional[list[int]]
+) -> Iterator[list[tuple[int, str]]]:
+    query = (
+        select(ResumeAnalysis.id, ResumeAnalysis.resume_text)
+        .where(ResumeAnalysis.summary_pending.is_(True))
+        .order_by(ResumeAnalysis.id)
+    )
+    if analysis_ids is not None:
+        ids = sorted(analysis_ids)
+        for start in range(0, len(ids), batch_size):
+            batch = db.execute(
+                query.where(ResumeAnalysis.id.in_(ids[start:start + batch_size]))
+            ).all()
+            if batch:
+                yield batch
+        return
+
+    last_id = 0
+    while True:
+        batch = db.execute(
+            query.where(ResumeAnalysis.id > last_id).limit(batch_size)
+        ).all()
+        if not batch:
+            return
+        yield batch
+        last_id = batch[-1][0]
+
+
+def _set_summary_pending(db: Session, analysis_id: int, *, claim: bool) -> bool:
+    """
+    Claim a pending row (clear summary_pending) or release a claimed one.
+    The UPDATE only matches while the flag still has the expected value, so
+    of several concurrent claims exactly one returns True.
+    """
+    try:
+        result = db.execute(
+            update(ResumeAnalysis)
+            .where(
+                ResumeAnalysis.id == analysis_id,
+                ResumeAnalysis.summary_pending.is_(claim),
+            )
+            .values(summary_pending=not claim)
+        )
+        db.commit()
+    except SQLAlchemyError as exc:
+        db.rollback()
+        logger.error("summary backfill claim failed analysis_id=%s error=%s", analysis_id, exc)
+        raise
+    return result.rowcount == 1
+
+
+def backfill_parsed_resumes(db: Session, batch_size: int = 500) -> int:
+    """
+    Run the local resume parser over analyses that have no parsed data yet
+    or were parsed by an older parser version.
+
+    Works in id order and commits after every batch so progress survives
+    interruption. Returns the number of rows parsed.
+    """
+    done = 0
+    last_id = 0
+    while True:
+        batch = db.execute(
+            select(ResumeAnalysis.id, ResumeAnalysis.resume_text, ResumeAnalysis.parsed)
+            .where(ResumeAnalysis.id > last_id)
+            .order_by(ResumeAnalysis.id)
+            .limit(batch_size)
+        ).all()
+        if not batch:
+            break
+
+        for analysis_id, resume_text, parsed in batch:
+            if parsed and parsed.get("version") == PARSER_VERSION:
+                continue
+            db.execute(
+                update(ResumeAnalysis)
+                .where(ResumeAnalysis.id == analysis_id)
+                .values(parsed=parse_resume(resume_text).to_dict())
+            )
+            done += 1
+        try:
+            db.commit()
+        except SQLAlchemyError as exc:
+            db.rollback()
+            logger.error("resume parse backfill batch failed error=%s", exc)
+            raise
+
+        last_id = batch[-1][0]
+        logger.info("resume parse backfill progress parsed=%s", done)
+
+    return done
+
+
+def _group_by_columns(rows: list[tuple[int, dict]]) -> list[list[tuple[int, dict]]]:
+    # executemany needs a uniform parameter set, and rows with an explicit id
+    # have one more key than rows relying on autoincrement.
+    groups: dict[frozenset, list[tuple[int, dict]]] = {}
+    for line_no, row in rows:
+        groups.setdefault(frozenset(row), []).append((line_no, row))
+    return list(groups.values())
+
+
+def _advance_id_sequences(db: Session) -> None:
+    """Move PostgreSQL id sequences past ids inserted explicitly (SQLite needs nothing)."""
+    if db.get_bind().dialect.name != "postgresql":
+        return
+    for table in (ResumeAnalysis.__tablename__, InterviewAnswer.__tablename__):
+        db.execute(
+            text(
+                f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), "
+                f"COALESCE((SELECT MAX(id) FROM {table}), 0) + 1, false)"
+            )
+        )
+    db.commit()
+
+
+def _describe_db_error(exc: SQLAlchemyError) -> str:
+    original = getattr(exc, "orig", None)
+    return str(original) if original is not None else exc.__class__.__name__
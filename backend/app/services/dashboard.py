@@ -0,0 +1,90 @@
+from typing import Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.models import InterviewAnswer, ResumeAnalysis, User
+from app.schemas.dashboard import DashboardRead
+from app.schemas.metrics import MetricsSummary
+from app.services.read_queries import analysis_read_columns, answer_read_columns
+
+DEFAULT_DASHBOARD_LIMIT = 10
+
+
+def _count(model, *criteria):
+    return select(func.count()).select_from(model).where(*criteria).scalar_subquery()
+
+
+def count_metric_columns(db: Session, totals: bool = True, user_id: Optional[int] = None) -> dict:
+    """
+    The global totals and/or the given user's counts, as a dict of
+    MetricsSummary fields, read in a single statement of scalar subqueries.
+    """
+    columns = []
+    if totals:
+        columns += [
+            _count(User).label("total_users"),
+            _count(ResumeAnalysis).label("total_resume_analyses"),
+            _count(InterviewAnswer).label("total_answers"),
+        ]
+    if user_id is not None:
+        columns += [
+            _count(ResumeAnalysis, ResumeAnalysis.user_id == user_id).label("user_resume_analyses"),
+            _count(InterviewAnswer, InterviewAnswer.user_id == user_id).label("user_answers"),
+        ]
+
+    return dict(db.execute(select(*columns)).one()._mapping)
+
+
+def count_metrics(db: Session, user_id: Optional[int] = None) -> MetricsSummary:
+    """Global totals, plus the given user's counts, in a single statement."""
+    return MetricsSummary(**count_metric_columns(db, user_id=user_id))
+
+
+def build_dashboard(
+    db: Session,
+    user_id: int,
+    resume_analysis_id: Optional[int] = None,
+    limit: int = DEFAULT_DASHBOARD_LIMIT,
+) -> DashboardRead:
+    """
+    Everything the frontend shows after an action: the user's metrics, their
+    most recent analyses and answers, and optionally the answers for one
+    analysis. Costs three statements, or four with resume_analysis_id.
+    """
+    recent_analyses = (
+        db.query(*analysis_read_columns())
+        .filter(ResumeAnalysis.user_id == user_id)
+        .order_by(ResumeAnalysis.created_at.desc(), ResumeAnalysis.id.desc())
+        .limit(limit)
+        .all()
+    )
+    recent_answers = (
+        db.query(*answer_read_columns())
+        .filter(InterviewAnswer.user_id == user_id)
+        .order_by(InterviewAnswer.created_at.desc(), InterviewAnswer.id.desc())
+        .limit(limit)
+        .all()
+    )
+
+    analysis_answers = []
+    if resume_analysis_id is not None:
+        analysis_answers = (
+            db.query(*answer_read_columns())
+            .filter(InterviewAnswer.resume_analysis_id == resume_analysis_id)
+            .order_by(InterviewAnswer.created_at.desc(), InterviewAnswer.id.desc())
+            .limit(limit)
+            .all()
+        )
+
+    return DashboardRead.model_validate(
+        {
+            "user_id": user_id,
+            "metrics": count_metrics(db, user_id),
+            "recent_analyses": recent_analyses,
+            "recent_answers": recent_answers,
+            "resume_analysis_id": resume_analysis_id,
+            "analysis_answers": analysis_answers,
+        },
+        from_attributes=True,
+    )
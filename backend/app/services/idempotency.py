@@ -0,0 +1,218 @@
+import asyncio
+import hashlib
+import json
+import logging
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Optional
+
+from fastapi import HTTPException, status
+from fastapi.responses import Response
+from sqlalchemy import delete, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.core.config import settings
+from app.core.runtime_metrics import runtime_metrics
+from app.models import IdempotencyKey
+from app.models.idempotency_key import ANONYMOUS_SCOPE
+
+logger = logging.getLogger("ai_job_assistant.idempotency")
+
+MAX_KEY_LENGTH = 255
+REPLAYED_HEADER = "Idempotent-Replayed"
+# How often a duplicate re-reads the key while another worker process runs
+# the first request. Duplicates in the same process are woken directly.
+_POLL_SECONDS = 0.25
+
+_keys = IdempotencyKey.__table__
+_inflight: dict[tuple, threading.Event] = {}
+_inflight_lock = threading.Lock()
+
+
+def request_fingerprint(*parts: Any) -> str:
+    """SHA-256 of the JSON-serializable request parts, e.g. body and options."""
+    encoded = json.dumps(parts, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(encoded.encode()).hexdigest()
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def _identity_filter(identity: tuple):
+    user_id, endpoint, key = identity
+    return (
+        _keys.c.user_id == user_id,
+        _keys.c.endpoint == endpoint,
+        _keys.c.key == key,
+    )
+
+
+def run_idempotent(
+    db: Session,
+    key: Optional[str],
+    endpoint: str,
+    user_id: Optional[int],
+    fingerprint: str,
+    handler: Callable[[], Response],
+) -> Response:
+    """
+    Run ``handler`` once per Idempotency-Key.
+
+    Keys are scoped by header user and endpoint. The first request claims the
+    key (committed before the handler runs, so other workers see it) and
+    stores a successful response for IDEMPOTENCY_TTL_SECONDS. Duplicates that
+    arrive while it runs wait up to IDEMPOTENCY_WAIT_SECONDS for it and then
+    get 409 with Retry-After; later duplicates get the stored response
+    replayed with an Idempotent-Replayed header, without running the
+    handler. A key reused with a different request is rejected with 422.
+    Failed requests release the key so the client can retry.
+    """
+    if key is None:
+        return handler()
+
+    identity = (user_id or ANONYMOUS_SCOPE, endpoint, key)
+    replay = _claim(db, identity, fingerprint)
+    if replay is not None:
+        runtime_metrics.incr("idempotency.replayed")
+        return replay
+
+    event = threading.Event()
+    with _inflight_lock:
+        _inflight[identity] = event
+    try:
+        try:
+            response = handler()
+        except BaseException:
+            _release(db, identity)
+            raise
+        if 200 <= response.status_code < 300:
+            _complete(db, identity, response)
+        else:
+            _release(db, identity)
+        return response
+    finally:
+        with _inflight_lock:
+            _inflight.pop(identity, None)
+        event.set()
+
+
+def _claim(db: Session, identity: tuple, fingerprint: str) -> Optional[Response]:
+    """None once the key is ours; the stored response when already completed."""
+    deadline = time.monotonic() + settings.idempotency_wait_seconds
+    while True:
+        now = _utcnow()
+        dialect = postgresql if db.get_bind().dialect.name == "postgresql" else sqlite
+        claimed = db.execute(
+            dialect.insert(_keys)
+            .values(
+                user_id=identity[0],
+                endpoint=identity[1],
+                key=identity[2],
+                request_hash=fingerprint,
+                expires_at=now + timedelta(seconds=settings.idempotency_lock_seconds),
+            )
+            .on_conflict_do_nothing()
+        ).rowcount
+        db.commit()
+        if claimed:
+            return None
+
+        row = db.execute(select(_keys).where(*_identity_filter(identity))).one_or_none()
+        if row is None:
+            continue
+        if row.expires_at <= now:
+            # A stored response past its TTL, or a lease left behind by a
+            # request that never finished.
+            db.execute(
+                delete(_keys).where(*_identity_filter(identity), _keys.c.expires_at <= now)
+            )
+            db.commit()
+            continue
+        if row.request_hash != fingerprint:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_CONTENT,
+                detail="Idempotency-Key was already used with a different request.",
+            )
+        if row.response_body is not None:
+            return Response(
+                content=row.response_body,
+                status_code=row.status_code,
+                media_type=row.media_type,
+                headers={REPLAYED_HEADER: "true"},
+            )
+
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="A request with this Idempotency-Key is still in progress.",
+                headers={"Retry-After": "1"},
+            )
+        runtime_metrics.incr("idempotency.waits")
+        with _inflight_lock:
+            event = _inflight.get(identity)
+        if event is not None:
+            event.wait(remaining)
+        else:
+            time.sleep(min(remaining, _POLL_SECONDS))
+
+
+def _complete(db: Session, identity: tuple, response: Response) -> None:
+    try:
+        db.execute(
+            update(_keys)
+            .where(*_identity_filter(identity))
+            .values(
+                status_code=response.status_code,
+                media_type=response.media_type,
+                response_body=bytes(response.body),
+                expires_at=_utcnow() + timedelta(seconds=settings.idempotency_ttl_seconds),
+            )
+        )
+        db.commit()
+    except SQLAlchemyError as exc:
+        # The work is done and the response still goes out; a retry will
+        # run again once the key is released.
+        db.rollback()
+        logger.error("failed to store idempotent response key=%s error=%s", identity, exc)
+        _release(db, identity)
+
+
+def _release(db: Session, identity: tuple) -> None:
+    try:
+        db.rollback()
+        db.execute(delete(_keys).where(*_identity_filter(identity)))
+        db.commit()
+    except SQLAlchemyError as exc:
+        # The lease expires after IDEMPOTENCY_LOCK_SECONDS anyway.
+        db.rollback()
+        logger.error("failed to release idempotency key=%s error=%s", identity, exc)
+
+
+def purge_expired_keys(db: Session) -> int:
+    """Delete expired keys and abandoned leases. Returns the number removed."""
+    removed = db.execute(delete(_keys).where(_keys.c.expires_at <= _utcnow())).rowcount
+    db.commit()
+    return removed
+
+
+async def sweep_expired_keys(session_factory: sessionmaker, interval_seconds: float) -> None:
+    """Run purge_expired_keys every interval_seconds until cancelled."""
+
+    def _sweep() -> int:
+        with session_factory() as db:
+            return purge_expired_keys(db)
+
+    while True:
+        await asyncio.sleep(interval_seconds)
+        try:
+            removed = await asyncio.to_thread(_sweep)
+        except SQLAlchemyError as exc:
+            logger.warning("idempotency key sweep failed error=%s", exc)
+            continue
+        if removed:
+            logger.info("expired idempotency keys removed=%s", removed)
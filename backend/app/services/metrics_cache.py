@@ -0,0 +1,246 @@
+import logging
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Hashable, Optional
+
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.runtime_metrics import runtime_metrics
+from app.schemas.metrics import MetricsSummary
+from app.services.dashboard import count_metric_columns
+
+logger = logging.getLogger("ai_job_assistant.metrics_cache")
+
+TOTALS_KEY = ("totals",)
+TOTAL_FIELDS = ("total_users", "total_resume_analyses", "total_answers")
+USER_FIELDS = ("user_resume_analyses", "user_answers")
+
+
+def user_key(user_id: int) -> tuple:
+    return ("user", user_id)
+
+
+@dataclass
+class _Entry:
+    value: Any = None
+    stored_at: float = 0.0
+    # Bumped by every invalidation; a load only stores its result when the
+    # generation is unchanged, so a slow load cannot bring back old counts.
+    generation: int = 0
+    refreshing: bool = False
+
+
+class StaleWhileRevalidateCache:
+    """
+    In-process cache that serves entries older than ttl_seconds for up to
+    stale_seconds more while a single background refresh per key reloads
+    them. Older entries, and invalidated ones, are treated as missing and
+    reloaded by the caller.
+
+    Entries are kept in least-recently-used order and at most max_entries
+    are held, like the rate limiter buckets.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float,
+        stale_seconds: float,
+        max_entries: int,
+        refresh_workers: int = 2,
+    ) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.stale_seconds = stale_seconds
+        self.max_entries = max_entries
+        self._entries: OrderedDict[Hashable, _Entry] = OrderedDict()
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(
+            max_workers=refresh_workers, thread_name_prefix="metrics-refresh"
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0
+
+    def lookup(self, key: Hashable, now: Optional[float] = None) -> tuple[Any, bool]:
+        """(value, stale) for a usable entry, or (None, False) when missing."""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry.value is None:
+                return None, False
+            age = now - entry.stored_at
+            if age >= self.ttl_seconds + self.stale_seconds:
+                return None, False
+            self._entries.move_to_end(key)
+            return entry.value, age >= self.ttl_seconds
+
+    def generation(self, key: Hashable) -> int:
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry.generation if entry is not None else 0
+
+    def store(
+        self,
+        key: Hashable,
+        value: Any,
+        generation: int,
+        now: Optional[float] = None,
+    ) -> bool:
+        """Store a loaded value unless the key was invalidated since generation was read."""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                if generation != 0:
+                    return False
+                entry = _Entry()
+                self._insert(key, entry)
+            elif entry.generation != generation:
+                return False
+            else:
+                self._entries.move_to_end(key)
+            entry.value = value
+            entry.stored_at = now
+            entry.refreshing = False
+            return True
+
+    def invalidate(self, *keys: Hashable) -> None:
+        with self._lock:
+            for key in keys:
+                entry = self._entries.get(key)
+                if entry is None:
+                    # Kept as a marker so a load already in flight is discarded.
+                    entry = _Entry()
+                    self._insert(key, entry)
+                entry.value = None
+                entry.generation += 1
+                entry.refreshing = False
+
+    def revalidate(
+        self,
+        key: Hashable,
+        bind: Engine,
+        load: Callable[[Session], Any],
+    ) -> Optional[Future]:
+        """
+        Reload a stale key in the background with its own session, unless a
+        refresh for it is already running. Returns the refresh future.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry.refreshing:
+                return None
+            entry.refreshing = True
+            generation = entry.generation
+        return self._pool.submit(self._refresh, key, bind, load, generation)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _refresh(
+        self,
+        key: Hashable,
+        bind: Engine,
+        load: Callable[[Session], Any],
+        generation: int,
+    ) -> None:
+        try:
+            with Session(bind=bind) as db:
+                value = load(db)
+        except Exception as exc:
+            runtime_metrics.incr("metrics_cache.refresh_errors")
+            logger.warning("metrics cache refresh failed key=%s error=%s", key, exc)
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None and entry.generation == generation:
+                    entry.refreshing = False
+            return
+        self.store(key, value, generation)
+
+    def _insert(self, key: Hashable, entry: _Entry) -> None:
+        while len(self._entries) >= self.max_entries:
+            self._entries.popitem(last=False)
+        self._entries[key] = entry
+
+
+metrics_cache = StaleWhileRevalidateCache(
+    settings.metrics_cache_ttl_seconds,
+    settings.metrics_cache_stale_seconds,
+    settings.metrics_cache_max_entries,
+)
+
+
+def _load_totals(db: Session) -> dict:
+    return count_metric_columns(db, totals=True)
+
+
+def _user_loader(user_id: int) -> Callable[[Session], dict]:
+    def load(db: Session) -> dict:
+        return count_metric_columns(db, totals=False, user_id=user_id)
+
+    return load
+
+
+def cached_metrics_summary(db: Session, user_id: Optional[int] = None) -> MetricsSummary:
+    """
+    count_metrics() served from the metrics cache: the global totals are one
+    entry and each user's counts another. Stale entries are returned as they
+    are and refreshed in the background; whatever is missing is counted
+    here, in one statement.
+    """
+    if not metrics_cache.enabled:
+        return MetricsSummary(**count_metric_columns(db, user_id=user_id))
+
+    parts = [(TOTALS_KEY, _load_totals)]
+    if user_id is not None:
+        parts.append((user_key(user_id), _user_loader(user_id)))
+
+    values: dict = {}
+    missing = []
+    for key, load in parts:
+        value, stale = metrics_cache.lookup(key)
+        if value is None:
+            missing.append(key)
+            continue
+        values.update(value)
+        if stale:
+            runtime_metrics.incr("metrics_cache.stale")
+            metrics_cache.revalidate(key, db.get_bind(), load)
+        else:
+            runtime_metrics.incr("metrics_cache.hits")
+
+    if missing:
+        runtime_metrics.incr("metrics_cache.misses", len(missing))
+        generations = {key: metrics_cache.generation(key) for key in missing}
+        load_user = user_id is not None and user_key(user_id) in generations
+        counted = count_metric_columns(
+            db,
+            totals=TOTALS_KEY in generations,
+            user_id=user_id if load_user else None,
+        )
+        for key, generation in generations.items():
+            fields = TOTAL_FIELDS if key == TOTALS_KEY else USER_FIELDS
+            metrics_cache.store(key, {name: counted[name] for name in fields}, generation)
+        values.update(counted)
+
+    return MetricsSummary(**values)
+
+
+def invalidate_metrics(*user_ids: Optional[int]) -> None:
+    """
+    Drop the cached global totals and the given users' counts after a write
+    that changes them. Call after the commit. Other worker processes keep
+    their entries until the TTL runs out.
+    """
+    metrics_cache.invalidate(
+        TOTALS_KEY, *(user_key(user_id) for user_id in user_ids if user_id is not None)
+    )
@@ -0,0 +1,151 @@
+import logging
+from dataclasses import dataclass
+from typing import Iterable, Optional
+
+from sqlalchemy import delete, insert, select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.runtime_metrics import runtime_metrics
+from app.models import ResumeAnalysis, ResumeFingerprint
+from app.services.simhash import (
+    band_keys,
+    from_signed,
+    hamming_distance,
+    shingle_similarity,
+    simhash,
+    to_signed,
+)
+
+logger = logging.getLogger("ai_job_assistant.near_duplicates")
+
+REBUILD_BATCH_SIZE = 1000
+MAX_CANDIDATES = 5
+
+
+@dataclass
+class NearDuplicate:
+    analysis_id: int
+    summary: str
+    similarity: float
+
+
+def index_fingerprints(
+    db: Session,
+    entries: Iterable[tuple[int, Optional[int], int]],
+) -> None:
+    """
+    Add band rows for (analysis id, user id, fingerprint) entries in one
+    statement. Analyses without a user are skipped: reuse is only ever
+    between one user's own resumes. Runs in the caller's transaction and
+    does not commit.
+    """
+    rows = [
+        {
+            "user_id": user_id,
+            "band": band,
+            "resume_analysis_id": analysis_id,
+            "simhash": to_signed(fingerprint),
+        }
+        for analysis_id, user_id, fingerprint in entries
+        if user_id is not None
+        for band in band_keys(fingerprint)
+    ]
+    if rows:
+        db.execute(insert(ResumeFingerprint), rows)
+
+
+def find_near_duplicate(
+    db: Session, user_id: int, resume_text: str, fingerprint: int
+) -> Optional[NearDuplicate]:
+    """
+    The user's most similar earlier analysis with a summary, if its text is
+    a near duplicate of ``resume_text``.
+
+    Candidates share at least one fingerprint band, which finds every
+    fingerprint within NEAR_DUPLICATE_MAX_DISTANCE bits as long as that is
+    below the band count. The closest few by Hamming distance (newest
+    first on ties) are then confirmed against the stored text with the
+    exact shingle similarity, so a SimHash collision never reuses the
+    summary of a different resume.
+    """
+    runtime_metrics.incr("near_duplicate.checked")
+    candidates = db.execute(
+        select(ResumeFingerprint.resume_analysis_id, ResumeFingerprint.simhash)
+        .where(
+            ResumeFingerprint.user_id == user_id,
+            ResumeFingerprint.band.in_(band_keys(fingerprint)),
+        )
+        .distinct()
+    ).all()
+    # Closest first, newest first among equally close fingerprints.
+    ranked = sorted(
+        (hamming_distance(fingerprint, from_signed(row.simhash)), -row.resume_analysis_id)
+        for row in candidates
+    )
+    close = [
+        -negated_id
+        for distance, negated_id in ranked
+        if distance <= settings.near_duplicate_max_distance
+    ][:MAX_CANDIDATES]
+    if not close:
+        return None
+
+    rows = db.execute(
+        select(ResumeAnalysis.id, ResumeAnalysis.resume_text, ResumeAnalysis.summary).where(
+            ResumeAnalysis.id.in_(close),
+            ResumeAnalysis.summary_pending.is_(False),
+        )
+    ).all()
+    by_id = {row.id: row for row in rows}
+    for analysis_id in close:
+        row = by_id.get(analysis_id)
+        if row is None:
+            continue
+        similarity = shingle_similarity(resume_text, row.resume_text)
+        if similarity >= settings.near_duplicate_min_similarity:
+            runtime_metrics.incr("near_duplicate.reused")
+            return NearDuplicate(row.id, row.summary, round(similarity, 4))
+    return None
+
+
+def rebuild_fingerprints(db: Session, batch_size: int = REBUILD_BATCH_SIZE) -> int:
+    """
+    Rebuild the fingerprint index from stored analyses.
+
+    Works through analyses with a user in id order, replacing each batch's
+    band rows and committing per batch. Returns the number of analyses
+    fingerprinted.
+    """
+    done = 0
+    last_id = 0
+    while True:
+        batch = db.execute(
+            select(ResumeAnalysis.id, ResumeAnalysis.user_id, ResumeAnalysis.resume_text)
+            .where(ResumeAnalysis.id > last_id, ResumeAnalysis.user_id.is_not(None))
+            .order_by(ResumeAnalysis.id)
+            .limit(batch_size)
+        ).all()
+        if not batch:
+            break
+
+        ids = [row.id for row in batch]
+        try:
+            db.execute(
+                delete(ResumeFingerprint).where(ResumeFingerprint.resume_analysis_id.in_(ids))
+            )
+            index_fingerprints(
+                db, [(row.id, row.user_id, simhash(row.resume_text)) for row in batch]
+            )
+            db.commit()
+        except SQLAlchemyError as exc:
+            db.rollback()
+            logger.error("fingerprint rebuild batch failed error=%s", exc)
+            raise
+
+        done += len(batch)
+        last_id = ids[-1]
+        logger.info("fingerprint rebuild progress indexed=%s", done)
+
+    return done
@@ -0,0 +1,98 @@
+import logging
+from dataclasses import dataclass
+from typing import Iterable
+
+from sqlalchemy import delete, select
+from sqlalchemy.orm import Session
+
+from app.models import (
+    ActivityRollup,
+    InterviewAnswer,
+    ResumeAnalysis,
+    ResumeFingerprint,
+    ResumeSkill,
+)
+
+logger = logging.getLogger("ai_job_assistant.purge")
+
+# Rows removed per transaction. Each batch commits on its own so the write
+# lock is released between batches and other requests can interleave.
+PURGE_BATCH_SIZE = 500
+
+
+@dataclass
+class PurgeResult:
+    resume_analyses_deleted: int = 0
+    answers_deleted: int = 0
+
+
+def delete_analyses(db: Session, ids: Iterable[int]) -> int:
+    """
+    Delete the given analyses with their answers and index rows, and return
+    the number of answers removed. Runs in the caller's transaction.
+
+    The dependent rows are deleted explicitly instead of being left to ON
+    DELETE CASCADE: create_all() does not change existing tables, so
+    databases created before the cascading keys still have
+    interview_answers.resume_analysis_id without one.
+    """
+    ids = list(ids)
+    answers = db.execute(
+        delete(InterviewAnswer).where(InterviewAnswer.resume_analysis_id.in_(ids))
+    ).rowcount
+    db.execute(delete(ResumeSkill).where(ResumeSkill.resume_analysis_id.in_(ids)))
+    db.execute(delete(ResumeFingerprint).where(ResumeFingerprint.resume_analysis_id.in_(ids)))
+    db.execute(delete(ResumeAnalysis).where(ResumeAnalysis.id.in_(ids)))
+    return answers
+
+
+def purge_user_data(
+    db: Session,
+    user_id: int,
+    batch_size: int = PURGE_BATCH_SIZE,
+) -> PurgeResult:
+    """
+    Delete every resume analysis and interview answer owned by a user.
+
+    The user's own answers go first, then their analyses. Answers by other
+    (or anonymous) users that point at one of those analyses are removed
+    with them by delete_analyses() and counted in the result.
+    """
+    result = PurgeResult()
+
+    while True:
+        ids = db.scalars(
+            select(InterviewAnswer.id)
+            .where(InterviewAnswer.user_id == user_id)
+            .limit(batch_size)
+        ).all()
+        if not ids:
+            break
+        db.execute(delete(InterviewAnswer).where(InterviewAnswer.id.in_(ids)))
+        db.commit()
+        result.answers_deleted += len(ids)
+
+    while True:
+        ids = db.scalars(
+            select(ResumeAnalysis.id)
+            .where(ResumeAnalysis.user_id == user_id)
+            .limit(batch_size)
+        ).all()
+        if not ids:
+            break
+        answers = delete_analyses(db, ids)
+        db.commit()
+        result.resume_analyses_deleted += len(ids)
+        result.answers_deleted += answers
+
+    # The user's own activity rollups go too; global totals are kept.
+    db.execute(delete(ActivityRollup).where(ActivityRollup.user_id == user_id))
+    db.commit()
+
+    logger.info(
+        "purged user data user_id=%s resume_analyses=%s answers=%s",
+        user_id,
+        result.resume_analyses_deleted,
+        result.answers_deleted,
+    )
+    return result
@@ -0,0 +1,55 @@
+from sqlalchemy import func, literal, select
+
+from app.core.config import settings
+from app.models import InterviewAnswer, ResumeAnalysis
+
+
+def analysis_read_columns() -> tuple:
+    """
+    Columns selected for ResumeAnalysisRead responses. Reading plain rows
+    instead of ORM entities lets the response be validated and serialized
+    straight from the row tuples. For stored rows, provider reflects the
+    currently configured provider.
+    """
+    return (
+        ResumeAnalysis.id,
+        ResumeAnalysis.user_id,
+        ResumeAnalysis.resume_text,
+        ResumeAnalysis.summary,
+        ResumeAnalysis.created_at,
+        literal(settings.llm_provider).label("provider"),
+        ResumeAnalysis.parsed,
+    )
+
+
+def answer_stats_subquery(analysis_ids):
+    """
+    answer_count and last_answer_at per analysis, grouped in one subquery
+    over the answers of the given analysis ids (a select of ids, e.g. one
+    page), to be outer-joined on resume_analysis_id.
+    """
+    return (
+        select(
+            InterviewAnswer.resume_analysis_id,
+            func.count().label("answer_count"),
+            func.max(InterviewAnswer.created_at).label("last_answer_at"),
+        )
+        .where(InterviewAnswer.resume_analysis_id.in_(analysis_ids))
+        .group_by(InterviewAnswer.resume_analysis_id)
+        .subquery()
+    )
+
+
+def answer_read_columns() -> tuple:
+    """Columns selected for InterviewAnswerRead responses (see above)."""
+    return (
+        InterviewAnswer.id,
+        InterviewAnswer.user_id,
+        InterviewAnswer.resume_analysis_id,
+        InterviewAnswer.question,
+        InterviewAnswer.job_title,
+        InterviewAnswer.company_name,
+        InterviewAnswer.answer,
+        InterviewAnswer.created_at,
+        literal(settings.llm_provider).label("provider"),
+    )
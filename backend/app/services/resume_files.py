@@ -0,0 +1,170 @@
+"""
+Text extraction for uploaded resume files (.txt, .md and .docx).
+
+Extraction and normalization are CPU-bound, unzipping and parsing a
+.docx's XML in particular, so they run in a process pool: a large upload
+keeps another core busy instead of the event loop or, through the GIL,
+the request threads. The pool is created on first use with the spawn
+start method, so workers do not inherit the server's threads, database
+connections or provider clients.
+
+extract_resume_text() runs in the workers. It takes and returns only bytes
+and strings, and uses the standard library only.
+"""
+import asyncio
+import codecs
+import io
+import logging
+import os
+import re
+import threading
+import unicodedata
+import zipfile
+import zlib
+from concurrent.futures import BrokenExecutor, Executor
+from typing import Optional
+from xml.etree import ElementTree
+
+from app.core.config import settings
+
+logger = logging.getLogger("ai_job_assistant.resume_files")
+
+SUPPORTED_SUFFIXES = (".txt", ".md", ".docx")
+# document.xml is checked against this uncompressed size before it is read,
+# so a small zip cannot expand into gigabytes of XML.
+MAX_DOCUMENT_XML_BYTES = 50 * 1024 * 1024
+
+_W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+_MD_HEADING_RE = re.compile(r"^ {0,3}#{1,6}[ \t]+", re.MULTILINE)
+_MD_LINK_RE = re.compile(r"!?\[([^\]]*)\]\([^)]*\)")
+# Single underscores are left alone so snake_case names survive.
+_MD_EMPHASIS_RE = re.compile(r"(\*\*|__|\*|`)(?=\S)(.+?)(?<=\S)\1")
+_INVISIBLE_RE = re.compile("[\x00-\x08\x0b-\x1f\x7f\u200b-\u200d\u2060\ufeff]")
+_BLANK_LINES_RE = re.compile(r"\n{3,}")
+
+
+class ResumeFileError(ValueError):
+    """An uploaded file whose text cannot be extracted."""
+
+
+def file_suffix(filename: Optional[str]) -> Optional[str]:
+    """The lowercased suffix of a supported file name, otherwise None."""
+    suffix = os.path.splitext(filename or "")[1].lower()
+    return suffix if suffix in SUPPORTED_SUFFIXES else None
+
+
+def _decode(data: bytes) -> str:
+    if data.startswith((codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)):
+        return data.decode("utf-16", errors="replace")
+    try:
+        return data.decode("utf-8-sig")
+    except UnicodeDecodeError:
+        return data.decode("cp1252", errors="replace")
+
+
+def _strip_markdown(text: str) -> str:
+    text = _MD_HEADING_RE.sub("", text)
+    text = _MD_LINK_RE.sub(r"\1", text)
+    return _MD_EMPHASIS_RE.sub(r"\2", text)
+
+
+def _docx_text(data: bytes) -> str:
+    try:
+        archive = zipfile.ZipFile(io.BytesIO(data))
+        document = archive.getinfo("word/document.xml")
+    except (zipfile.BadZipFile, KeyError) as exc:
+        raise ResumeFileError("The file is not a valid .docx document.") from exc
+    if document.file_size > MAX_DOCUMENT_XML_BYTES:
+        raise ResumeFileError("The .docx document is too large.")
+
+    paragraphs: list[str] = []
+    runs: list[str] = []
+    try:
+        with archive.open(document) as xml:
+            for _, element in ElementTree.iterparse(xml):
+                tag = element.tag
+                if tag == _W + "t":
+                    runs.append(element.text or "")
+                elif tag == _W + "tab":
+                    runs.append("\t")
+                elif tag in (_W + "br", _W + "cr"):
+                    runs.append("\n")
+                elif tag == _W + "p":
+                    # Table cells hold paragraphs too, so each cell is a line.
+                    paragraphs.append("".join(runs))
+                    runs = []
+                    element.clear()
+    except (ElementTree.ParseError, zipfile.BadZipFile, zlib.error, EOFError) as exc:
+        raise ResumeFileError("The file is not a valid .docx document.") from exc
+    return "\n".join(paragraphs)
+
+
+def normalize_resume_text(text: str) -> str:
+    """
+    NFKC-normalize the text (ligatures, full-width and non-breaking
+    characters), use \\n line endings, drop control and zero-width
+    characters and trailing spaces, and collapse runs of blank lines.
+    """
+    text = unicodedata.normalize("NFKC", text)
+    text = text.replace("\r\n", "\n").replace("\r", "\n")
+    text = _INVISIBLE_RE.sub("", text)
+    text = "\n".join(line.rstrip() for line in text.split("\n"))
+    return _BLANK_LINES_RE.sub("\n\n", text).strip()
+
+
+def extract_resume_text(data: bytes, suffix: str) -> str:
+    """The normalized text of a file with one of SUPPORTED_SUFFIXES."""
+    if suffix == ".docx":
+        text = _docx_text(data)
+    else:
+        text = _decode(data)
+        if suffix == ".md":
+            text = _strip_markdown(text)
+    return normalize_resume_text(text)
+
+
+_pool: Optional[Executor] = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool() -> Executor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # Imported here: multiprocessing is not needed until the first upload.
+            import multiprocessing
+            from concurrent.futures import ProcessPoolExecutor
+
+            _pool = ProcessPoolExecutor(
+                max_workers=settings.upload_extract_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _pool
+
+
+def shutdown_pool() -> None:
+    """Stop the workers, cancelling queued extractions. Called at shutdown."""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=True, cancel_futures=True)
+            _pool = None
+
+
+async def extract_in_pool(data: bytes, suffix: str) -> str:
+    """Run extract_resume_text() in the process pool without blocking the event loop."""
+    global _pool
+    pool = _get_pool()
+    try:
+        return await asyncio.get_running_loop().run_in_executor(
+            pool, extract_resume_text, data, suffix
+        )
+    except BrokenExecutor as exc:
+        # A worker died, most likely on this file. The pool cannot be used
+        # again, so the next upload starts a new one.
+        logger.error("resume extraction worker died suffix=%s bytes=%s", suffix, len(data))
+        with _pool_lock:
+            if _pool is pool:
+                _pool = None
+        pool.shutdown(wait=False)
+        raise ResumeFileError("Could not read the uploaded file.") from exc
@@ -0,0 +1,504 @@
+"""
+Deterministic resume parsing.
+
+Extracts sections, skills, years of experience, job titles and degree levels
+from plain resume text without calling the LLM provider. Everything is
+compiled once at import: the regexes, and a token-level Aho-Corasick
+automaton over the skill dictionary, so a resume is tokenized and matched
+in a single pass. Contact details (emails, phone numbers, URLs, names) are
+never extracted.
+"""
+import re
+from collections import deque
+from dataclasses import asdict, dataclass, field
+from datetime import date
+from typing import Iterable, Optional
+
+PARSER_VERSION = 2
+
+# Canonical section name for each recognised heading.
+_SECTION_ALIASES = {
+    "summary": "summary",
+    "profile": "summary",
+    "objective": "summary",
+    "experience": "experience",
+    "work experience": "experience",
+    "professional experience": "experience",
+    "employment": "experience",
+    "employment history": "experience",
+    "education": "education",
+    "skills": "skills",
+    "technical skills": "skills",
+    "projects": "projects",
+    "publications": "publications",
+    "research": "research",
+    "teaching": "teaching",
+    "certifications": "certifications",
+    "awards": "awards",
+    "honors": "awards",
+    "volunteering": "volunteering",
+    "languages": "languages",
+    "interests": "interests",
+    "references": "references",
+}
+
+KNOWN_HEADING_RE = re.compile(
+    r"^\s*#*\s*("
+    + "|".join(sorted(map(re.escape, _SECTION_ALIASES), key=len, reverse=True))
+    + r")\s*:?\s*$",
+    re.IGNORECASE,
+)
+UPPERCASE_HEADING_RE = re.compile(r"^\s*[A-Z][A-Z0-9 &/,-]{2,40}:?\s*$")
+
+# Tokens keep internal dots and +/# (node.js, c++, c#, .net); everything
+# else, including "/" and "-", separates tokens.
+_TOKEN_RE = re.compile(r"\.?[A-Za-z0-9+#]+(?:\.[A-Za-z0-9+#]+)*")
+
+# Candidate "N years" mentions; only counted when "experience" follows
+# shortly after (checked in code, which is much cheaper than a lazy regex).
+_STATED_YEARS_RE = re.compile(r"(\d{1,2}(?:\.\d)?)\s*\+?\s*(?:years?|yrs?)\b", re.IGNORECASE)
+_STATED_YEARS_WINDOW = 40
+_DATE_RANGE_RE = re.compile(
+    r"\b((?:19|20)\d{2})\s*(?:-|–|—|to)\s*((?:19|20)\d{2}|present|current|now|today)\b",
+    re.IGNORECASE,
+)
+# Header lines carrying contact details; dropped from LLM prompts.
+_CONTACT_RE = re.compile(
+    r"[\w.+-]+@[\w-]+\.[\w.]+|https?://|www\.|\b(?:linkedin|github)\.com\b|\+?\d[\d ().-]{7,}\d"
+)
+# Date ranges in these sections are study or hobby periods, not experience.
+_NON_EXPERIENCE_SECTIONS = {"education", "interests", "volunteering", "references"}
+_BULLET_CHARS = " \t-*•·–"
+# Category labels ("Languages:") and connectives that may sit next to skills
+# on a skills line without needing to be carried into the prompt.
+_SKILL_LABEL_RE = re.compile(r"^[^:]{1,40}:")
+_SKILL_FILLER_TOKENS = {"and", "or", "etc"}
+# Longest line that can still be a heading; longer lines skip the regexes.
+_MAX_HEADING_CHARS = 48
+
+# Job titles are an area followed by a role ("Backend Engineer"), optionally
+# preceded by a seniority word.
+_TITLE_AREAS: dict[str, tuple[str, ...]] = {
+    "Software": ("software",),
+    "Backend": ("backend", "back end"),
+    "Frontend": ("frontend", "front end"),
+    "Full Stack": ("fullstack", "full stack"),
+    "Data": ("data",),
+    "Machine Learning": ("machine learning",),
+    "ML": ("ml",),
+    "AI": ("ai",),
+    "DevOps": ("devops",),
+    "Platform": ("platform",),
+    "Site Reliability": ("site reliability",),
+    "Cloud": ("cloud",),
+    "Mobile": ("mobile",),
+    "Web": ("web",),
+    "QA": ("qa",),
+    "Test": ("test",),
+    "Security": ("security",),
+    "Systems": ("systems",),
+    "Database": ("database",),
+    "Infrastructure": ("infrastructure",),
+    "Product": ("product",),
+    "Solutions": ("solutions",),
+}
+_TITLE_ROLES = (
+    "engineer",
+    "developer",
+    "scientist",
+    "analyst",
+    "architect",
+    "manager",
+    "consultant",
+    "administrator",
+    "designer",
+)
+_TITLE_PREFIXES = {
+    "senior": "Senior",
+    "sr": "Senior",
+    "junior": "Junior",
+    "jr": "Junior",
+    "lead": "Lead",
+    "staff": "Staff",
+    "principal": "Principal",
+}
+
+# Degree level -> token aliases, highest level first.
+DEGREES: dict[str, tuple[str, ...]] = {
+    "phd": ("phd", "ph.d", "doctorate", "doctor of philosophy"),
+    "master": ("master's", "masters", "master of", "master degree", "msc", "m.sc", "mba", "m.eng", "m.s"),
+    "bachelor": ("bachelor", "bachelors", "bsc", "b.sc", "b.eng", "b.s", "b.a"),
+    "associate": ("associate degree", "associate's degree", "associates degree"),
+}
+
+# Canonical skill -> aliases. Aliases are matched on lower-cased tokens,
+# except those listed in _CASE_SENSITIVE_ALIASES, which are ordinary words
+# in lower case ("go", "rest", "excel", "spring") and only count as skills
+# written exactly as listed.
+SKILLS: dict[str, tuple[str, ...]] = {
+    "Python": ("python",),
+    "Java": ("java",),
+    "JavaScript": ("javascript", "js", "ecmascript"),
+    "TypeScript": ("typescript", "ts"),
+    "Go": ("golang", "Go"),
+    "Rust": ("rust",),
+    "C": ("C",),
+    "C++": ("c++", "cpp"),
+    "C#": ("c#", "csharp"),
+    ".NET": (".net", "dotnet", "asp.net"),
+    "Ruby": ("ruby",),
+    "Ruby on Rails": ("rails", "ruby on rails"),
+    "PHP": ("php",),
+    "Kotlin": ("kotlin",),
+    "Swift": ("Swift",),
+    "Scala": ("scala",),
+    "R": ("R",),
+    "SQL": ("sql",),
+    "Bash": ("bash", "shell scripting"),
+    "HTML": ("html", "html5"),
+    "CSS": ("css", "css3", "sass", "scss"),
+    "React": ("react", "react.js", "reactjs"),
+    "Angular": ("angular", "angularjs"),
+    "Vue": ("vue", "vue.js", "vuejs"),
+    "Node.js": ("node.js", "nodejs", "Node"),
+    "Django": ("django",),
+    "Flask": ("flask",),
+    "FastAPI": ("fastapi",),
+    "Spring": ("Spring", "spring boot"),
+    "GraphQL": ("graphql",),
+    "REST APIs": ("REST", "restful", "rest api", "rest apis"),
+    "gRPC": ("grpc",),
+    "PostgreSQL": ("postgresql", "postgres"),
+    "MySQL": ("mysql",),
+    "SQLite": ("sqlite",),
+    "MongoDB": ("mongodb", "mongo"),
+    "Redis": ("redis",),
+    "Elasticsearch": ("elasticsearch", "elastic search", "opensearch"),
+    "Cassandra": ("cassandra",),
+    "DynamoDB": ("dynamodb",),
+    "Kafka": ("kafka",),
+    "RabbitMQ": ("rabbitmq",),
+    "Spark": ("spark", "pyspark", "apache spark"),
+    "Hadoop": ("hadoop",),
+    "Airflow": ("airflow",),
+    "dbt": ("dbt",),
+    "Snowflake": ("snowflake",),
+    "Pandas": ("pandas",),
+    "NumPy": ("numpy",),
+    "scikit-learn": ("scikit learn", "sklearn"),
+    "TensorFlow": ("tensorflow",),
+    "PyTorch": ("pytorch", "Torch"),
+    "Machine Learning": ("machine learning", "ml"),
+    "Deep Learning": ("deep learning",),
+    "NLP": ("nlp", "natural language processing"),
+    "LLMs": ("llm", "llms", "large language models"),
+    "Computer Vision": ("computer vision",),
+    "AWS": ("aws", "amazon web services"),
+    "GCP": ("gcp", "google cloud", "google cloud platform"),
+    "Azure": ("azure",),
+    "Docker": ("docker",),
+    "Kubernetes": ("kubernetes", "k8s"),
+    "Terraform": ("terraform",),
+    "Ansible": ("ansible",),
+    "Helm": ("helm",),
+    "Linux": ("linux",),
+    "Git": ("git",),
+    "CI/CD": ("ci cd", "CI", "continuous integration", "github actions", "gitlab ci", "jenkins"),
+    "Prometheus": ("prometheus",),
+    "Grafana": ("grafana",),
+    "Microservices": ("microservices", "microservice"),
+    "Agile": ("agile", "scrum", "kanban"),
+    "Figma": ("figma",),
+    "Tableau": ("tableau",),
+    "Power BI": ("power bi", "powerbi"),
+    "Excel": ("Excel",),
+    "Celery": ("celery",),
+    "SQLAlchemy": ("sqlalchemy",),
+    "Pydantic": ("pydantic",),
+    "Nginx": ("nginx",),
+    "Unity": ("Unity",),
+}
+
+_CASE_SENSITIVE_ALIASES = {
+    "Go", "C", "R", "REST", "Excel", "Spring", "Swift", "Unity", "CI", "Node", "Torch",
+}
+
+
+class TokenAhoCorasick:
+    """
+    Aho-Corasick automaton over token sequences.
+
+    Patterns are tuples of tokens; matching walks the token stream once and
+    reports every pattern that ends at each position, so the cost is linear
+    in the number of tokens no matter how many patterns there are.
+    """
+
+    def __init__(self, patterns: Iterable[tuple[tuple[str, ...], object]]) -> None:
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._out: list[list[tuple[int, object]]] = [[]]
+
+        for tokens, value in patterns:
+            node = 0
+            for token in tokens:
+                nxt = self._goto[node].get(token)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[node][token] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append([])
+                node = nxt
+            self._out[node].append((len(tokens), value))
+
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for token, child in self._goto[node].items():
+                queue.append(child)
+                fallback = self._fail[node]
+                while fallback and token not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(token, 0)
+                self._fail[child] = target if target != child else 0
+                self._out[child] = self._out[child] + self._out[self._fail[child]]
+
+    def iter_matches(self, tokens: list[str]):
+        """Yield (end_index, pattern_length, value) for every match."""
+        goto, fail, out = self._goto, self._fail, self._out
+        node = 0
+        for index, token in enumerate(tokens):
+            while node and token not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(token, 0)
+            if out[node]:
+                for length, value in out[node]:
+                    yield index, length, value
+
+
+def tokenize(text: str) -> list[str]:
+    return _TOKEN_RE.findall(text)
+
+
+def _alias_tokens(alias: str) -> tuple[str, ...]:
+    return tuple(token.lower() for token in tokenize(alias))
+
+
+def _build_matcher() -> TokenAhoCorasick:
+    """One automaton for skills, degrees and titles, so a resume is scanned once."""
+    patterns = []
+    for skill, aliases in SKILLS.items():
+        for alias in aliases:
+            # Case-sensitive aliases also carry the exact tokens to compare.
+            raw = tuple(tokenize(alias)) if alias in _CASE_SENSITIVE_ALIASES else None
+            patterns.append((_alias_tokens(alias), ("skill", skill, raw)))
+    for level, aliases in DEGREES.items():
+        for alias in aliases:
+            patterns.append((_alias_tokens(alias), ("degree", level, None)))
+    for area, aliases in _TITLE_AREAS.items():
+        for alias in aliases:
+            for role in _TITLE_ROLES:
+                title = f"{area} {role.capitalize()}"
+                for form in (role, role + "s"):
+                    patterns.append((_alias_tokens(f"{alias} {form}"), ("title", title, None)))
+    return TokenAhoCorasick(patterns)
+
+
+_MATCHER = _build_matcher()
+
+
+_SKILL_LOOKUP = {
+    name.lower(): skill
+    for skill, aliases in SKILLS.items()
+    for name in (skill, *aliases)
+}
+
+
+def canonical_skill(term: str) -> Optional[str]:
+    """Canonical skill name for a search term or alias ("k8s" -> "Kubernetes")."""
+    return _SKILL_LOOKUP.get(" ".join(term.split()).lower())
+
+
+@dataclass
+class ParsedResume:
+    sections: list[dict] = field(default_factory=list)
+    skills: list[str] = field(default_factory=list)
+    years_experience: Optional[float] = None
+    titles: list[str] = field(default_factory=list)
+    degrees: list[str] = field(default_factory=list)
+    word_count: int = 0
+    line_count: int = 0
+    version: int = PARSER_VERSION
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+    def prompt_facts(self) -> str:
+        """Compact fact lines to put in front of an LLM prompt."""
+        # Titles and degrees are left to the resume text itself; the skills
+        # list replaces the skills lines that compact_resume_text drops.
+        facts = []
+        if self.years_experience is not None:
+            facts.append(f"Years of experience: about {self.years_experience:g}")
+        if self.skills:
+            facts.append(f"Skills: {', '.join(self.skills)}")
+        return "\n".join(facts)
+
+
+def is_section_heading(line: str) -> bool:
+    if len(line) > _MAX_HEADING_CHARS and len(line.strip()) > _MAX_HEADING_CHARS:
+        return False
+    return bool(KNOWN_HEADING_RE.match(line) or UPPERCASE_HEADING_RE.match(line))
+
+
+def section_name(heading: str) -> str:
+    known = KNOWN_HEADING_RE.match(heading)
+    if known:
+        return _SECTION_ALIASES[known.group(1).lower()]
+    return heading.strip().rstrip(":").strip().lower()
+
+
+def split_sections(resume_text: str) -> list[tuple[str, list[str]]]:
+    """
+    Split a resume into (section name, lines) pairs. Text before the first
+    heading is returned as the "header" section.
+    """
+    sections: list[tuple[str, list[str]]] = [("header", [])]
+    for line in resume_text.splitlines():
+        if is_section_heading(line):
+            sections.append((section_name(line), []))
+        else:
+            sections[-1][1].append(line)
+    return [
+        (name, lines)
+        for index, (name, lines) in enumerate(sections)
+        if index > 0 or any(line.strip() for line in lines)
+    ]
+
+
+def match_terms(tokens: list[str], title_limit: int = 10) -> tuple[list[str], list[str], list[str]]:
+    """
+    Skills, degree levels and job titles found in the token stream, each in
+    order of first appearance (degrees from highest level down).
+    """
+    lowered = [token.lower() for token in tokens]
+    skills: dict[str, None] = {}
+    degrees: set[str] = set()
+    titles: dict[str, None] = {}
+    for end, length, (kind, value, raw) in _MATCHER.iter_matches(lowered):
+        start = end - length + 1
+        if kind == "skill":
+            if raw is None or tuple(tokens[start : end + 1]) == raw:
+                skills.setdefault(value)
+        elif kind == "degree":
+            degrees.add(value)
+        elif len(titles) < title_limit:
+            prefix = _TITLE_PREFIXES.get(lowered[start - 1]) if start else None
+            titles.setdefault(f"{prefix} {value}" if prefix else value)
+    return (
+        list(skills),
+        [level for level in DEGREES if level in degrees],
+        list(titles),
+    )
+
+
+def extract_years_experience(
+    resume_text: str,
+    sections: Optional[list[tuple[str, list[str]]]] = None,
+    today: Optional[date] = None,
+) -> Optional[float]:
+    """
+    Years of experience: the largest explicitly stated figure ("7+ years of
+    experience") or the total covered by date ranges ("2016 - Present"),
+    whichever is larger. Date ranges under education and similar headings
+    are ignored.
+    """
+    stated = [
+        float(match.group(1))
+        for match in _STATED_YEARS_RE.finditer(resume_text)
+        if "experience"
+        in resume_text[match.end() : match.end() + _STATED_YEARS_WINDOW].lower()
+    ]
+
+    if sections is None:
+        sections = split_sections(resume_text)
+    dated_text = "\n".join(
+        "\n".join(lines) for name, lines in sections if name not in _NON_EXPERIENCE_SECTIONS
+    )
+
+    current_year = (today or date.today()).year
+    ranges = []
+    for match in _DATE_RANGE_RE.finditer(dated_text):
+        start = int(match.group(1))
+        end_text = match.group(2)
+        end = int(end_text) if end_text.isdigit() else current_year
+        if start <= end <= current_year:
+            ranges.append((start, end))
+
+    covered = 0
+    if ranges:
+        ranges.sort()
+        cur_start, cur_end = ranges[0]
+        for start, end in ranges[1:]:
+            if start <= cur_end:
+                cur_end = max(cur_end, end)
+            else:
+                covered += cur_end - cur_start
+                cur_start, cur_end = start, end
+        covered += cur_end - cur_start
+
+    best = max(stated + [float(covered)])
+    return best or None
+
+
+def parse_resume(resume_text: str) -> ParsedResume:
+    sections = split_sections(resume_text)
+    skills, degrees, titles = match_terms(tokenize(resume_text))
+    return ParsedResume(
+        sections=[
+            {"name": name, "lines": sum(1 for line in lines if line.strip())}
+            for name, lines in sections
+        ],
+        skills=skills,
+        years_experience=extract_years_experience(resume_text, sections),
+        titles=titles,
+        degrees=degrees,
+        word_count=len(resume_text.split()),
+        line_count=sum(1 for line in resume_text.splitlines() if line.strip()),
+    )
+
+
+def _only_known_skills(line: str) -> bool:
+    """Whether every token on a skills line, past its label, is a dictionary skill."""
+    tokens = tokenize(_SKILL_LABEL_RE.sub("", line, count=1))
+    lowered = [token.lower() for token in tokens]
+    covered = [token in _SKILL_FILLER_TOKENS for token in lowered]
+    for end, length, (kind, _, raw) in _MATCHER.iter_matches(lowered):
+        start = end - length + 1
+        if kind == "skill" and (raw is None or tuple(tokens[start : end + 1]) == raw):
+            covered[start : end + 1] = [True] * length
+    return all(covered)
+
+
+def compact_resume_text(resume_text: str, parsed: ParsedResume) -> str:
+    """
+    Resume text for an LLM prompt that already carries parsed.prompt_facts():
+    skills lines made up only of dictionary skills are dropped (the extracted
+    list replaces them), as are contact lines in the header; blank lines and
+    bullet markers are removed and runs of whitespace collapsed.
+    """
+    lines = []
+    for name, section_lines in split_sections(resume_text):
+        kept = [
+            " ".join(line.lstrip(_BULLET_CHARS).split())
+            for line in section_lines
+            if line.strip()
+            and not (name == "header" and _CONTACT_RE.search(line))
+            and not (name == "skills" and _only_known_skills(line))
+        ]
+        if name == "skills" and not kept:
+            continue
+        if name != "header":
+            lines.append(name.upper())
+        lines.extend(kept)
+    return "\n".join(lines)
@@ -0,0 +1,116 @@
+"""
+64-bit SimHash fingerprints of resume text for near-duplicate detection.
+
+Features are overlapping three-word shingles of the lowercased words, so
+changing one word (a date, a typo) changes only the three shingles around
+it, and resumes that differ by a small edit get fingerprints a few bits
+apart. Each bit of the fingerprint is the majority vote of that bit over
+the features' 64-bit hashes.
+
+The vote is counted for all 64 bit positions at once: the counters are
+kept bit-sliced, with plane j holding bit j of every position's count, so
+adding one feature hash is a binary increment done with a handful of
+integer operations instead of a loop over its 64 bits.
+
+For lookups a fingerprint is split into BAND_COUNT bands of BAND_BITS
+bits. Two fingerprints within BAND_COUNT - 1 bits of each other agree
+exactly on at least one band, so candidates are found by band equality and
+then checked with the full Hamming distance. SimHash only estimates
+similarity, so callers confirm a match with the exact shingle_similarity.
+"""
+import hashlib
+import re
+from functools import lru_cache
+
+BITS = 64
+BAND_COUNT = 8
+BAND_BITS = BITS // BAND_COUNT
+SHINGLE_WORDS = 3
+
+_MASK = (1 << BITS) - 1
+_BAND_MASK = (1 << BAND_BITS) - 1
+_WORD_RE = re.compile(r"[a-z0-9]+")
+
+
+@lru_cache(maxsize=65536)
+def _word_hash(word: str) -> int:
+    return int.from_bytes(hashlib.blake2b(word.encode(), digest_size=8).digest(), "big")
+
+
+def _mix(value: int) -> int:
+    # splitmix64 finalizer: spreads every input bit over the whole output.
+    value = ((value ^ (value >> 30)) * 0xBF58476D1CE4E5B9) & _MASK
+    value = ((value ^ (value >> 27)) * 0x94D049BB133111EB) & _MASK
+    return value ^ (value >> 31)
+
+
+def _rotate(value: int, bits: int) -> int:
+    return ((value << bits) | (value >> (BITS - bits))) & _MASK
+
+
+def feature_hashes(text: str) -> list[int]:
+    """64-bit hashes of the text's three-word shingles (of its words if fewer)."""
+    words = [_word_hash(word) for word in _WORD_RE.findall(text.lower())]
+    if len(words) < SHINGLE_WORDS:
+        return words
+    return [
+        _mix(first ^ _rotate(second, 21) ^ _rotate(third, 42))
+        for first, second, third in zip(words, words[1:], words[2:])
+    ]
+
+
+def simhash(text: str) -> int:
+    """The unsigned 64-bit SimHash of ``text``; 0 for text without words."""
+    hashes = feature_hashes(text)
+    planes: list[int] = []
+    for value in hashes:
+        carry = value
+        for index, plane in enumerate(planes):
+            planes[index] = plane ^ carry
+            carry &= plane
+            if not carry:
+                break
+        if carry:
+            planes.append(carry)
+
+    # Positions whose count is more than half the features: compare the
+    # bit-sliced counts with the threshold from the most significant bit.
+    threshold = len(hashes) // 2
+    greater = 0
+    equal = _MASK
+    for bit in range(max(len(planes), threshold.bit_length()) - 1, -1, -1):
+        plane = planes[bit] if bit < len(planes) else 0
+        if threshold >> bit & 1:
+            equal &= plane
+        else:
+            greater |= equal & plane
+            equal &= ~plane
+    return greater
+
+
+def shingle_similarity(first: str, second: str) -> float:
+    """Jaccard similarity of the two texts' shingle sets."""
+    first_set, second_set = set(feature_hashes(first)), set(feature_hashes(second))
+    union = len(first_set | second_set)
+    return len(first_set & second_set) / union if union else 1.0
+
+
+def hamming_distance(first: int, second: int) -> int:
+    return (first ^ second).bit_count()
+
+
+def band_keys(fingerprint: int) -> list[int]:
+    """One key per band: the band's index in the high bits, its value in the low bits."""
+    return [
+        (band << BAND_BITS) | (fingerprint >> (band * BAND_BITS) & _BAND_MASK)
+        for band in range(BAND_COUNT)
+    ]
+
+
+def to_signed(fingerprint: int) -> int:
+    """The fingerprint as a signed 64-bit integer, for a BIGINT column."""
+    return fingerprint - (1 << BITS) if fingerprint >> (BITS - 1) else fingerprint
+
+
+def from_signed(value: int) -> int:
+    return value & _MASK
@@ -0,0 +1,164 @@
+import logging
+from functools import lru_cache
+from typing import Iterable, Optional
+
+from sqlalchemy import and_, bindparam, delete, insert, select, union, update
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from app.models import ResumeAnalysis, ResumeSkill
+from app.services.read_queries import analysis_read_columns
+from app.services.resume_parser import PARSER_VERSION, parse_resume
+
+logger = logging.getLogger("ai_job_assistant.skill_index")
+
+REBUILD_BATCH_SIZE = 1000
+MAX_SEARCH_SKILLS = 10
+
+
+def index_skills(
+    db: Session,
+    entries: Iterable[tuple[int, Optional[int], Iterable[str]]],
+) -> None:
+    """
+    Add index rows for (analysis id, user id, skills) entries in one
+    statement. Runs in the caller's transaction and does not commit.
+    """
+    rows = [
+        {"resume_analysis_id": analysis_id, "user_id": user_id, "skill": skill}
+        for analysis_id, user_id, skills in entries
+        for skill in skills
+    ]
+    if rows:
+        db.execute(insert(ResumeSkill), rows)
+
+
+_resume_skills = ResumeSkill.__table__
+
+
+def _postings(table, skill_param: str, scoped: bool):
+    query = select(table.c.resume_analysis_id).where(table.c.skill == bindparam(skill_param))
+    if scoped:
+        query = query.where(table.c.user_id == bindparam("user_id"))
+    return query
+
+
+@lru_cache(maxsize=None)
+def _page_query(skill_count: int, match_all: bool, scoped: bool):
+    """
+    The statement selecting one page of matching analysis ids, built once
+    per query shape with bound parameters: constructing the aliases and
+    subqueries costs more than running the query.
+    """
+    if match_all or skill_count == 1:
+        tables = [_resume_skills.alias(f"skill_{index}") for index in range(skill_count)]
+        driver = tables[0]
+        page = _postings(driver, "skill_0", scoped)
+        for index, other in enumerate(tables[1:], start=1):
+            page = page.join(
+                other,
+                and_(
+                    other.c.skill == bindparam(f"skill_{index}"),
+                    other.c.resume_analysis_id == driver.c.resume_analysis_id,
+                ),
+            )
+        page = page.order_by(driver.c.resume_analysis_id.desc())
+    else:
+        branches = [
+            _postings(_resume_skills, f"skill_{index}", scoped)
+            .order_by(_resume_skills.c.resume_analysis_id.desc())
+            .limit(bindparam("branch_limit"))
+            .subquery()
+            for index in range(skill_count)
+        ]
+        matched = union(*(select(branch.c.resume_analysis_id) for branch in branches)).subquery()
+        page = select(matched.c.resume_analysis_id).order_by(matched.c.resume_analysis_id.desc())
+    return page.offset(bindparam("offset")).limit(bindparam("limit"))
+
+
+def search_by_skills(
+    db: Session,
+    skills: list[str],
+    match_all: bool,
+    user_id: Optional[int] = None,
+    limit: int = 20,
+    offset: int = 0,
+) -> list:
+    """
+    Analyses whose parsed skills include all (or any) of the given canonical
+    skill names, newest (highest id) first, as analysis_read_columns() rows.
+
+    The page of ids is read from the index postings in descending id order
+    and stops once it is full, so the cost follows the page size rather
+    than the number of matches. For "all", the first skill's postings drive
+    the scan and the others are probed by primary key, so listing the
+    rarest skill first is cheapest. For "any", each skill contributes at
+    most offset + limit ids. Runs as one statement.
+    """
+    page = _page_query(len(skills), match_all, user_id is not None)
+    params = {f"skill_{index}": skill for index, skill in enumerate(skills)}
+    params.update(user_id=user_id, offset=offset, limit=limit, branch_limit=offset + limit)
+
+    return (
+        db.query(*analysis_read_columns())
+        .filter(ResumeAnalysis.id.in_(page))
+        .order_by(ResumeAnalysis.id.desc())
+        .params(params)
+        .all()
+    )
+
+
+def rebuild_skill_index(db: Session, batch_size: int = REBUILD_BATCH_SIZE) -> int:
+    """
+    Rebuild the skill index from stored analyses.
+
+    Works through analyses in id order, replacing each batch's index rows
+    and committing per batch, so searches keep working while it runs.
+    Analyses without parsed data from the current parser version are
+    parsed (and their parsed column updated) on the way. Returns the number
+    of analyses indexed.
+    """
+    done = 0
+    last_id = 0
+    while True:
+        batch = db.execute(
+            select(
+                ResumeAnalysis.id,
+                ResumeAnalysis.user_id,
+                ResumeAnalysis.resume_text,
+                ResumeAnalysis.parsed,
+            )
+            .where(ResumeAnalysis.id > last_id)
+            .order_by(ResumeAnalysis.id)
+            .limit(batch_size)
+        ).all()
+        if not batch:
+            break
+
+        ids = [row.id for row in batch]
+        entries = []
+        for row in batch:
+            parsed = row.parsed
+            if not parsed or parsed.get("version") != PARSER_VERSION:
+                parsed = parse_resume(row.resume_text).to_dict()
+                db.execute(
+                    update(ResumeAnalysis)
+                    .where(ResumeAnalysis.id == row.id)
+                    .values(parsed=parsed)
+                )
+            entries.append((row.id, row.user_id, parsed["skills"]))
+
+        try:
+            db.execute(delete(ResumeSkill).where(ResumeSkill.resume_analysis_id.in_(ids)))
+            index_skills(db, entries)
+            db.commit()
+        except SQLAlchemyError as exc:
+            db.rollback()
+            logger.error("skill index rebuild batch failed error=%s", exc)
+            raise
+
+        done += len(batch)
+        last_id = ids[-1]
+        logger.info("skill index rebuild progress indexed=%s", done)
+
+    return done
@@ -0,0 +1,222 @@
+"""
+Agent-level benchmark.
+
+Runs a corpus of resumes and interview questions through summarize_resume
+and generate_interview_answer, the way the API does, and reports latency
+percentiles, token usage and prompt cache effectiveness.
+
+The provider is whatever the environment configures. ``--record`` appends
+every provider call to a cassette, and ``--replay`` answers from one
+without network access; ``--latency-scale 1`` replays the recorded
+latencies, 0 answers instantly.
+
+Usage (from backend/):
+
+    LLM_PROVIDER=openai OPENAI_API_KEY=... \\
+        python -m benchmarks.bench_agent --resumes 20 --record cassettes/agent.jsonl.gz
+    python -m benchmarks.bench_agent --resumes 20 --replay cassettes/agent.jsonl.gz \\
+        [--latency-scale 1] [--concurrency 4] [--corpus corpus.jsonl]
+
+A corpus file has one JSON object per line:
+``{"resume": "...", "questions": ["...", ...], "job_title": "...", "company_name": "..."}``.
+Without one, synthetic resumes from bench_resume_parser are used.
+"""
+import argparse
+import json
+import math
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+from app.agents import job_assistant
+from app.agents.job_assistant import generate_interview_answer, summarize_resume
+from app.agents.provider_pool import build_pool
+from app.core.config import settings
+from app.core.runtime_metrics import runtime_metrics
+from app.services.resume_parser import parse_resume
+from benchmarks.bench_resume_parser import make_resume
+
+QUESTIONS = [
+    "Tell me about yourself.",
+    "Why do you want this job?",
+    "Describe a hard technical problem you solved.",
+    "How do you handle disagreements in code review?",
+    "What is your biggest weakness?",
+]
+
+
+def synthetic_corpus(resumes: int, questions: int, seed: int = 0) -> list[dict]:
+    rng = random.Random(seed)
+    return [
+        {
+            "resume": make_resume(rng),
+            "questions": QUESTIONS[:questions],
+            "job_title": "Backend Engineer",
+            "company_name": "Acme",
+        }
+        for _ in range(resumes)
+    ]
+
+
+def load_corpus(path: str) -> list[dict]:
+    with open(path, encoding="utf-8") as handle:
+        return [json.loads(line) for line in handle if line.strip()]
+
+
+def _percentile(values: list[float], percentile: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, math.ceil(percentile / 100 * len(ordered)) - 1)]
+
+
+def _run_item(item: dict) -> dict:
+    timings: dict[str, list[float]] = {"summarize": [], "answer": []}
+    stub_count = 0
+
+    started = time.perf_counter()
+    summary, provider = summarize_resume(item["resume"], parse_resume(item["resume"]))
+    timings["summarize"].append((time.perf_counter() - started) * 1000)
+    stub_count += provider == "stub"
+
+    for question in item.get("questions", []):
+        started = time.perf_counter()
+        _, provider = generate_interview_answer(
+            question=question,
+            job_title=item.get("job_title"),
+            company_name=item.get("company_name"),
+            resume_summary=summary,
+        )
+        timings["answer"].append((time.perf_counter() - started) * 1000)
+        stub_count += provider == "stub"
+    return {"timings": timings, "stub_count": stub_count}
+
+
+def run_benchmark(corpus: list[dict], concurrency: int = 1) -> dict:
+    """Run the corpus through the agent and return the report as a dict."""
+    before = runtime_metrics.snapshot()["counters"]
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(_run_item, corpus))
+    wall_s = time.perf_counter() - started
+    after = runtime_metrics.snapshot()["counters"]
+
+    def delta(name: str) -> float:
+        return after.get(name, 0) - before.get(name, 0)
+
+    operations = {}
+    for name in ("summarize", "answer"):
+        values = [ms for result in results for ms in result["timings"][name]]
+        operations[name] = {
+            "count": len(values),
+            "mean_ms": round(sum(values) / len(values), 2) if values else 0.0,
+            "p50_ms": round(_percentile(values, 50), 2),
+            "p95_ms": round(_percentile(values, 95), 2),
+            "p99_ms": round(_percentile(values, 99), 2),
+        }
+
+    templates = {}
+    for name in after:
+        if name.startswith("prompt.") and name.endswith(".input_tokens"):
+            template_id = name[len("prompt.") : -len(".input_tokens")]
+            input_tokens = delta(name)
+            if input_tokens:
+                cached = delta(f"prompt.{template_id}.cached_tokens")
+                templates[template_id] = {
+                    "input_tokens": int(input_tokens),
+                    "cached_tokens": int(cached),
+                    "cached_ratio": round(cached / input_tokens, 4),
+                }
+
+    input_tokens = delta("provider.input_tokens")
+    return {
+        "resumes": len(corpus),
+        "wall_s": round(wall_s, 3),
+        "operations": operations,
+        "provider_calls": int(delta("provider.calls")),
+        "provider_errors": int(delta("provider.errors")),
+        "stub_responses": sum(result["stub_count"] for result in results),
+        "tokens": {
+            "input": int(input_tokens),
+            "output": int(delta("provider.output_tokens")),
+            "cached": int(delta("provider.cached_tokens")),
+            "cached_ratio": round(delta("provider.cached_tokens") / input_tokens, 4)
+            if input_tokens
+            else 0.0,
+        },
+        "templates": templates,
+        "cassette": {"hits": int(delta("cassette.hits")), "misses": int(delta("cassette.misses"))},
+    }
+
+
+def configure_provider(
+    record: Optional[str], replay: Optional[str], latency_scale: float
+) -> None:
+    """Point the agent at a cassette, or record the configured provider to one."""
+    if record or replay:
+        settings.llm_provider = "openai"
+        settings.llm_cassette_mode = "record" if record else "replay"
+        settings.llm_cassette_path = record or replay
+        settings.llm_cassette_latency_scale = latency_scale
+    job_assistant.pool = build_pool(settings)
+
+
+def format_report(report: dict) -> str:
+    lines = [
+        f"resumes: {report['resumes']}, wall time: {report['wall_s']:.2f} s, "
+        f"provider calls: {report['provider_calls']}, errors: {report['provider_errors']}, "
+        f"stub responses: {report['stub_responses']}",
+    ]
+    for name, stats in report["operations"].items():
+        lines.append(
+            f"{name:<10} n={stats['count']:<5} mean={stats['mean_ms']:9.2f} ms  "
+            f"p50={stats['p50_ms']:9.2f}  p95={stats['p95_ms']:9.2f}  p99={stats['p99_ms']:9.2f}"
+        )
+    tokens = report["tokens"]
+    lines.append(
+        f"tokens: input={tokens['input']} output={tokens['output']} "
+        f"cached={tokens['cached']} ({tokens['cached_ratio']:.1%} of input)"
+    )
+    for template_id, stats in sorted(report["templates"].items()):
+        lines.append(
+            f"  {template_id:<28} input={stats['input_tokens']:<9} "
+            f"cached={stats['cached_tokens']:<9} ({stats['cached_ratio']:.1%})"
+        )
+    cassette = report["cassette"]
+    if cassette["hits"] or cassette["misses"]:
+        lines.append(f"cassette: hits={cassette['hits']} misses={cassette['misses']}")
+    return "\n".join(lines)
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.bench_agent")
+    parser.add_argument("--corpus", help="JSON Lines corpus; synthetic resumes when omitted")
+    parser.add_argument("--resumes", type=int, default=20)
+    parser.add_argument("--questions", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--concurrency", type=int, default=1)
+    cassette = parser.add_mutually_exclusive_group()
+    cassette.add_argument("--record", metavar="PATH", help="append provider calls to a cassette")
+    cassette.add_argument("--replay", metavar="PATH", help="answer provider calls from a cassette")
+    parser.add_argument(
+        "--latency-scale",
+        type=float,
+        default=0.0,
+        help="with --replay, sleep this multiple of the recorded latency",
+    )
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = parser.parse_args(argv)
+
+    corpus = (
+        load_corpus(args.corpus)
+        if args.corpus
+        else synthetic_corpus(args.resumes, args.questions, args.seed)
+    )
+    configure_provider(args.record, args.replay, args.latency_scale)
+    report = run_benchmark(corpus, args.concurrency)
+    print(json.dumps(report, indent=2) if args.json else format_report(report))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Throughput benchmark for the local resume parser.
+
+Parses a batch of synthetic resumes and reports resumes per second, plus how
+much shorter the compacted prompt text is than the raw resume.
+
+Usage (from backend/):
+
+    python -m benchmarks.bench_resume_parser [--resumes 2000] [--repeat 3]
+"""
+import argparse
+import random
+import time
+
+from app.services.resume_parser import SKILLS, compact_resume_text, parse_resume
+
+_ROLES = ["Software Engineer", "Backend Developer", "Data Scientist", "DevOps Engineer"]
+
+
+def make_resume(rng: random.Random) -> str:
+    skills = rng.sample(sorted(SKILLS), 25)
+    start = rng.randint(2005, 2018)
+    jobs = []
+    for index in range(rng.randint(2, 4)):
+        end = start + rng.randint(1, 4)
+        jobs.append(
+            f"{rng.choice(['Senior ', 'Lead ', ''])}{rng.choice(_ROLES)}, Company {index} "
+            f"({start} - {end})\n"
+            f"- Built and operated services using {', '.join(rng.sample(skills, 3))}.\n"
+            "- Led design reviews, mentored engineers and improved on-call health.\n"
+            "- Reduced p95 latency by caching hot reads and batching writes.\n"
+        )
+        start = end
+    return (
+        "Alex Example\nalex@example.com | +1 555 010 0000\n\n"
+        "SUMMARY\n"
+        f"Engineer with {rng.randint(3, 15)}+ years of experience shipping web products.\n\n"
+        "EXPERIENCE\n" + "\n".join(jobs) + "\n"
+        "Education\nB.Sc. Computer Science, 2001 - 2005\n\n"
+        "Technical Skills\n"
+        + "\n".join(f"- {', '.join(skills[i : i + 5])}" for i in range(0, len(skills), 5))
+        + "\n"
+    )
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.bench_resume_parser")
+    parser.add_argument("--resumes", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(0)
+    resumes = [make_resume(rng) for _ in range(args.resumes)]
+
+    best = float("inf")
+    for _ in range(args.repeat):
+        started = time.perf_counter()
+        parsed = [parse_resume(text) for text in resumes]
+        best = min(best, time.perf_counter() - started)
+
+    raw_chars = sum(len(text) for text in resumes)
+    prompt_chars = sum(
+        len(compact_resume_text(text, result)) + len(result.prompt_facts())
+        for text, result in zip(resumes, parsed)
+    )
+
+    print(f"resumes: {args.resumes}, avg chars: {raw_chars / args.resumes:.0f}")
+    print(f"parse throughput:   {args.resumes / best:10.0f} resumes/s")
+    print(f"per resume:         {best / args.resumes * 1e6:10.1f} us")
+    print(f"prompt text chars:  {prompt_chars / raw_chars:10.1%} of raw resume")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+Microbenchmark for list-page serialization.
+
+Compares the previous response path (load ORM entities, build a read model
+per row by hand, then let FastAPI re-validate and serialize the list through
+response_model and JSONResponse) with the bulk path used now (select plain
+columns and validate/serialize the row tuples with a TypeAdapter).
+
+Usage (from backend/):
+
+    python -m benchmarks.bench_serialization [--rows 100] [--repeat 1000]
+"""
+import argparse
+import timeit
+
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.responses import FastJSONResponse, serialized_response
+from app.core.db import Base
+from app.models import InterviewAnswer, ResumeAnalysis, User
+from app.schemas import InterviewAnswerRead
+from app.schemas.answer import interview_answer_list_adapter
+from app.services.read_queries import answer_read_columns
+
+_response_model_adapter = TypeAdapter(list[InterviewAnswerRead])
+
+
+def _seed(db: Session, rows: int) -> None:
+    user = User(email="bench@example.com", full_name="Bench User")
+    db.add(user)
+    db.flush()
+    analysis = ResumeAnalysis(user_id=user.id, resume_text="Python", summary="Python dev")
+    db.add(analysis)
+    db.flush()
+    db.add_all(
+        InterviewAnswer(
+            user_id=user.id,
+            resume_analysis_id=analysis.id,
+            question=f"Tell me about a time you fixed a production issue ({i})?",
+            job_title="Backend Engineer",
+            company_name="Example Corp",
+            answer="I traced a slow endpoint to an N+1 query and batched it. " * 6,
+        )
+        for i in range(rows)
+    )
+    db.commit()
+
+
+def _previous_path(db: Session) -> bytes:
+    answers = db.query(InterviewAnswer).order_by(InterviewAnswer.id).all()
+    models = [
+        InterviewAnswerRead(
+            id=a.id,
+            user_id=a.user_id,
+            resume_analysis_id=a.resume_analysis_id,
+            question=a.question,
+            job_title=a.job_title,
+            company_name=a.company_name,
+            answer=a.answer,
+            created_at=a.created_at,
+            provider=settings.llm_provider,
+        )
+        for a in answers
+    ]
+    # What FastAPI does with a response_model: validate again, dump to
+    # JSON-compatible Python, then render with json.dumps.
+    adapter = _response_model_adapter
+    content = adapter.dump_python(adapter.validate_python(models), mode="json")
+    return JSONResponse(content).body
+
+
+def _bulk_path(db: Session) -> bytes:
+    rows = db.query(*answer_read_columns()).order_by(InterviewAnswer.id).all()
+    return serialized_response(interview_answer_list_adapter, rows).body
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.bench_serialization")
+    parser.add_argument("--rows", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=1000)
+    args = parser.parse_args(argv)
+
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    with Session(engine) as db:
+        _seed(db, args.rows)
+        assert _previous_path(db) == _bulk_path(db), "outputs differ"
+
+        payload = {"total_users": 3, "items": [{"name": "Zoë", "count": 1}] * args.rows}
+        assert JSONResponse(payload).body == FastJSONResponse(payload).body, "renderers differ"
+
+        previous = timeit.timeit(lambda: _previous_path(db), number=args.repeat)
+        bulk = timeit.timeit(lambda: _bulk_path(db), number=args.repeat)
+        std_render = timeit.timeit(lambda: JSONResponse(payload), number=args.repeat)
+        fast_render = timeit.timeit(lambda: FastJSONResponse(payload), number=args.repeat)
+
+    def per_page(total: float) -> float:
+        return total / args.repeat * 1e6
+
+    print(f"rows per page: {args.rows}, iterations: {args.repeat}")
+    print(f"previous path (entities + response_model): {per_page(previous):9.1f} us/page")
+    print(f"bulk path (row tuples + TypeAdapter):      {per_page(bulk):9.1f} us/page")
+    print(f"speedup:                                   {previous / bulk:9.2f}x")
+    print(f"JSONResponse render:                       {per_page(std_render):9.1f} us/page")
+    print(f"FastJSONResponse render:                   {per_page(fast_render):9.1f} us/page")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Benchmark for resume SimHash fingerprints.
+
+Fingerprints a batch of synthetic resumes with the bit-sliced simhash() and
+with a straightforward per-bit reference, and reports the throughput of
+each. It then measures how well the near-duplicate settings separate
+resumes: each resume gets a one-word edit, which should be found and
+reused, and resumes from the same template are compared with each other,
+which should not.
+
+Usage (from backend/):
+
+    python -m benchmarks.bench_simhash [--resumes 500] [--repeat 3]
+"""
+import argparse
+import random
+import time
+
+from app.core.config import settings
+from app.services.simhash import (
+    BITS,
+    band_keys,
+    feature_hashes,
+    hamming_distance,
+    shingle_similarity,
+    simhash,
+)
+from benchmarks.bench_resume_parser import make_resume
+
+
+def reference_simhash(text: str) -> int:
+    """SimHash with one counter per bit position, for comparison."""
+    hashes = feature_hashes(text)
+    counts = [0] * BITS
+    for value in hashes:
+        for bit in range(BITS):
+            counts[bit] += value >> bit & 1
+    return sum(1 << bit for bit in range(BITS) if counts[bit] * 2 > len(hashes))
+
+
+def edit_one_word(text: str, rng: random.Random) -> str:
+    words = text.split(" ")
+    words[rng.randrange(len(words))] = "edited"
+    return " ".join(words)
+
+
+def _best_time(function, texts: list[str], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for text in texts:
+            function(text)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def _matches(first: str, second: str) -> bool:
+    fingerprint_a, fingerprint_b = simhash(first), simhash(second)
+    return (
+        bool(set(band_keys(fingerprint_a)) & set(band_keys(fingerprint_b)))
+        and hamming_distance(fingerprint_a, fingerprint_b) <= settings.near_duplicate_max_distance
+        and shingle_similarity(first, second) >= settings.near_duplicate_min_similarity
+    )
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.bench_simhash")
+    parser.add_argument("--resumes", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(0)
+    resumes = [make_resume(rng) for _ in range(args.resumes)]
+    edited = [edit_one_word(text, rng) for text in resumes]
+
+    bit_sliced = _best_time(simhash, resumes, args.repeat)
+    reference = _best_time(reference_simhash, resumes, args.repeat)
+    print(f"resumes: {args.resumes}")
+    for name, seconds in (("bit-sliced", bit_sliced), ("per-bit", reference)):
+        print(
+            f"{name + ':':<12} {args.resumes / seconds:8.0f} resumes/s  "
+            f"{seconds / args.resumes * 1e6:8.1f} us each"
+        )
+    print(f"speedup:     {reference / bit_sliced:8.1f}x")
+
+    edit_distances = [
+        hamming_distance(simhash(text), simhash(other)) for text, other in zip(resumes, edited)
+    ]
+    found = sum(_matches(text, other) for text, other in zip(resumes, edited))
+    print(
+        f"one-word edits: mean distance {sum(edit_distances) / len(edit_distances):.2f} bits, "
+        f"max {max(edit_distances)}, reused {found}/{len(resumes)}"
+    )
+
+    pairs = list(zip(resumes, resumes[1:]))
+    distinct_distances = [hamming_distance(simhash(a), simhash(b)) for a, b in pairs]
+    similarities = [shingle_similarity(a, b) for a, b in pairs]
+    false_matches = sum(_matches(a, b) for a, b in pairs)
+    print(
+        f"distinct resumes: min distance {min(distinct_distances)} bits, "
+        f"max similarity {max(similarities):.2f}, reused {false_matches}/{len(pairs)}"
+    )
+
+
+if __name__ == "__main__":
+    main()
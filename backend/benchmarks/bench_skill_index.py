@@ -0,0 +1,166 @@
+"""
+Benchmark for skill search: the resume_skills inverted index against a
+LIKE scan over resume_analyses.resume_text.
+
+Seeds a temporary SQLite database with synthetic analyses (and their index
+rows), then times a first page and a full match count for common, rare
+and absent skill combinations, with and without user scoping. The LIKE
+scan is also less precise: '%Go%' matches "Google" and "good".
+
+Usage (from backend/):
+
+    python -m benchmarks.bench_skill_index [--rows 1000000] [--users 1000] [--repeat 5]
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from sqlalchemy import and_, create_engine, func, insert, or_, select
+from sqlalchemy.orm import Session
+
+from app.core.db import Base
+from app.models import ResumeAnalysis, ResumeSkill, User
+from app.services.read_queries import analysis_read_columns
+from app.services.skill_index import search_by_skills
+
+_SKILLS = [
+    "Python", "Java", "JavaScript", "TypeScript", "Go", "Rust", "C++", "SQL",
+    "React", "Node.js", "Django", "FastAPI", "PostgreSQL", "MySQL", "Redis",
+    "Kafka", "Spark", "AWS", "GCP", "Azure", "Docker", "Kubernetes",
+    "Terraform", "Linux", "Git", "CI/CD", "Pandas", "PyTorch", "GraphQL",
+    "MongoDB",
+]
+_BATCH = 20_000
+
+
+def _seed(engine, rows: int, users: int) -> None:
+    rng = random.Random(0)
+    # Zipf-like popularity so common and rare skills are both represented.
+    weights = [1 / (rank + 1) for rank in range(len(_SKILLS))]
+
+    with engine.begin() as conn:
+        conn.execute(
+            insert(User),
+            [
+                {"id": i, "email": f"bench{i}@example.com", "full_name": "Bench"}
+                for i in range(1, users + 1)
+            ],
+        )
+
+    for start in range(1, rows + 1, _BATCH):
+        analyses, skill_rows = [], []
+        for analysis_id in range(start, min(start + _BATCH, rows + 1)):
+            user_id = rng.randint(1, users)
+            skills = sorted(set(rng.choices(_SKILLS, weights, k=rng.randint(3, 8))))
+            analyses.append(
+                {
+                    "id": analysis_id,
+                    "user_id": user_id,
+                    "resume_text": (
+                        f"Engineer at a product company. Experienced with {', '.join(skills)}. "
+                        "Built and operated services, mentored engineers, improved reliability."
+                    ),
+                    "summary": "Engineer.",
+                    "summary_pending": False,
+                    "parsed": {"skills": skills, "version": 1},
+                }
+            )
+            skill_rows.extend(
+                {"resume_analysis_id": analysis_id, "user_id": user_id, "skill": skill}
+                for skill in skills
+            )
+        with engine.begin() as conn:
+            conn.execute(insert(ResumeAnalysis), analyses)
+            conn.execute(insert(ResumeSkill), skill_rows)
+
+
+def _like(skills: list[str], match_all: bool, user_id=None):
+    terms = [ResumeAnalysis.resume_text.like(f"%{skill}%") for skill in skills]
+    condition = and_(*terms) if match_all else or_(*terms)
+    if user_id is not None:
+        condition = and_(condition, ResumeAnalysis.user_id == user_id)
+    return condition
+
+
+def _index_count(db: Session, skills: list[str], match_all: bool, user_id=None) -> int:
+    matched = select(ResumeSkill.resume_analysis_id).where(ResumeSkill.skill.in_(skills))
+    if user_id is not None:
+        matched = matched.where(ResumeSkill.user_id == user_id)
+    matched = matched.group_by(ResumeSkill.resume_analysis_id)
+    if match_all:
+        matched = matched.having(func.count() == len(skills))
+    return db.scalar(select(func.count()).select_from(matched.subquery()))
+
+
+def _timed(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.bench_skill_index")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    path = os.path.join(tempfile.mkdtemp(), "bench_skill_index.db")
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(bind=engine)
+
+    started = time.perf_counter()
+    _seed(engine, args.rows, args.users)
+    print(f"seeded {args.rows} analyses in {time.perf_counter() - started:.1f}s ({path})")
+
+    cases = [
+        ("AND Kubernetes+Go", ["Go", "Kubernetes"], True, None),
+        ("OR Rust+Kafka", ["Kafka", "Rust"], False, None),
+        ("AND Python+AWS, one user", ["AWS", "Python"], True, 1),
+        # Rare combinations are LIKE's worst case: no early exit.
+        ("AND GraphQL+MongoDB+Pandas", ["MongoDB", "GraphQL", "Pandas"], True, None),
+        ("AND Elasticsearch (no matches)", ["Elasticsearch"], True, None),
+    ]
+    with Session(engine) as db:
+        for label, skills, match_all, user_id in cases:
+            like = _like(skills, match_all, user_id)
+
+            def index_page():
+                return search_by_skills(db, skills, match_all, user_id=user_id)
+
+            def like_page():
+                return (
+                    db.query(*analysis_read_columns())
+                    .filter(like)
+                    .order_by(ResumeAnalysis.id.desc())
+                    .limit(20)
+                    .all()
+                )
+
+            def like_count():
+                return db.scalar(select(func.count()).select_from(ResumeAnalysis).where(like))
+
+            def index_count():
+                return _index_count(db, skills, match_all, user_id)
+
+            print(f"\n{label}: {index_count()} indexed matches, {like_count()} LIKE matches")
+            print(
+                f"  first page  index: {_timed(index_page, args.repeat):9.2f} ms"
+                f"   LIKE: {_timed(like_page, args.repeat):9.2f} ms"
+            )
+            print(
+                f"  full count  index: {_timed(index_count, args.repeat):9.2f} ms"
+                f"   LIKE: {_timed(like_count, args.repeat):9.2f} ms"
+            )
+
+    engine.dispose()
+    os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,487 @@
+"""
+OpenAI-compatible fake server for offline load and latency testing.
+
+Serves the subset of the OpenAI API the backend uses (``POST /v1/responses``,
+streaming and non-streaming, and ``GET /v1/models``) with configurable
+latency distributions, streaming token rates, injected 429/5xx errors with
+rate-limit headers, and ``usage`` payloads. Prompt prefixes are cached the
+way the provider does it, so ``cached_tokens`` in ``usage`` reflects how
+much of each prompt repeats an earlier one.
+
+Run it locally and point the backend at it (from backend/):
+
+    python -m benchmarks.fake_openai --port 8100 --latency-ms 800 \\
+        --jitter-ms 300 --distribution lognormal --tokens-per-second 60 \\
+        --error-rate-429 0.02 --error-rate-5xx 0.01
+
+    LLM_PROVIDER=openai OPENAI_API_KEY=fake \\
+        OPENAI_BASE_URL=http://127.0.0.1:8100/v1 python -m app.serve
+
+The configuration can be changed while the server runs with
+``PATCH /_fake/config`` and request counters are available at
+``GET /_fake/stats``. In tests the app can be used without a socket by
+passing ``TestClient(create_fake_openai_app(...))`` as the OpenAI client's
+``http_client``.
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import math
+import random
+import threading
+import time
+import uuid
+from collections import Counter, OrderedDict, deque
+from dataclasses import asdict, dataclass, fields, replace
+from typing import Any, AsyncIterator, Optional
+
+from fastapi import FastAPI, HTTPException, Request, status
+from fastapi.responses import JSONResponse, StreamingResponse
+
+DISTRIBUTIONS = ("fixed", "uniform", "normal", "lognormal")
+
+_WORDS = (
+    "I", "built", "and", "maintained", "backend", "services", "in", "Python",
+    "with", "FastAPI", "SQL", "reliable", "APIs", "for", "a", "team", "that",
+    "shipped", "features", "quickly", "while", "keeping", "latency", "low",
+)
+
+
+@dataclass
+class FakeOpenAIConfig:
+    """Behaviour of the fake server; every field can be changed at runtime."""
+
+    # Time to first token (or to the whole response when not streaming).
+    latency_ms: float = 500.0
+    latency_jitter_ms: float = 0.0
+    distribution: str = "fixed"
+    # Generation speed; 0 means output is produced instantly.
+    tokens_per_second: float = 0.0
+    output_tokens: int = 120
+    # Probability of an injected error per request.
+    error_rate_429: float = 0.0
+    error_rate_5xx: float = 0.0
+    retry_after_seconds: float = 1.0
+    # Real sliding-window limits (0 disables), reported in x-ratelimit-* headers.
+    requests_per_minute: int = 0
+    tokens_per_minute: int = 0
+    # Report repeated prompt prefixes of 1024+ tokens as cached_tokens.
+    prompt_caching: bool = True
+    # Time saved per cached input token, to model the lower latency of hits.
+    cached_token_saving_ms: float = 0.0
+    seed: Optional[int] = None
+
+    def validate(self) -> None:
+        if self.distribution not in DISTRIBUTIONS:
+            raise ValueError(f"distribution must be one of {', '.join(DISTRIBUTIONS)}")
+        if self.latency_ms < 0 or self.latency_jitter_ms < 0:
+            raise ValueError("latency values must not be negative")
+        if self.tokens_per_second < 0 or self.output_tokens < 1:
+            raise ValueError("tokens_per_second must be >= 0 and output_tokens >= 1")
+        for rate in (self.error_rate_429, self.error_rate_5xx):
+            if not 0 <= rate <= 1:
+                raise ValueError("error rates must be between 0 and 1")
+        if self.cached_token_saving_ms < 0:
+            raise ValueError("cached_token_saving_ms must not be negative")
+
+
+class _RateWindow:
+    """One-minute sliding window of request and token counts."""
+
+    def __init__(self) -> None:
+        self._events: deque[tuple[float, int]] = deque()
+
+    def usage(self, now: float) -> tuple[int, int, float]:
+        while self._events and now - self._events[0][0] >= 60:
+            self._events.popleft()
+        requests = len(self._events)
+        tokens = sum(count for _, count in self._events)
+        reset = 60 - (now - self._events[0][0]) if self._events else 0.0
+        return requests, tokens, reset
+
+    def add(self, now: float, tokens: int) -> None:
+        self._events.append((now, tokens))
+
+
+class _PromptCache:
+    """
+    Prefix cache modelled on automatic prompt caching: prompts of at least
+    MIN_TOKENS are cached in STEP_TOKENS increments, per prompt_cache_key,
+    and the longest cached prefix of a later prompt counts as cached.
+    """
+
+    MIN_TOKENS = 1024
+    STEP_TOKENS = 128
+
+    def __init__(self, max_entries: int = 100_000) -> None:
+        self.max_entries = max_entries
+        self._prefixes: OrderedDict[bytes, None] = OrderedDict()
+
+    def cached_tokens(self, prompt: str, cache_key: str = "") -> int:
+        """Tokens of ``prompt`` already cached; caches its prefixes for next time."""
+        digest = hashlib.sha256(cache_key.encode() + b"\0")
+        consumed = 0
+        cached = 0
+        for boundary in range(self.MIN_TOKENS, estimate_tokens(prompt) + 1, self.STEP_TOKENS):
+            end = boundary * 4
+            digest.update(prompt[consumed:end].encode())
+            consumed = end
+            prefix = digest.digest()
+            if prefix in self._prefixes:
+                self._prefixes.move_to_end(prefix)
+                cached = boundary
+            else:
+                self._prefixes[prefix] = None
+                if len(self._prefixes) > self.max_entries:
+                    self._prefixes.popitem(last=False)
+        return cached
+
+
+class FakeOpenAIState:
+    def __init__(self, config: FakeOpenAIConfig) -> None:
+        config.validate()
+        self.config = config
+        self.rng = random.Random(config.seed)
+        self.window = _RateWindow()
+        self.stats: Counter = Counter()
+        self.prompt_cache = _PromptCache()
+        self.lock = threading.Lock()
+
+    def update(self, changes: dict[str, Any]) -> FakeOpenAIConfig:
+        known = {f.name for f in fields(FakeOpenAIConfig)}
+        unknown = sorted(set(changes) - known)
+        if unknown:
+            raise ValueError(f"unknown config fields: {', '.join(unknown)}")
+        config = replace(self.config, **changes)
+        config.validate()
+        with self.lock:
+            self.config = config
+            if "seed" in changes:
+                self.rng = random.Random(config.seed)
+        return config
+
+    def sample_latency_ms(self) -> float:
+        config = self.config
+        mean, jitter = config.latency_ms, config.latency_jitter_ms
+        with self.lock:
+            if config.distribution == "fixed" or jitter == 0 or mean == 0:
+                value = mean
+            elif config.distribution == "uniform":
+                value = self.rng.uniform(mean - jitter, mean + jitter)
+            elif config.distribution == "normal":
+                value = self.rng.gauss(mean, jitter)
+            else:
+                # Lognormal with the configured mean and standard deviation.
+                sigma = math.sqrt(math.log(1 + (jitter / mean) ** 2))
+                mu = math.log(mean) - sigma**2 / 2
+                value = self.rng.lognormvariate(mu, sigma)
+        return max(0.0, value)
+
+    def roll_error(self) -> Optional[int]:
+        config = self.config
+        with self.lock:
+            roll = self.rng.random()
+            if roll < config.error_rate_429:
+                return status.HTTP_429_TOO_MANY_REQUESTS
+            if roll < config.error_rate_429 + config.error_rate_5xx:
+                return self.rng.choice((500, 502, 503))
+        return None
+
+    def admit(self, tokens: int, record: bool = True) -> tuple[Optional[int], dict[str, str]]:
+        """
+        Apply the sliding-window limits and return (error status or None,
+        rate-limit headers). Requests that are not recorded (injected errors)
+        are reported against the window without consuming it.
+        """
+        config = self.config
+        now = time.monotonic()
+        with self.lock:
+            used_requests, used_tokens, reset = self.window.usage(now)
+            limited = (
+                config.requests_per_minute and used_requests >= config.requests_per_minute
+            ) or (
+                config.tokens_per_minute and used_tokens + tokens > config.tokens_per_minute
+            )
+            if not limited and record:
+                self.window.add(now, tokens)
+                used_requests += 1
+                used_tokens += tokens
+
+        request_limit = config.requests_per_minute or 10_000
+        token_limit = config.tokens_per_minute or 10_000_000
+        headers = {
+            "x-ratelimit-limit-requests": str(request_limit),
+            "x-ratelimit-remaining-requests": str(max(0, request_limit - used_requests)),
+            "x-ratelimit-reset-requests": f"{reset:.3f}s",
+            "x-ratelimit-limit-tokens": str(token_limit),
+            "x-ratelimit-remaining-tokens": str(max(0, token_limit - used_tokens)),
+            "x-ratelimit-reset-tokens": f"{reset:.3f}s",
+        }
+        if limited:
+            headers["retry-after"] = str(max(1, math.ceil(reset)))
+            headers["retry-after-ms"] = str(int(reset * 1000))
+            return status.HTTP_429_TOO_MANY_REQUESTS, headers
+        return None, headers
+
+    def cached_tokens(self, prompt: str, cache_key: str) -> int:
+        if not self.config.prompt_caching:
+            return 0
+        with self.lock:
+            return self.prompt_cache.cached_tokens(prompt, cache_key)
+
+    def count(self, key: str, amount: int = 1) -> None:
+        with self.lock:
+            self.stats[key] += amount
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (about four characters per token)."""
+    return max(1, len(text) // 4)
+
+
+def _input_text(value: Any) -> str:
+    if isinstance(value, str):
+        return value
+    # Message-list input: collect the text parts.
+    parts: list[str] = []
+    for item in value or []:
+        content = item.get("content", "") if isinstance(item, dict) else ""
+        if isinstance(content, str):
+            parts.append(content)
+        else:
+            parts.extend(part.get("text", "") for part in content if isinstance(part, dict))
+    return "\n".join(parts)
+
+
+def _output_words(count: int, seed_text: str) -> list[str]:
+    offset = sum(map(ord, seed_text[:64])) % len(_WORDS)
+    return [_WORDS[(offset + i) % len(_WORDS)] for i in range(count)]
+
+
+def _usage(input_tokens: int, output_tokens: int, cached_tokens: int = 0) -> dict:
+    return {
+        "input_tokens": input_tokens,
+        "input_tokens_details": {"cached_tokens": cached_tokens},
+        "output_tokens": output_tokens,
+        "output_tokens_details": {"reasoning_tokens": 0},
+        "total_tokens": input_tokens + output_tokens,
+    }
+
+
+def _response_object(
+    response_id: str,
+    model: str,
+    text: str,
+    usage: Optional[dict],
+    status_value: str = "completed",
+) -> dict:
+    output = []
+    if status_value == "completed":
+        output.append(
+            {
+                "id": f"msg_{response_id[5:]}",
+                "type": "message",
+                "role": "assistant",
+                "status": "completed",
+                "content": [{"type": "output_text", "text": text, "annotations": []}],
+            }
+        )
+    return {
+        "id": response_id,
+        "object": "response",
+        "created_at": int(time.time()),
+        "status": status_value,
+        "model": model,
+        "output": output,
+        "parallel_tool_calls": True,
+        "tool_choice": "auto",
+        "tools": [],
+        "error": None,
+        "incomplete_details": None,
+        "usage": usage,
+    }
+
+
+def _error_response(status_code: int, headers: dict[str, str], retry_after: float) -> JSONResponse:
+    if status_code == status.HTTP_429_TOO_MANY_REQUESTS:
+        headers.setdefault("retry-after", str(max(1, math.ceil(retry_after))))
+        headers.setdefault("retry-after-ms", str(int(retry_after * 1000)))
+        error = {
+            "message": "Rate limit reached (injected by fake server).",
+            "type": "requests",
+            "code": "rate_limit_exceeded",
+        }
+    else:
+        error = {
+            "message": "The server had an error while processing your request (injected).",
+            "type": "server_error",
+            "code": None,
+        }
+    return JSONResponse({"error": error}, status_code=status_code, headers=headers)
+
+
+def create_fake_openai_app(config: Optional[FakeOpenAIConfig] = None) -> FastAPI:
+    state = FakeOpenAIState(config or FakeOpenAIConfig())
+    app = FastAPI(title="Fake OpenAI")
+    app.state.fake = state
+
+    @app.get("/v1/models")
+    def list_models():
+        state.count("models")
+        return {
+            "object": "list",
+            "data": [{"id": "gpt-4o-mini", "object": "model", "created": 0, "owned_by": "fake"}],
+        }
+
+    @app.post("/v1/responses")
+    async def create_response(request: Request):
+        body = await request.json()
+        config = state.config
+        model = body.get("model", "gpt-4o-mini")
+        prompt = _input_text(body.get("input"))
+        input_tokens = estimate_tokens(prompt)
+        output_tokens = min(config.output_tokens, body.get("max_output_tokens") or config.output_tokens)
+        state.count("requests")
+
+        injected = state.roll_error()
+        limited, headers = state.admit(input_tokens + output_tokens, record=injected is None)
+        error_status = limited or injected
+        latency_s = state.sample_latency_ms() / 1000
+
+        if error_status is not None:
+            state.count(f"status_{error_status}")
+            # Errors come back quickly, as rate-limit rejections do upstream.
+            await asyncio.sleep(min(latency_s, 0.05))
+            return _error_response(error_status, headers, config.retry_after_seconds)
+
+        state.count("status_200")
+        state.count("input_tokens", input_tokens)
+        state.count("output_tokens", output_tokens)
+        cached_tokens = state.cached_tokens(prompt, body.get("prompt_cache_key") or "")
+        state.count("cached_tokens", cached_tokens)
+        latency_s = max(0.0, latency_s - cached_tokens * config.cached_token_saving_ms / 1000)
+        response_id = f"resp_{uuid.uuid4().hex}"
+        words = _output_words(output_tokens, prompt)
+        usage = _usage(input_tokens, output_tokens, cached_tokens)
+        token_delay = 1 / config.tokens_per_second if config.tokens_per_second else 0.0
+
+        if not body.get("stream"):
+            await asyncio.sleep(latency_s + token_delay * output_tokens)
+            text = " ".join(words)
+            return JSONResponse(
+                _response_object(response_id, model, text, usage),
+                headers=headers,
+            )
+
+        async def events() -> AsyncIterator[str]:
+            sequence = 0
+
+            def event(payload: dict) -> str:
+                nonlocal sequence
+                payload["sequence_number"] = sequence
+                sequence += 1
+                return f"event: {payload['type']}\ndata: {json.dumps(payload)}\n\n"
+
+            yield event(
+                {
+                    "type": "response.created",
+                    "response": _response_object(response_id, model, "", None, "in_progress"),
+                }
+            )
+            await asyncio.sleep(latency_s)
+            for index, word in enumerate(words):
+                yield event(
+                    {
+                        "type": "response.output_text.delta",
+                        "item_id": f"msg_{response_id[5:]}",
+                        "output_index": 0,
+                        "content_index": 0,
+                        "delta": word if index == 0 else f" {word}",
+                        "logprobs": [],
+                    }
+                )
+                if token_delay:
+                    await asyncio.sleep(token_delay)
+            yield event(
+                {
+                    "type": "response.completed",
+                    "response": _response_object(response_id, model, " ".join(words), usage),
+                }
+            )
+
+        return StreamingResponse(events(), media_type="text/event-stream", headers=headers)
+
+    @app.get("/_fake/config")
+    def get_config():
+        return asdict(state.config)
+
+    @app.patch("/_fake/config")
+    def update_config(changes: dict[str, Any]):
+        try:
+            return asdict(state.update(changes))
+        except (TypeError, ValueError) as exc:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(exc),
+            ) from exc
+
+    @app.get("/_fake/stats")
+    def get_stats():
+        with state.lock:
+            return dict(state.stats)
+
+    return app
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    import uvicorn
+
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.fake_openai")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8100)
+    parser.add_argument("--latency-ms", type=float, default=500.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--distribution", choices=DISTRIBUTIONS, default="fixed")
+    parser.add_argument("--tokens-per-second", type=float, default=0.0)
+    parser.add_argument("--output-tokens", type=int, default=120)
+    parser.add_argument("--error-rate-429", type=float, default=0.0)
+    parser.add_argument("--error-rate-5xx", type=float, default=0.0)
+    parser.add_argument("--retry-after", type=float, default=1.0)
+    parser.add_argument("--rpm", type=int, default=0, help="requests per minute limit")
+    parser.add_argument("--tpm", type=int, default=0, help="tokens per minute limit")
+    parser.add_argument(
+        "--no-prompt-caching",
+        dest="prompt_caching",
+        action="store_false",
+        help="always report cached_tokens as 0",
+    )
+    parser.add_argument(
+        "--cached-token-saving-ms",
+        type=float,
+        default=0.0,
+        help="latency saved per cached input token",
+    )
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    config = FakeOpenAIConfig(
+        latency_ms=args.latency_ms,
+        latency_jitter_ms=args.jitter_ms,
+        distribution=args.distribution,
+        tokens_per_second=args.tokens_per_second,
+        output_tokens=args.output_tokens,
+        error_rate_429=args.error_rate_429,
+        error_rate_5xx=args.error_rate_5xx,
+        retry_after_seconds=args.retry_after,
+        requests_per_minute=args.rpm,
+        tokens_per_minute=args.tpm,
+        prompt_caching=args.prompt_caching,
+        cached_token_saving_ms=args.cached_token_saving_ms,
+        seed=args.seed,
+    )
+    uvicorn.run(create_fake_openai_app(config), host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
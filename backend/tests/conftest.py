@@ -1,12 +1,15 @@
 import os
+from contextlib import contextmanager
 
 import pytest
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
 
+from app.core.config import settings
 from app.core.db import Base, get_db
 from app.main import app
+from app.services.metrics_cache import metrics_cache
 
 TEST_DATABASE_URL = "sqlite:///./ai_job_assistant_test.db"
 
@@ -32,6 +35,13 @@ def override_get_db():
 app.dependency_overrides[get_db] = override_get_db
 
 
+def create_user(client: TestClient, email: str) -> dict[str, str]:
+    """Create a user through the API and return its X-User-Id header."""
+    resp = client.post("/api/users", json={"email": email, "full_name": "Test User"})
+    assert resp.status_code == 201
+    return {"X-User-Id": str(resp.json()["id"])}
+
+
 @pytest.fixture(scope="session", autouse=True)
 def setup_test_db():
     if os.path.exists("ai_job_assistant_test.db"):
@@ -45,3 +55,52 @@ def setup_test_db():
 @pytest.fixture
 def client():
     return TestClient(app)
+
+
+@pytest.fixture(autouse=True)
+def disable_rate_limits(monkeypatch):
+    """
+    All TestClient requests share one client address, so rate limits are
+    switched off here and enabled explicitly in test_rate_limit.py.
+    """
+    monkeypatch.setattr(settings, "rate_limit_enabled", False)
+
+
+@pytest.fixture(autouse=True)
+def reset_metrics_cache():
+    """
+    Some tests write rows directly through TestingSessionLocal, which skips
+    the invalidation done by the API routes, so each test starts cold.
+    """
+    metrics_cache.reset()
+
+
+@pytest.fixture
+def assert_max_queries():
+    """
+    Context manager asserting an upper bound on SQL statements executed
+    against the test database, e.g.
+
+        with assert_max_queries(3):
+            client.get("/api/answers")
+    """
+
+    @contextmanager
+    def _assert_max_queries(limit: int):
+        statements: list[str] = []
+
+        def _record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(engine, "before_cursor_execute", _record)
+        try:
+            yield statements
+        finally:
+            event.remove(engine, "before_cursor_execute", _record)
+
+        assert len(statements) <= limit, (
+            f"expected at most {limit} queries, got {len(statements)}:\n"
+            + "\n".join(statements)
+        )
+
+    return _assert_max_queries
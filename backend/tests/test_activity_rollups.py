@@ -0,0 +1,129 @@
+import json
+
+from fastapi.testclient import TestClient
+
+from app.agents import job_assistant
+from app.services.activity_rollups import rebuild_activity_rollups
+from tests.conftest import TestingSessionLocal, create_user
+
+
+def _today_point(client: TestClient, headers: dict | None = None, **params) -> dict:
+    resp = client.get("/api/metrics/timeseries", headers=headers or {}, params=params)
+    assert resp.status_code == 200
+    return resp.json()["points"][-1]
+
+
+def test_writes_are_counted_per_user_and_globally(client: TestClient):
+    before = _today_point(client)
+    headers = create_user(client, "rollup_writes@example.com")
+    analysis_id = client.post(
+        "/api/resume/analyze",
+        headers=headers,
+        json={"resume_text": "Resume text used for activity rollup counts."},
+    ).json()["id"]
+    client.post(
+        "/api/resume/analyze",
+        headers=headers,
+        json={"resume_text": "Second resume text used for activity rollup counts."},
+    )
+    client.post(
+        "/api/generate/answer",
+        headers=headers,
+        json={"resume_analysis_id": analysis_id, "question": "Why rollups?"},
+    )
+
+    resp = client.get("/api/metrics/timeseries?scope=user", headers=headers)
+    data = resp.json()
+    assert data["bucket"] == "day"
+    assert data["user_id"] == int(headers["X-User-Id"])
+    assert len(data["points"]) == 31
+    assert sum(point["analyses"] for point in data["points"]) == 2
+    assert data["points"][-1] == {
+        "bucket_start": data["points"][-1]["bucket_start"],
+        "analyses": 2,
+        "answers": 1,
+        "users": 0,
+        "provider_fallbacks": 0,
+    }
+
+    hourly = _today_point(client, headers, bucket="hour", scope="user")
+    assert (hourly["analyses"], hourly["answers"]) == (2, 1)
+
+    after = _today_point(client)
+    assert after["users"] - before["users"] == 1
+    assert after["analyses"] - before["analyses"] == 2
+    assert after["answers"] - before["answers"] == 1
+
+
+def test_provider_fallbacks_are_counted(client: TestClient, monkeypatch):
+    monkeypatch.setattr(job_assistant.settings, "llm_provider", "openai")
+    monkeypatch.setattr(job_assistant.settings, "openai_api_key", None)
+    monkeypatch.setattr(job_assistant, "pool", None)
+    headers = create_user(client, "rollup_fallback@example.com")
+
+    resp = client.post(
+        "/api/resume/analyze",
+        headers=headers,
+        json={"resume_text": "Resume analyzed while OpenAI is not configured."},
+    )
+    assert resp.json()["provider"] == "stub"
+
+    assert _today_point(client, headers, scope="user")["provider_fallbacks"] == 1
+
+
+def test_timeseries_validation(client: TestClient):
+    resp = client.get("/api/metrics/timeseries?scope=user")
+    assert resp.status_code == 401
+
+    resp = client.get(
+        "/api/metrics/timeseries",
+        params={"bucket": "hour", "start": "2024-01-01T00:00:00Z", "end": "2024-03-01T00:00:00Z"},
+    )
+    assert resp.status_code == 400
+    assert resp.json()["detail"] == "Too many buckets; request at most 1000 points."
+
+    resp = client.get(
+        "/api/metrics/timeseries",
+        params={"start": "2024-02-01T00:00:00Z", "end": "2024-01-01T00:00:00Z"},
+    )
+    assert resp.status_code == 400
+
+
+def test_import_buckets_by_created_at_and_rebuild_matches(client: TestClient):
+    headers = create_user(client, "rollup_import@example.com")
+    records = [
+        {
+            "record_type": "resume_analysis",
+            "resume_text": f"Imported resume number {i} for rollups.",
+            "summary": "Imported.",
+            "created_at": created_at,
+        }
+        for i, created_at in enumerate(
+            ["2023-03-01T10:15:00Z", "2023-03-01T23:59:00Z", "2023-03-03T08:00:00+02:00"]
+        )
+    ]
+    body = "".join(json.dumps(record) + "\n" for record in records)
+    assert client.post("/api/import", headers=headers, content=body).status_code == 200
+
+    params = {"scope": "user", "start": "2023-03-01T00:00:00Z", "end": "2023-03-03T12:00:00Z"}
+    series = client.get("/api/metrics/timeseries", headers=headers, params=params).json()
+    assert [point["analyses"] for point in series["points"]] == [2, 0, 1]
+    assert series["points"][0]["bucket_start"] == "2023-03-01T00:00:00Z"
+
+    with TestingSessionLocal() as db:
+        assert rebuild_activity_rollups(db, batch_size=2) > 0
+    rebuilt = client.get("/api/metrics/timeseries", headers=headers, params=params).json()
+    assert rebuilt == series
+
+
+def test_purge_removes_user_rollups(client: TestClient):
+    headers = create_user(client, "rollup_purge@example.com")
+    client.post(
+        "/api/resume/analyze",
+        headers=headers,
+        json={"resume_text": "Resume that will be purged with its rollups."},
+    )
+    user_id = headers["X-User-Id"]
+    assert client.delete(f"/api/users/{user_id}/data", headers=headers).status_code == 200
+
+    assert _today_point(client, headers, scope="user")["analyses"] == 0
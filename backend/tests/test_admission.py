@@ -0,0 +1,60 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.admission import AdmissionController, admission
+from app.core.config import settings
+from app.core.runtime_metrics import runtime_metrics
+from tests.conftest import create_user
+
+
+@pytest.fixture
+def clear_admission():
+    admission.reset()
+    yield
+    admission.reset()
+
+
+def _shed(reason: str) -> float:
+    return runtime_metrics.snapshot()["counters"].get(f"admission.shed.{reason}", 0)
+
+
+def test_generation_is_shed_while_reads_are_served(client: TestClient, monkeypatch, clear_admission):
+    headers = create_user(client, "admission@example.com")
+    monkeypatch.setattr(settings, "admission_max_provider_calls", 1)
+    shed = _shed("provider_calls")
+
+    with admission.provider_call():
+        resp = client.post(
+            "/api/generate/answer", headers=headers, json={"question": "Why this team?"}
+        )
+        assert resp.status_code == 503
+        assert resp.json()["detail"] == "Server is busy. Try again shortly."
+        assert resp.headers["retry-after"] == "2"
+        assert client.get("/status").json()["admission"]["provider_calls"] == 1
+
+        assert client.get("/api/answers", headers=headers).status_code == 200
+        assert client.get("/status").status_code == 200
+
+    assert _shed("provider_calls") - shed == 1
+    waits = runtime_metrics.snapshot()["histograms"].get("admission.queue_wait", {}).get("count", 0)
+    resp = client.post("/api/generate/answer", headers=headers, json={"question": "Why this team?"})
+    assert resp.status_code == 201
+    # Admitted requests record how long they waited for a worker thread.
+    assert runtime_metrics.snapshot()["histograms"]["admission.queue_wait"]["count"] == waits + 1
+
+
+def test_recent_queue_wait_sheds_until_it_ages_out(client: TestClient, monkeypatch, clear_admission):
+    monkeypatch.setattr(settings, "admission_max_queue_wait_ms", 500)
+    shed = _shed("queue_wait")
+
+    admission.record_queue_wait(2000)
+    resp = client.post("/api/resume/analyze", json={"resume_text": "Resume sent during a spike."})
+    assert resp.status_code == 503
+    assert _shed("queue_wait") - shed == 1
+
+    controller = AdmissionController(window_seconds=5)
+    controller.record_queue_wait(2000, now=100)
+    controller.record_queue_wait(0, now=103)
+    assert controller.queue_wait_ms(now=104) == 1000
+    assert controller.queue_wait_ms(now=106) == 0
+    assert controller.queue_wait_ms(now=109) == 0.0
@@ -0,0 +1,107 @@
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+from openai import OpenAI
+
+from app.agents import job_assistant
+from app.agents.cassette import (
+    CassetteMiss,
+    CassetteRecord,
+    RecordingClient,
+    ReplayClient,
+    load_cassette,
+    request_key,
+)
+from app.agents.job_assistant import summarize_resume
+from app.agents.provider_pool import ProviderEndpoint, ProviderPool, build_pool
+from app.core.config import settings
+from app.core.runtime_metrics import runtime_metrics
+from benchmarks.bench_agent import run_benchmark, synthetic_corpus
+from benchmarks.fake_openai import FakeOpenAIConfig, create_fake_openai_app
+
+
+def test_recorded_calls_replay_offline(tmp_path, monkeypatch):
+    path = str(tmp_path / "agent.jsonl.gz")
+    fake_app = create_fake_openai_app(FakeOpenAIConfig(latency_ms=0, output_tokens=20, seed=1))
+    openai_client = OpenAI(
+        api_key="fake", base_url="http://testserver/v1", http_client=TestClient(fake_app)
+    )
+    recorder = RecordingClient(openai_client, path)
+    monkeypatch.setattr(
+        job_assistant,
+        "pool",
+        ProviderPool([ProviderEndpoint("fake", "fake", "gpt-4o-mini", client=recorder)]),
+    )
+    monkeypatch.setattr(settings, "llm_provider", "openai")
+    corpus = synthetic_corpus(resumes=2, questions=2)
+
+    recorded = run_benchmark(corpus)
+    assert recorded["provider_calls"] == 6
+    assert recorded["operations"]["answer"]["count"] == 4
+    records = load_cassette(path)
+    assert len(records) == 6
+    assert {record.prompt_cache_key for record in records} == {
+        "resume_summary.v2",
+        "interview_answer.v2",
+    }
+    assert all(len(record.text.split()) == 20 for record in records)
+    original_summary, _ = summarize_resume(corpus[0]["resume"])
+
+    monkeypatch.setattr(settings, "llm_cassette_mode", "replay")
+    monkeypatch.setattr(settings, "llm_cassette_path", path)
+    monkeypatch.setattr(job_assistant, "pool", build_pool(settings))
+
+    replayed = run_benchmark(corpus)
+    assert replayed["cassette"] == {"hits": 6, "misses": 0}
+    assert replayed["stub_responses"] == 0
+    assert replayed["tokens"] == recorded["tokens"]
+    assert summarize_resume(corpus[0]["resume"])[0] == original_summary
+
+    # A prompt that was never recorded falls back to the stub provider.
+    _, provider = summarize_resume("A resume that is not in the cassette.")
+    assert provider == "stub"
+
+
+def test_cassette_misses_are_not_endpoint_failures():
+    replay = ReplayClient([])
+    pool = ProviderPool(
+        [
+            ProviderEndpoint("a", "fake", "gpt-4o-mini", client=replay),
+            ProviderEndpoint("b", "fake", "gpt-4o-mini", client=replay),
+        ],
+        failure_threshold=1,
+    )
+    misses = runtime_metrics.snapshot()["counters"].get("cassette.misses", 0)
+
+    for _ in range(3):
+        with pytest.raises(CassetteMiss):
+            pool.call(lambda client, endpoint: client.responses.create(model="m", input="hi"))
+
+    # Not retried on the other endpoint, and neither endpoint is ejected.
+    assert runtime_metrics.snapshot()["counters"]["cassette.misses"] - misses == 3
+    assert all(endpoint["healthy"] for endpoint in pool.snapshot())
+
+
+def test_replay_reproduces_recorded_latency():
+    record = CassetteRecord(
+        key=request_key("hi"),
+        model="gpt-4o-mini",
+        prompt_cache_key=None,
+        input_chars=0,
+        text="recorded answer",
+        input_tokens=10,
+        output_tokens=2,
+        cached_tokens=0,
+        latency_ms=60.0,
+    )
+
+    for scale, minimum_ms in ((0.0, 0), (1.0, 60)):
+        client = ReplayClient([record], latency_scale=scale)
+        started = time.perf_counter()
+        response = client.responses.create(model="other-model", input="hi")
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        assert response.output[0].content[0].text == "recorded answer"
+        assert elapsed_ms >= minimum_ms
+        if scale == 0:
+            assert elapsed_ms < 60
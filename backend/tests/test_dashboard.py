@@ -0,0 +1,90 @@
+from fastapi.testclient import TestClient
+
+from tests.conftest import create_user
+
+
+def _analyze(client: TestClient, headers: dict[str, str], params: dict | None = None):
+    return client.post(
+        "/api/resume/analyze",
+        headers=headers,
+        params=params,
+        json={"resume_text": "Backend developer with Python, FastAPI and SQL."},
+    )
+
+
+def test_dashboard_requires_header_user(client: TestClient):
+    resp = client.get("/api/dashboard")
+    assert resp.status_code == 401
+    assert resp.json()["detail"] == "Authentication required to view the dashboard."
+
+
+def test_dashboard_returns_metrics_and_recent_items(client: TestClient):
+    headers = create_user(client, "dashboard_user@example.com")
+    other = create_user(client, "dashboard_other@example.com")
+    _analyze(client, other)
+
+    first_id = _analyze(client, headers).json()["id"]
+    second_id = _analyze(client, headers).json()["id"]
+    for i in range(3):
+        client.post(
+            "/api/generate/answer",
+            headers=headers,
+            json={"resume_analysis_id": first_id, "question": f"Dashboard question {i}?"},
+        )
+
+    resp = client.get(
+        "/api/dashboard",
+        headers=headers,
+        params={"resume_analysis_id": first_id, "limit": 2},
+    )
+    assert resp.status_code == 200
+    data = resp.json()
+
+    assert data["user_id"] == int(headers["X-User-Id"])
+    assert data["metrics"]["user_resume_analyses"] == 2
+    assert data["metrics"]["user_answers"] == 3
+    assert data["metrics"]["total_resume_analyses"] >= 3
+    # Most recent first, limited, and scoped to the header user.
+    assert [a["id"] for a in data["recent_analyses"]] == [second_id, first_id]
+    assert [a["question"] for a in data["recent_answers"]] == [
+        "Dashboard question 2?",
+        "Dashboard question 1?",
+    ]
+    assert data["resume_analysis_id"] == first_id
+    assert len(data["analysis_answers"]) == 2
+    assert all(a["resume_analysis_id"] == first_id for a in data["analysis_answers"])
+
+
+def test_post_endpoints_can_include_dashboard(client: TestClient):
+    headers = create_user(client, "dashboard_include@example.com")
+
+    plain = _analyze(client, headers)
+    assert plain.status_code == 201
+    assert "dashboard" not in plain.json()
+
+    resp = _analyze(client, headers, params={"include": "dashboard"})
+    assert resp.status_code == 201
+    analysis = resp.json()
+    assert analysis["dashboard"]["metrics"]["user_resume_analyses"] == 2
+    assert analysis["dashboard"]["recent_analyses"][0]["id"] == analysis["id"]
+    assert analysis["dashboard"]["resume_analysis_id"] == analysis["id"]
+
+    resp = client.post(
+        "/api/generate/answer",
+        headers=headers,
+        params={"include": "dashboard"},
+        json={"resume_analysis_id": analysis["id"], "question": "Why this team?"},
+    )
+    assert resp.status_code == 201
+    answer = resp.json()
+    assert answer["dashboard"]["metrics"]["user_answers"] == 1
+    assert answer["dashboard"]["analysis_answers"][0]["id"] == answer["id"]
+
+
+def test_include_dashboard_requires_a_user(client: TestClient):
+    resp = _analyze(client, {}, params={"include": "dashboard"})
+    assert resp.status_code == 400
+    assert resp.json()["detail"] == "include=dashboard requires a user."
+
+    resp = _analyze(client, {}, params={"include": "everything"})
+    assert resp.status_code == 422
@@ -0,0 +1,107 @@
+import csv
+import io
+import json
+import zlib
+
+from fastapi.testclient import TestClient
+
+from app.api.export import _iter_chunks
+
+
+def _create_user_with_data(client: TestClient, email: str) -> tuple[int, int]:
+    user_resp = client.post(
+        "/api/users",
+        json={"email": email, "full_name": "Export User"},
+    )
+    assert user_resp.status_code == 201
+    user_id = user_resp.json()["id"]
+
+    resume_resp = client.post(
+        "/api/resume/analyze",
+        headers={"X-User-Id": str(user_id)},
+        json={
+            "resume_text": (
+                "Backend engineer with Python, FastAPI and SQL. "
+                "Built data exports for reporting."
+            ),
+        },
+    )
+    assert resume_resp.status_code == 201
+    analysis_id = resume_resp.json()["id"]
+
+    for i in range(2):
+        answer_resp = client.post(
+            "/api/generate/answer",
+            headers={"X-User-Id": str(user_id)},
+            json={
+                "resume_analysis_id": analysis_id,
+                "question": f"Export question {i}?",
+                "job_title": "Backend Engineer",
+            },
+        )
+        assert answer_resp.status_code == 201
+
+    return user_id, analysis_id
+
+
+def test_export_requires_auth(client: TestClient):
+    resp = client.get("/api/export")
+    assert resp.status_code == 401
+    assert resp.json()["detail"] == "Authentication required to export data."
+
+
+def test_export_ndjson_scoped_to_header_user(client: TestClient):
+    user_id, analysis_id = _create_user_with_data(client, "export_ndjson@example.com")
+    _create_user_with_data(client, "export_other@example.com")
+
+    resp = client.get("/api/export", headers={"X-User-Id": str(user_id)})
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("application/x-ndjson")
+
+    records = [json.loads(line) for line in resp.text.splitlines()]
+    analyses = [r for r in records if r["record_type"] == "resume_analysis"]
+    answers = [r for r in records if r["record_type"] == "interview_answer"]
+
+    assert [a["id"] for a in analyses] == [analysis_id]
+    assert len(answers) == 2
+    assert all(r["user_id"] == user_id for r in records)
+    assert all(a["resume_analysis_id"] == analysis_id for a in answers)
+
+
+def test_export_csv(client: TestClient):
+    user_id, analysis_id = _create_user_with_data(client, "export_csv@example.com")
+
+    resp = client.get(
+        "/api/export?format=csv",
+        headers={"X-User-Id": str(user_id)},
+    )
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("text/csv")
+
+    rows = list(csv.DictReader(io.StringIO(resp.text)))
+    assert len(rows) == 3
+    assert rows[0]["record_type"] == "resume_analysis"
+    assert rows[0]["id"] == str(analysis_id)
+    assert {r["record_type"] for r in rows[1:]} == {"interview_answer"}
+
+
+def test_export_gzip(client: TestClient):
+    user_id, _ = _create_user_with_data(client, "export_gzip@example.com")
+
+    resp = client.get(
+        "/api/export?gzip=true",
+        headers={"X-User-Id": str(user_id)},
+    )
+    assert resp.status_code == 200
+    assert resp.headers["content-encoding"] == "gzip"
+
+    # httpx transparently decodes the gzip body.
+    assert len(resp.text.splitlines()) == 3
+
+
+def test_export_chunks_are_a_single_gzip_stream():
+    lines = [f"line {i}\n" * 50 for i in range(500)]
+    chunks = list(_iter_chunks(iter(lines), use_gzip=True))
+
+    assert len(chunks) > 1
+    assert zlib.decompress(b"".join(chunks), wbits=31).decode() == "".join(lines)
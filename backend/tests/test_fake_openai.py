@@ -0,0 +1,137 @@
+import pytest
+from fastapi.testclient import TestClient
+from openai import OpenAI
+
+from app.agents import job_assistant
+from app.agents.job_assistant import generate_interview_answer, summarize_resume
+from app.agents.provider_pool import ProviderEndpoint, ProviderPool
+from benchmarks.fake_openai import FakeOpenAIConfig, FakeOpenAIState, create_fake_openai_app
+
+
+def _openai_client(fake_app, **options) -> OpenAI:
+    return OpenAI(
+        api_key="fake-key",
+        base_url="http://testserver/v1",
+        http_client=TestClient(fake_app),
+        **options,
+    )
+
+
+@pytest.fixture
+def fake_app():
+    return create_fake_openai_app(FakeOpenAIConfig(latency_ms=0, output_tokens=12, seed=7))
+
+
+@pytest.fixture
+def use_fake_openai(monkeypatch, fake_app):
+    endpoint = ProviderEndpoint(
+        "fake", "fake-key", "gpt-4o-mini", client=_openai_client(fake_app, max_retries=0)
+    )
+    monkeypatch.setattr(job_assistant, "pool", ProviderPool([endpoint]))
+    monkeypatch.setattr(job_assistant.settings, "llm_provider", "openai")
+    monkeypatch.setattr(job_assistant.settings, "openai_api_key", "fake-key")
+    return fake_app
+
+
+def test_real_openai_code_paths_against_fake_server(use_fake_openai):
+    summary, provider = summarize_resume("Backend developer with five years of Python.")
+    assert provider == "openai"
+    assert len(summary.split()) == 12
+
+    answer, provider = generate_interview_answer(
+        question="Why do you want this job?",
+        job_title="Backend Engineer",
+        resume_summary=summary,
+    )
+    assert provider == "openai"
+    assert answer
+
+    stats = TestClient(use_fake_openai).get("/_fake/stats").json()
+    assert stats["status_200"] == 2
+    assert stats["output_tokens"] == 24
+
+
+def test_injected_429_has_rate_limit_headers_and_falls_back(use_fake_openai):
+    fake = TestClient(use_fake_openai)
+    fake.patch("/_fake/config", json={"error_rate_429": 1.0, "retry_after_seconds": 2})
+
+    resp = fake.post("/v1/responses", json={"model": "gpt-4o-mini", "input": "hi"})
+    assert resp.status_code == 429
+    assert resp.headers["retry-after"] == "2"
+    assert "x-ratelimit-remaining-requests" in resp.headers
+    assert resp.json()["error"]["code"] == "rate_limit_exceeded"
+
+    # The agent logs the provider error and falls back to the stub.
+    _, provider = summarize_resume("Backend developer with five years of Python.")
+    assert provider == "stub"
+
+
+def test_requests_per_minute_limit():
+    fake = TestClient(
+        create_fake_openai_app(FakeOpenAIConfig(latency_ms=0, requests_per_minute=2))
+    )
+    body = {"model": "gpt-4o-mini", "input": "hello"}
+
+    first = fake.post("/v1/responses", json=body)
+    second = fake.post("/v1/responses", json=body)
+    third = fake.post("/v1/responses", json=body)
+
+    assert [first.status_code, second.status_code, third.status_code] == [200, 200, 429]
+    assert first.headers["x-ratelimit-remaining-requests"] == "1"
+    assert int(third.headers["retry-after"]) >= 1
+
+
+def test_streaming_emits_deltas_and_usage(fake_app):
+    client = _openai_client(fake_app)
+    stream = client.responses.create(model="gpt-4o-mini", input="Tell me about you", stream=True)
+
+    deltas = []
+    completed = None
+    for event in stream:
+        if event.type == "response.output_text.delta":
+            deltas.append(event.delta)
+        elif event.type == "response.completed":
+            completed = event.response
+
+    assert len(deltas) == 12
+    assert completed.output_text == "".join(deltas)
+    assert completed.usage.output_tokens == 12
+    assert completed.usage.total_tokens == completed.usage.input_tokens + 12
+
+
+def test_latency_distribution_matches_configured_mean():
+    state = FakeOpenAIState(
+        FakeOpenAIConfig(latency_ms=400, latency_jitter_ms=200, distribution="lognormal", seed=1)
+    )
+    samples = [state.sample_latency_ms() for _ in range(4000)]
+
+    assert min(samples) > 0
+    assert 380 <= sum(samples) / len(samples) <= 420
+
+
+def test_config_update_rejects_invalid_values(fake_app):
+    fake = TestClient(fake_app)
+
+    assert fake.patch("/_fake/config", json={"distribution": "bimodal"}).status_code == 400
+    assert fake.patch("/_fake/config", json={"unknown": 1}).status_code == 400
+    resp = fake.patch("/_fake/config", json={"tokens_per_second": 500})
+    assert resp.status_code == 200
+    assert resp.json()["tokens_per_second"] == 500
+
+
+def test_repeated_prompt_prefixes_are_reported_as_cached(fake_app):
+    fake = TestClient(fake_app)
+    instructions = "Static instructions. " * 250  # about 1300 tokens
+
+    def cached_tokens(prompt: str, key: str = "template.v1") -> int:
+        body = {"model": "gpt-4o-mini", "input": prompt, "prompt_cache_key": key}
+        usage = fake.post("/v1/responses", json=body).json()["usage"]
+        return usage["input_tokens_details"]["cached_tokens"]
+
+    assert cached_tokens(instructions + "First question?") == 0
+    # The shared prefix is cached in 128-token steps from 1024 tokens.
+    assert cached_tokens(instructions + "Second question?") == 1280
+    assert cached_tokens(instructions + "Third question?", key="other.v1") == 0
+    # Short prompts are never cached.
+    assert cached_tokens("hi") == cached_tokens("hi") == 0
+    assert fake.get("/_fake/stats").json()["cached_tokens"] == 1280
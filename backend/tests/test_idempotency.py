@@ -0,0 +1,206 @@
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import func, select
+
+from app.api import answers, resume
+from app.core.config import load_settings, settings
+from app.core.runtime_metrics import runtime_metrics
+from app.models import IdempotencyKey
+from app.services.idempotency import purge_expired_keys
+from tests.conftest import TestingSessionLocal, create_user
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def _counting(monkeypatch, module, name: str) -> list:
+    calls = []
+    original = getattr(module, name)
+
+    def wrapper(*args, **kwargs):
+        calls.append(args)
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(module, name, wrapper)
+    return calls
+
+
+def test_retries_replay_the_stored_response(client: TestClient, monkeypatch):
+    calls = _counting(monkeypatch, resume, "summarize_resume")
+    headers = create_user(client, "idempotent_replay@example.com")
+    body = {"resume_text": "Resume sent twice by a client on a flaky network."}
+
+    first = client.post(
+        "/api/resume/analyze", headers={**headers, "Idempotency-Key": "retry-1"}, json=body
+    )
+    retry = client.post(
+        "/api/resume/analyze", headers={**headers, "Idempotency-Key": "retry-1"}, json=body
+    )
+    assert first.status_code == retry.status_code == 201
+    assert retry.content == first.content
+    assert retry.headers["Idempotent-Replayed"] == "true"
+    assert "Idempotent-Replayed" not in first.headers
+    assert len(calls) == 1
+
+    # The key is scoped to the header user.
+    other = create_user(client, "idempotent_replay_other@example.com")
+    resp = client.post(
+        "/api/resume/analyze", headers={**other, "Idempotency-Key": "retry-1"}, json=body
+    )
+    assert resp.json()["id"] != first.json()["id"]
+    assert len(calls) == 2
+
+    resp = client.post(
+        "/api/resume/analyze",
+        headers={**headers, "Idempotency-Key": "retry-1"},
+        json={"resume_text": "A different resume sent with the same key."},
+    )
+    assert resp.status_code == 422
+    assert resp.json()["detail"] == "Idempotency-Key was already used with a different request."
+
+
+def test_concurrent_duplicates_wait_for_the_first_request(client: TestClient, monkeypatch):
+    headers = {
+        **create_user(client, "idempotent_concurrent@example.com"),
+        "Idempotency-Key": "concurrent-1",
+    }
+    started, release = threading.Event(), threading.Event()
+    calls = []
+    original = answers.generate_interview_answer
+
+    def slow_answer(**kwargs):
+        calls.append(kwargs)
+        started.set()
+        release.wait(5)
+        return original(**kwargs)
+
+    monkeypatch.setattr(answers, "generate_interview_answer", slow_answer)
+    body = {"question": "Tell me about a hard bug you fixed."}
+    responses = []
+
+    def post():
+        responses.append(client.post("/api/generate/answer", headers=headers, json=body))
+
+    first = threading.Thread(target=post)
+    first.start()
+    assert started.wait(5)
+    waits = runtime_metrics.snapshot()["counters"].get("idempotency.waits", 0)
+    duplicate = threading.Thread(target=post)
+    duplicate.start()
+    for _ in range(100):
+        if runtime_metrics.snapshot()["counters"].get("idempotency.waits", 0) > waits:
+            break
+        threading.Event().wait(0.02)
+    assert runtime_metrics.snapshot()["counters"]["idempotency.waits"] > waits
+    release.set()
+    first.join(5)
+    duplicate.join(5)
+
+    assert len(calls) == 1
+    assert [resp.status_code for resp in responses] == [201, 201]
+    assert responses[0].json() == responses[1].json()
+
+
+def test_duplicates_of_a_slow_request_wait_the_configured_time(
+    client: TestClient, monkeypatch
+):
+    headers = {
+        **create_user(client, "idempotent_slow@example.com"),
+        "Idempotency-Key": "slow-1",
+    }
+    started, release = threading.Event(), threading.Event()
+    original = answers.generate_interview_answer
+
+    def slow_answer(**kwargs):
+        started.set()
+        release.wait(5)
+        return original(**kwargs)
+
+    monkeypatch.setattr(answers, "generate_interview_answer", slow_answer)
+    monkeypatch.setattr(settings, "idempotency_wait_seconds", 0.5)
+    body = {"question": "What are you proudest of?"}
+    first = threading.Thread(
+        target=lambda: client.post("/api/generate/answer", headers=headers, json=body)
+    )
+    first.start()
+    try:
+        assert started.wait(5)
+        began = time.monotonic()
+        resp = client.post("/api/generate/answer", headers=headers, json=body)
+        elapsed = time.monotonic() - began
+    finally:
+        release.set()
+        first.join(5)
+
+    assert resp.status_code == 409
+    assert resp.headers["Retry-After"] == "1"
+    assert 0.5 <= elapsed < 3
+
+
+def test_idempotency_wait_is_validated(monkeypatch):
+    monkeypatch.setenv("IDEMPOTENCY_WAIT_SECONDS", "60")
+    with pytest.raises(ValueError, match="IDEMPOTENCY_WAIT_SECONDS"):
+        load_settings()
+
+    monkeypatch.setenv("IDEMPOTENCY_WAIT_SECONDS", "5")
+    assert load_settings().idempotency_wait_seconds == 5
+
+
+def test_failed_requests_release_the_key(client: TestClient):
+    headers = {
+        **create_user(client, "idempotent_failure@example.com"),
+        "Idempotency-Key": "failure-1",
+    }
+    resp = client.post(
+        "/api/generate/answer",
+        headers=headers,
+        json={"resume_analysis_id": 999999, "question": "Why do you want this job?"},
+    )
+    assert resp.status_code == 404
+
+    with TestingSessionLocal() as db:
+        assert db.scalar(select(func.count()).where(IdempotencyKey.key == "failure-1")) == 0
+
+    resp = client.post(
+        "/api/resume/analyze",
+        headers={"Idempotency-Key": "x" * 256},
+        json={"resume_text": "Resume sent with an idempotency key that is too long."},
+    )
+    assert resp.status_code == 422
+
+
+def test_expired_keys_run_again_and_are_purged(client: TestClient):
+    headers = {
+        **create_user(client, "idempotent_expired@example.com"),
+        "Idempotency-Key": "expired-1",
+    }
+    body = {"resume_text": "Resume retried after its idempotency key expired."}
+    first_id = client.post("/api/resume/analyze", headers=headers, json=body).json()["id"]
+
+    with TestingSessionLocal() as db:
+        key = db.scalars(select(IdempotencyKey).where(IdempotencyKey.key == "expired-1")).one()
+        key.expires_at = _utcnow() - timedelta(seconds=1)
+        db.commit()
+
+    resp = client.post("/api/resume/analyze", headers=headers, json=body)
+    assert resp.status_code == 201
+    assert resp.json()["id"] != first_id
+    assert "Idempotent-Replayed" not in resp.headers
+
+    with TestingSessionLocal() as db:
+        db.add(
+            IdempotencyKey(
+                user_id=0,
+                endpoint="resume.analyze",
+                key="abandoned",
+                request_hash="0" * 64,
+                expires_at=_utcnow() - timedelta(minutes=5),
+            )
+        )
+        db.commit()
+        assert purge_expired_keys(db) == 1
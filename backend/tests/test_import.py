@@ -0,0 +1,246 @@
+import json
+
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+
+from app.models import ResumeAnalysis
+from app.services import bulk_import
+from app.services.bulk_import import (
+    NDJSONImporter,
+    NDJSONLineSplitter,
+    backfill_pending_summaries,
+)
+from tests.conftest import TestingSessionLocal, create_user
+
+
+def _ndjson(records: list[dict]) -> str:
+    return "".join(json.dumps(r) + "\n" for r in records)
+
+
+def test_import_requires_auth(client: TestClient):
+    resp = client.post("/api/import", content=b"")
+    assert resp.status_code == 401
+    assert resp.json()["detail"] == "Authentication required to import data."
+
+
+def test_import_inserts_records_and_reports_line_errors(client: TestClient):
+    user_id = int(create_user(client, "import_basic@example.com")["X-User-Id"])
+    other_id = int(create_user(client, "import_other@example.com")["X-User-Id"])
+
+    body = _ndjson(
+        [
+            {
+                "record_type": "resume_analysis",
+                "id": 900001,
+                "resume_text": "Imported resume for a data engineer with Spark and SQL.",
+                "summary": "Data engineer.",
+            },
+            {
+                "record_type": "interview_answer",
+                "resume_analysis_id": 900001,
+                "question": "Why data engineering?",
+                "answer": "I enjoy building pipelines.",
+            },
+            {"record_type": "interview_answer", "question": "Too short answer"},
+            {
+                "record_type": "resume_analysis",
+                "user_id": other_id,
+                "resume_text": "Resume that belongs to somebody else entirely.",
+            },
+        ]
+    ) + "not json\n"
+
+    resp = client.post(
+        "/api/import?chunk_size=2",
+        headers={"X-User-Id": str(user_id)},
+        content=body.encode(),
+    )
+    assert resp.status_code == 200
+    report = resp.json()
+    assert report["lines_read"] == 5
+    assert report["resume_analyses_imported"] == 1
+    assert report["answers_imported"] == 1
+    assert report["failed_lines"] == 3
+    assert [e["line"] for e in report["errors"]] == [3, 4, 5]
+
+    # The client's id is not used; the answer follows its analysis to the new one.
+    [analysis] = client.get("/api/resume", headers={"X-User-Id": str(user_id)}).json()
+    assert analysis["id"] != 900001
+    assert analysis["user_id"] == user_id
+    assert analysis["summary"] == "Data engineer."
+
+    answers = client.get(f"/api/resume/{analysis['id']}/answers").json()
+    assert len(answers) == 1
+    assert answers[0]["user_id"] == user_id
+
+
+def test_import_ignores_client_ids_and_remaps_references(client: TestClient):
+    owner_id = int(create_user(client, "import_owner@example.com")["X-User-Id"])
+    taken = client.post(
+        "/api/resume/analyze",
+        headers={"X-User-Id": str(owner_id)},
+        json={"resume_text": "An existing resume whose id the import reuses."},
+    ).json()["id"]
+    user_id = int(create_user(client, "import_remap@example.com")["X-User-Id"])
+
+    body = _ndjson(
+        [
+            {
+                "record_type": "interview_answer",
+                "resume_analysis_id": taken,
+                "question": "Answer before its analysis?",
+                "answer": "Rejected.",
+            },
+            {
+                "record_type": "resume_analysis",
+                "id": taken + 1,
+                "resume_text": "Imported resume that asks for the next free id.",
+                "summary": "First.",
+            },
+            {
+                "record_type": "resume_analysis",
+                "id": taken,
+                "resume_text": "Imported resume that asks for an id already in use.",
+                "summary": "Second.",
+            },
+            {
+                "record_type": "interview_answer",
+                "id": 1,
+                "resume_analysis_id": taken,
+                "question": "Which resume is this for?",
+                "answer": "The second imported one.",
+            },
+            {
+                "record_type": "resume_analysis",
+                "id": taken,
+                "resume_text": "Imported resume repeating an id from earlier in the file.",
+            },
+        ]
+    )
+    resp = client.post(
+        "/api/import?chunk_size=2",
+        headers={"X-User-Id": str(user_id)},
+        content=body.encode(),
+    )
+    report = resp.json()
+    assert report["resume_analyses_imported"] == 2
+    assert report["answers_imported"] == 1
+    assert [(e["line"], e["error"]) for e in report["errors"]] == [
+        (1, "resume_analysis_id is not an analysis imported earlier in the file"),
+        (5, "id is repeated in the file"),
+    ]
+
+    assert client.get(f"/api/resume/{taken}").json()["user_id"] == owner_id
+    imported = client.get("/api/resume", headers={"X-User-Id": str(user_id)}).json()
+    assert taken not in {analysis["id"] for analysis in imported}
+    second = next(analysis for analysis in imported if analysis["summary"] == "Second.")
+    [answer] = client.get(f"/api/resume/{second['id']}/answers").json()
+    assert answer["question"] == "Which resume is this for?"
+    assert answer["id"] != 1
+
+
+def test_import_chunk_with_duplicate_id_falls_back_to_row_inserts(client: TestClient):
+    user_id = int(create_user(client, "import_dupes@example.com")["X-User-Id"])
+
+    body = _ndjson(
+        [
+            {
+                "record_type": "resume_analysis",
+                "id": 900101,
+                "resume_text": "First imported resume with a fixed identifier.",
+                "summary": "First.",
+            },
+            {
+                "record_type": "resume_analysis",
+                "id": 900101,
+                "resume_text": "Second imported resume reusing the same identifier.",
+                "summary": "Second.",
+            },
+            {
+                "record_type": "resume_analysis",
+                "resume_text": "Third imported resume without an identifier.",
+                "summary": "Third.",
+            },
+        ]
+    )
+
+    # Explicit ids are only kept by the CLI's trusted restore.
+    with TestingSessionLocal() as db:
+        importer = NDJSONImporter(db, user_id=user_id, keep_ids=True)
+        importer.feed_lines(body.splitlines())
+        report = importer.finish()
+
+    assert report.resume_analyses_imported == 2
+    assert report.failed_lines == 1
+    assert report.errors[0].line == 2
+    assert client.get("/api/resume/900101").json()["summary"] == "First."
+
+
+def test_import_deferred_summaries_are_backfilled(client: TestClient):
+    user_id = int(create_user(client, "import_deferred@example.com")["X-User-Id"])
+
+    body = _ndjson(
+        [
+            {
+                "record_type": "resume_analysis",
+                "id": 900201,
+                "resume_text": "Deferred resume text for a backend developer using Go.",
+            },
+        ]
+    )
+
+    resp = client.post(
+        "/api/import?defer_summaries=true",
+        headers={"X-User-Id": str(user_id)},
+        content=body.encode(),
+    )
+    assert resp.status_code == 200
+    assert resp.json()["summaries_pending"] == 1
+
+    # TestClient runs background tasks before returning the response.
+    [analysis] = client.get("/api/resume", headers={"X-User-Id": str(user_id)}).json()
+    assert analysis["summary"].startswith("Basic analysis only.")
+
+
+def test_backfill_claims_only_the_given_rows_once(client: TestClient, monkeypatch):
+    user_id = int(create_user(client, "import_claims@example.com")["X-User-Id"])
+
+    def deferred_import(texts: list[str]) -> list[int]:
+        body = _ndjson([{"record_type": "resume_analysis", "resume_text": t} for t in texts])
+        with TestingSessionLocal() as db:
+            importer = NDJSONImporter(db, user_id=user_id, defer_summaries=True)
+            importer.feed_lines(body.splitlines())
+            importer.finish()
+        return importer.pending_ids
+
+    ids = deferred_import(["Claimed resume one for Go.", "Claimed resume two for Go."])
+    [other_id] = deferred_import(["Resume from another import."])
+
+    summarized = []
+
+    def summarize(resume_text, parsed):
+        summarized.append(resume_text)
+        if len(summarized) == 1:
+            # An overlapping backfill over the same rows skips the claimed one.
+            with TestingSessionLocal() as other:
+                assert backfill_pending_summaries(other, analysis_ids=ids) == 1
+        return "Summary.", None
+
+    monkeypatch.setattr(bulk_import, "summarize_resume", summarize)
+    with TestingSessionLocal() as db:
+        assert backfill_pending_summaries(db, analysis_ids=ids) == 1
+        pending = db.execute(
+            select(ResumeAnalysis.id).where(ResumeAnalysis.summary_pending.is_(True))
+        ).scalars().all()
+
+    assert len(summarized) == 2
+    assert other_id in pending and not set(ids) & set(pending)
+
+
+def test_line_splitter_handles_partial_chunks():
+    splitter = NDJSONLineSplitter()
+
+    assert splitter.feed(b'{"a": 1}\n{"b"') == [b'{"a": 1}']
+    assert splitter.feed(b": 2}\n") == [b'{"b": 2}']
+    assert splitter.feed(b'{"c": 3}') == []
+    assert splitter.close() == [b'{"c": 3}']
@@ -0,0 +1,156 @@
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+from app.agents import job_assistant
+from app.agents.job_assistant import _chunk_resume, generate_interview_answer, summarize_resume
+from app.agents.prompts import INTERVIEW_ANSWER, RESUME_SUMMARY_REDUCE
+from app.agents.provider_pool import ProviderEndpoint, ProviderPool
+from app.core.request_context import RequestContext, reset_request_context, set_request_context
+from app.core.runtime_metrics import runtime_metrics
+from app.services.resume_parser import parse_resume
+
+
+class FakeResponses:
+    def __init__(self) -> None:
+        self.prompts: list[str] = []
+        self.cache_keys: list[str] = []
+        self._lock = threading.Lock()
+
+    def create(self, model: str, input: str, prompt_cache_key: str):
+        with self._lock:
+            self.prompts.append(input)
+            self.cache_keys.append(prompt_cache_key)
+            number = len(self.prompts)
+        text = f"fake output {number}"
+        return SimpleNamespace(
+            output=[SimpleNamespace(content=[SimpleNamespace(text=text)])],
+            usage=SimpleNamespace(
+                input_tokens=2000,
+                output_tokens=10,
+                input_tokens_details=SimpleNamespace(cached_tokens=1024),
+            ),
+        )
+
+
+def _single_endpoint_pool(responses: FakeResponses) -> ProviderPool:
+    client = SimpleNamespace(responses=responses)
+    return ProviderPool([ProviderEndpoint("fake", "test-key", "gpt-4o-mini", client=client)])
+
+
+@pytest.fixture
+def fake_openai(monkeypatch):
+    responses = FakeResponses()
+    monkeypatch.setattr(job_assistant, "pool", _single_endpoint_pool(responses))
+    monkeypatch.setattr(job_assistant.settings, "llm_provider", "openai")
+    monkeypatch.setattr(job_assistant.settings, "openai_api_key", "test-key")
+    monkeypatch.setattr(job_assistant.settings, "summary_map_reduce_threshold_chars", 500)
+    monkeypatch.setattr(job_assistant.settings, "summary_chunk_chars", 200)
+    monkeypatch.setattr(job_assistant.settings, "summary_map_concurrency", 2)
+    return responses
+
+
+def _long_resume() -> str:
+    sections = []
+    for heading in ("EXPERIENCE", "Education", "Skills", "PUBLICATIONS"):
+        body = "\n".join(f"{heading} detail line {i} with some words." for i in range(4))
+        sections.append(f"{heading}\n{body}")
+    return "\n\n".join(sections)
+
+
+def test_chunk_resume_keeps_sections_together_and_respects_size():
+    resume = _long_resume()
+    chunks = _chunk_resume(resume, 200)
+
+    assert all(len(chunk) <= 200 for chunk in chunks)
+    # Every section fits in one chunk, so each chunk starts at a heading.
+    assert [chunk.splitlines()[0] for chunk in chunks] == [
+        "EXPERIENCE",
+        "Education",
+        "Skills",
+        "PUBLICATIONS",
+    ]
+
+
+def test_chunk_resume_splits_oversized_sections():
+    resume = "EXPERIENCE\n" + ("x" * 450)
+    chunks = _chunk_resume(resume, 200)
+
+    assert all(len(chunk) <= 200 for chunk in chunks)
+    assert "".join(chunks).replace("\n", "") == resume.replace("\n", "")
+
+
+def test_short_resume_uses_single_prompt(fake_openai):
+    summary, provider = summarize_resume("Short resume for a backend developer.")
+
+    assert provider == "openai"
+    assert summary == "fake output 1"
+    assert len(fake_openai.prompts) == 1
+
+
+def test_long_resume_uses_map_reduce(fake_openai):
+    resume = _long_resume()
+    assert len(resume) > 500
+    before = runtime_metrics.snapshot()["histograms"]
+    context = RequestContext(request_id="map-reduce")
+    token = set_request_context(context)
+    try:
+        summary, provider = summarize_resume(resume)
+    finally:
+        reset_request_context(token)
+
+    assert provider == "openai"
+    chunk_count = len(_chunk_resume(resume, 200))
+    # One prompt per chunk plus the reduce prompt.
+    assert len(fake_openai.prompts) == chunk_count + 1
+    assert fake_openai.prompts[-1].startswith(RESUME_SUMMARY_REDUCE.instructions)
+    assert fake_openai.cache_keys[-1] == "resume_summary_reduce.v2"
+    assert summary == f"fake output {chunk_count + 1}"
+
+    # Stage timings reach the runtime histograms and Server-Timing.
+    histograms = runtime_metrics.snapshot()["histograms"]
+    for stage in ("split", "map", "reduce"):
+        name = f"summary.{stage}"
+        assert histograms[name]["count"] - before.get(name, {"count": 0})["count"] == 1
+        assert f"summary_{stage}" in context.timings
+
+
+def test_parsed_resume_replaces_skills_section_in_prompt(fake_openai):
+    resume = (
+        "Sam Lee\nsam@example.com\n\nEXPERIENCE\nBackend Engineer (2018 - 2022)\n"
+        "- Built APIs in Python.\n\nSKILLS\n- Python\n- Kubernetes\n- Terraform\n"
+    )
+    parsed = parse_resume(resume)
+
+    summarize_resume(resume, parsed)
+
+    prompt = fake_openai.prompts[0]
+    assert "EXTRACTED FACTS:\nYears of experience: about 4\nSkills: Python, Kubernetes, Terraform" in prompt
+    assert "- Terraform" not in prompt
+    assert "sam@example.com" not in prompt
+    assert "EXPERIENCE\nBackend Engineer (2018 - 2022)\nBuilt APIs in Python." in prompt
+
+
+def test_answer_prompt_puts_the_static_instructions_first(fake_openai):
+    before = runtime_metrics.snapshot()["counters"]
+    for question in ("Why this company?", "Tell me about a hard bug."):
+        generate_interview_answer(
+            question=question,
+            job_title="Backend Engineer",
+            company_name="Acme",
+            resume_summary="Five years of Python APIs.",
+        )
+
+    first, second = fake_openai.prompts
+    assert first.startswith(INTERVIEW_ANSWER.instructions)
+    # Everything up to the question is shared by both prompts.
+    shared = first[: first.index("Interview question:")]
+    assert second.startswith(shared)
+    assert shared.index("<SUMMARY_START>") < shared.index("Target role: Backend Engineer.")
+    assert fake_openai.cache_keys == ["interview_answer.v2", "interview_answer.v2"]
+
+    counters = runtime_metrics.snapshot()["counters"]
+    cached = "prompt.interview_answer.v2.cached_tokens"
+    assert counters[cached] - before.get(cached, 0) == 2048
+    assert counters["provider.cached_tokens"] - before.get("provider.cached_tokens", 0) == 2048
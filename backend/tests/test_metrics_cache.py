@@ -0,0 +1,85 @@
+import threading
+
+from fastapi.testclient import TestClient
+
+from app.models import User
+from app.services.metrics_cache import StaleWhileRevalidateCache
+from tests.conftest import TestingSessionLocal, create_user, engine
+
+
+def _summary(client: TestClient, headers: dict | None = None) -> dict:
+    resp = client.get("/api/metrics/summary", headers=headers or {})
+    assert resp.status_code == 200
+    return resp.json()
+
+
+def test_summary_is_cached_until_a_write_invalidates_it(client: TestClient, assert_max_queries):
+    headers = create_user(client, "metrics_cache@example.com")
+    first = _summary(client, headers)
+
+    # Written behind the API's back: the cached totals are still served.
+    with TestingSessionLocal() as db:
+        db.add(User(email="metrics_cache_direct@example.com", full_name="Direct"))
+        db.commit()
+    # Only the header user lookup; both parts come from the cache.
+    with assert_max_queries(1):
+        assert _summary(client, headers) == first
+
+    client.post(
+        "/api/resume/analyze",
+        headers=headers,
+        json={"resume_text": "Resume written through the API to invalidate the cache."},
+    )
+    after = _summary(client, headers)
+    assert after["total_users"] == first["total_users"] + 1
+    assert after["total_resume_analyses"] == first["total_resume_analyses"] + 1
+    assert after["user_resume_analyses"] == first["user_resume_analyses"] + 1
+
+    # Another user's write refreshes the totals but not this user's entry.
+    other = create_user(client, "metrics_cache_other@example.com")
+    with assert_max_queries(2):
+        other_summary = _summary(client, other)
+    assert other_summary["total_users"] == after["total_users"] + 1
+    assert other_summary["user_resume_analyses"] == 0
+    with assert_max_queries(1):
+        assert _summary(client, headers)["user_resume_analyses"] == after["user_resume_analyses"]
+
+
+def test_stale_entries_are_served_while_one_refresh_runs():
+    cache = StaleWhileRevalidateCache(ttl_seconds=5, stale_seconds=60, max_entries=10)
+    assert cache.store("key", {"count": 1}, cache.generation("key"), now=100)
+
+    assert cache.lookup("key", now=104) == ({"count": 1}, False)
+    assert cache.lookup("key", now=110) == ({"count": 1}, True)
+    assert cache.lookup("key", now=166) == (None, False)
+
+    release = threading.Event()
+    calls = []
+
+    def load(db):
+        calls.append(db)
+        release.wait(5)
+        return {"count": 2}
+
+    refresh = cache.revalidate("key", engine, load)
+    # A second stale read does not start another refresh.
+    assert cache.revalidate("key", engine, load) is None
+    release.set()
+    refresh.result(timeout=5)
+
+    assert len(calls) == 1
+    assert cache.lookup("key")[0] == {"count": 2}
+
+
+def test_invalidation_discards_loads_already_in_flight():
+    cache = StaleWhileRevalidateCache(ttl_seconds=5, stale_seconds=60, max_entries=2)
+    generation = cache.generation("key")
+    cache.invalidate("key")
+    assert not cache.store("key", {"count": 1}, generation)
+    assert cache.lookup("key") == (None, False)
+
+    assert cache.store("key", {"count": 2}, cache.generation("key"))
+    cache.store("b", {}, 0)
+    cache.store("c", {}, 0)
+    assert len(cache) == 2
+    assert cache.lookup("key") == (None, False)
@@ -0,0 +1,95 @@
+import json
+import random
+
+from fastapi.testclient import TestClient
+from sqlalchemy import delete, func, select
+
+from app.api import resume
+from app.models import ResumeFingerprint
+from app.services.near_duplicates import rebuild_fingerprints
+from app.services.simhash import BAND_COUNT, hamming_distance, simhash
+from benchmarks.bench_resume_parser import make_resume
+from benchmarks.bench_simhash import edit_one_word, reference_simhash
+from tests.conftest import TestingSessionLocal, create_user
+
+
+def _analyze(client: TestClient, headers: dict, resume_text: str, **extra) -> dict:
+    resp = client.post(
+        "/api/resume/analyze", headers=headers, json={"resume_text": resume_text, **extra}
+    )
+    assert resp.status_code == 201
+    return resp.json()
+
+
+def _count_summaries(monkeypatch) -> list[str]:
+    calls: list[str] = []
+    summarize = resume.summarize_resume
+
+    def counting(resume_text, parsed=None):
+        calls.append(resume_text)
+        return summarize(resume_text, parsed)
+
+    monkeypatch.setattr(resume, "summarize_resume", counting)
+    return calls
+
+
+def test_bit_sliced_simhash_matches_reference():
+    rng = random.Random(3)
+    texts = [make_resume(rng) for _ in range(20)] + ["", "one", "two words", "a b c d"]
+    for text in texts:
+        assert simhash(text) == reference_simhash(text)
+
+    text = make_resume(rng)
+    assert hamming_distance(simhash(text), simhash(edit_one_word(text, rng))) < BAND_COUNT
+
+
+def test_near_duplicate_resume_reuses_summary(client: TestClient, monkeypatch):
+    headers = create_user(client, "near_duplicate@example.com")
+    other = create_user(client, "near_duplicate_other@example.com")
+    calls = _count_summaries(monkeypatch)
+    text = make_resume(random.Random(7))
+
+    first = _analyze(client, headers, text)
+    assert first["reused_from_id"] is None
+    edited = _analyze(client, headers, text.replace("Company 0", "Company Zero"))
+    assert edited["reused_from_id"] == first["id"]
+    assert edited["provider"] == "reused"
+    assert edited["summary"] == first["summary"]
+    assert len(calls) == 1
+
+    # Opting out, another user's resumes and a different resume all summarize.
+    opted_out = _analyze(client, headers, text, reuse_similar_summary=False)
+    assert opted_out["reused_from_id"] is None
+    assert _analyze(client, other, text)["reused_from_id"] is None
+    assert _analyze(client, headers, make_resume(random.Random(8)))["reused_from_id"] is None
+    assert len(calls) == 4
+
+    # Stored analyses do not report where their summary came from.
+    assert client.get(f"/api/resume/{edited['id']}").json()["reused_from_id"] is None
+
+    client.delete(f"/api/resume/{first['id']}", headers=headers)
+    client.delete(f"/api/resume/{edited['id']}", headers=headers)
+    assert _analyze(client, headers, text)["reused_from_id"] == opted_out["id"]
+
+
+def test_import_and_rebuild_maintain_fingerprints(client: TestClient):
+    headers = create_user(client, "near_duplicate_import@example.com")
+    user_id = int(headers["X-User-Id"])
+    text = make_resume(random.Random(11))
+    body = json.dumps({"record_type": "resume_analysis", "resume_text": text})
+    assert client.post("/api/import", headers=headers, content=body + "\n").status_code == 200
+
+    def band_rows() -> int:
+        with TestingSessionLocal() as db:
+            return db.scalar(
+                select(func.count()).where(ResumeFingerprint.user_id == user_id)
+            )
+
+    assert band_rows() == BAND_COUNT
+    with TestingSessionLocal() as db:
+        db.execute(delete(ResumeFingerprint).where(ResumeFingerprint.user_id == user_id))
+        db.commit()
+        assert rebuild_fingerprints(db, batch_size=2) >= 1
+    assert band_rows() == BAND_COUNT
+
+    assert _analyze(client, headers, text + "\nReferences on request.\n")["reused_from_id"]
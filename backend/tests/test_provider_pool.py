@@ -0,0 +1,234 @@
+import random
+import threading
+import time
+from collections import Counter
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+from openai import (
+    AuthenticationError,
+    BadRequestError,
+    NotFoundError,
+    OpenAI,
+    PermissionDeniedError,
+    UnprocessableEntityError,
+)
+
+from app.agents import job_assistant
+from app.agents.job_assistant import summarize_resume
+from app.agents.provider_pool import ProviderEndpoint, ProviderPool, build_pool
+from app.core.config import settings
+from app.core.runtime_metrics import runtime_metrics
+from benchmarks.fake_openai import FakeOpenAIConfig, create_fake_openai_app
+
+
+def _fake_endpoint(name: str, weight: float = 1.0, **config) -> tuple[ProviderEndpoint, TestClient]:
+    fake_app = create_fake_openai_app(FakeOpenAIConfig(latency_ms=0, seed=3, **config))
+    fake = TestClient(fake_app)
+    client = OpenAI(
+        api_key="fake", base_url="http://testserver/v1", http_client=fake, max_retries=0
+    )
+    return ProviderEndpoint(name, "fake", "gpt-4o-mini", weight=weight, client=client), fake
+
+
+def test_failing_endpoint_fails_over_and_is_ejected(client: TestClient, monkeypatch):
+    broken, broken_fake = _fake_endpoint("broken", weight=1000, error_rate_5xx=1.0)
+    healthy, healthy_fake = _fake_endpoint("healthy")
+    pool = ProviderPool(
+        [broken, healthy], failure_threshold=2, cooldown_seconds=60, rng=random.Random(1)
+    )
+    monkeypatch.setattr(job_assistant, "pool", pool)
+    monkeypatch.setattr(settings, "llm_provider", "openai")
+    failovers = runtime_metrics.snapshot()["counters"].get("provider.failovers", 0)
+
+    for _ in range(3):
+        _, provider = summarize_resume("Backend developer with five years of Python.")
+        assert provider == "openai"
+
+    # Two failures eject the broken endpoint; the third call skips it.
+    broken_stats = broken_fake.get("/_fake/stats").json()
+    assert sum(count for key, count in broken_stats.items() if key.startswith("status_5")) == 2
+    assert healthy_fake.get("/_fake/stats").json()["status_200"] == 3
+    assert runtime_metrics.snapshot()["counters"]["provider.failovers"] - failovers == 2
+
+    status = client.get("/status").json()
+    assert status["checks"]["llm_endpoints"] == "ok"
+    endpoints = {endpoint["name"]: endpoint for endpoint in status["llm_endpoints"]}
+    assert endpoints["broken"]["healthy"] is False
+    assert endpoints["broken"]["errors"] == 2
+    assert endpoints["healthy"]["healthy"] is True
+    assert endpoints["healthy"]["calls"] == 3
+    assert endpoints["healthy"]["ewma_ms"] is not None
+    assert "api_key" not in endpoints["healthy"]
+
+
+def _status_error(error_class, status_code: int):
+    response = httpx.Response(status_code, request=httpx.Request("POST", "http://testserver/v1"))
+    return error_class("provider error", response=response, body=None)
+
+
+@pytest.mark.parametrize(
+    "error_class, status_code", [(BadRequestError, 400), (UnprocessableEntityError, 422)]
+)
+def test_client_errors_are_not_retried_on_other_endpoints(error_class, status_code):
+    calls = []
+
+    def request(client, endpoint):
+        calls.append(endpoint.name)
+        raise _status_error(error_class, status_code)
+
+    pool = ProviderPool(
+        [ProviderEndpoint("a", "key", "model"), ProviderEndpoint("b", "key", "model")],
+        failure_threshold=1,
+    )
+    pool._client = lambda endpoint: None
+    with pytest.raises(error_class):
+        pool.call(request)
+    assert len(calls) == 1
+    assert all(endpoint["healthy"] for endpoint in pool.snapshot())
+
+
+@pytest.mark.parametrize(
+    "error_class, status_code",
+    [(AuthenticationError, 401), (PermissionDeniedError, 403), (NotFoundError, 404)],
+)
+def test_endpoint_specific_client_errors_fail_over(error_class, status_code):
+    def request(client, endpoint):
+        if endpoint.name == "misconfigured":
+            raise _status_error(error_class, status_code)
+        return endpoint.name
+
+    pool = ProviderPool(
+        [
+            ProviderEndpoint("misconfigured", "key", "model", weight=1000),
+            ProviderEndpoint("ok", "key", "model"),
+        ],
+        failure_threshold=1,
+        rng=random.Random(1),
+    )
+    pool._client = lambda endpoint: None
+
+    assert pool.call(request) == "ok"
+    health = {endpoint["name"]: endpoint["healthy"] for endpoint in pool.snapshot()}
+    assert health == {"misconfigured": False, "ok": True}
+
+
+def test_routing_prefers_faster_endpoints_by_weight():
+    pool = ProviderPool(
+        [ProviderEndpoint("fast", "key", "model"), ProviderEndpoint("slow", "key", "model")],
+        rng=random.Random(5),
+    )
+    pool._client = lambda endpoint: None
+    # Seed the latency averages: "slow" takes four times as long.
+    pool._states[0].ewma_ms = 100.0
+    pool._states[1].ewma_ms = 400.0
+    pool._record_success = lambda state, elapsed_ms: None
+
+    picks = Counter(pool.call(lambda client, endpoint: endpoint.name) for _ in range(2000))
+    assert 0.75 < picks["fast"] / 2000 < 0.85
+
+
+def test_build_pool_from_settings(monkeypatch):
+    monkeypatch.setattr(
+        settings,
+        "openai_endpoints",
+        [
+            {"name": "us", "api_key": "k1", "base_url": "http://us.example/v1", "weight": 3},
+            {"name": "eu", "api_key": "k2", "model": "gpt-4o"},
+            {"name": "no-key", "base_url": "http://proxy.example/v1"},
+        ],
+    )
+    pool = build_pool(settings)
+    assert [(e.name, e.model, e.weight) for e in pool.endpoints] == [
+        ("us", settings.openai_model, 3.0),
+        ("eu", "gpt-4o", 1.0),
+    ]
+
+    monkeypatch.setattr(settings, "openai_endpoints", [])
+    monkeypatch.setattr(settings, "openai_api_key", None)
+    assert build_pool(settings) is None
+
+
+def _hedging_pool(budget_percent: float, hedge_workers: int = 32) -> ProviderPool:
+    pool = ProviderPool(
+        [
+            ProviderEndpoint("primary", "key", "model", weight=1000),
+            ProviderEndpoint("backup", "key", "model"),
+        ],
+        hedge_percentile=50,
+        hedge_budget_percent=budget_percent,
+        hedge_min_samples=3,
+        hedge_workers=hedge_workers,
+        rng=random.Random(2),
+    )
+    pool._client = lambda endpoint: None
+    for _ in range(3):
+        pool.call(lambda client, endpoint: endpoint.name, kind="answer")
+    return pool
+
+
+def _counter(name: str) -> float:
+    return runtime_metrics.snapshot()["counters"].get(name, 0)
+
+
+def test_slow_calls_are_hedged_to_another_endpoint():
+    pool = _hedging_pool(budget_percent=100)
+    release = threading.Event()
+
+    def request(client, endpoint):
+        if endpoint.name == "primary":
+            release.wait(5)
+        return endpoint.name
+
+    hedges, wins = _counter("provider.hedges"), _counter("provider.hedge_wins")
+    try:
+        assert pool.call(request, kind="answer") == "backup"
+    finally:
+        release.set()
+    assert _counter("provider.hedges") - hedges == 1
+    assert _counter("provider.hedge_wins") - wins == 1
+
+
+def test_hedges_stop_when_the_budget_is_spent():
+    pool = _hedging_pool(budget_percent=0)
+    calls = []
+
+    def request(client, endpoint):
+        calls.append(endpoint.name)
+        time.sleep(0.05)
+        return endpoint.name
+
+    over_budget = _counter("provider.hedges_over_budget")
+    assert pool.call(request, kind="answer") == "primary"
+    assert calls == ["primary"]
+    assert _counter("provider.hedges_over_budget") - over_budget == 1
+
+
+def test_queueing_for_a_worker_does_not_trigger_hedges():
+    pool = _hedging_pool(budget_percent=100, hedge_workers=2)
+
+    def request(client, endpoint):
+        time.sleep(0.02)
+        return endpoint.name
+
+    # Seed the hedge delay with the real call latency.
+    for _ in range(5):
+        pool.call(request, kind="answer")
+    hedges = _counter("provider.hedges")
+
+    # Twelve concurrent calls share two workers, so most wait far longer
+    # than the hedge delay before they start.
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(pool.call(request, kind="answer")))
+        for _ in range(12)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == ["primary"] * 12
+    assert _counter("provider.hedges") - hedges == 0
+    assert pool._executor._max_workers == 2
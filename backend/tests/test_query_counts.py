@@ -0,0 +1,95 @@
+from fastapi.testclient import TestClient
+
+from app.core import middleware
+from app.core.request_context import RequestContext
+from app.core.runtime_metrics import runtime_metrics
+from tests.conftest import create_user
+
+
+def test_write_endpoint_query_budgets(client: TestClient, assert_max_queries):
+    # Email check, rollup upsert, insert, refresh.
+    with assert_max_queries(4):
+        headers = create_user(client, "query_budget_writes@example.com")
+
+    # Header user lookup, near-duplicate band lookup, insert, skill index
+    # insert, fingerprint insert, rollup upsert, refresh; the body user is
+    # not looked up again.
+    with assert_max_queries(7):
+        resp = client.post(
+            "/api/resume/analyze",
+            headers=headers,
+            json={"resume_text": "Resume of a Python and SQL developer, used to check write budgets."},
+        )
+    analysis_id = resp.json()["id"]
+
+    with assert_max_queries(5):
+        client.post(
+            "/api/generate/answer",
+            headers=headers,
+            json={"resume_analysis_id": analysis_id, "question": "Budget question?"},
+        )
+
+    # Header user lookup, analysis lookup, then deletes of its answers, skill
+    # index rows, fingerprint rows and the analysis itself.
+    with assert_max_queries(6):
+        client.delete(f"/api/resume/{analysis_id}", headers=headers)
+
+
+def test_read_endpoint_query_budgets(client: TestClient, assert_max_queries):
+    headers = create_user(client, "query_budget_reads@example.com")
+    analysis_id = client.post(
+        "/api/resume/analyze",
+        headers=headers,
+        json={"resume_text": "Resume used to check the query budget of reads."},
+    ).json()["id"]
+    for i in range(3):
+        client.post(
+            "/api/generate/answer",
+            headers=headers,
+            json={"resume_analysis_id": analysis_id, "question": f"Read budget {i}?"},
+        )
+
+    # List endpoints must not grow with the number of rows returned.
+    with assert_max_queries(2):
+        client.get("/api/resume", headers=headers)
+    with assert_max_queries(2):
+        client.get("/api/answers", headers=headers)
+    with assert_max_queries(2):
+        client.get(f"/api/resume/{analysis_id}/answers")
+    with assert_max_queries(1):
+        client.get(f"/api/resume/{analysis_id}")
+    # Header user lookup plus one statement for all counts.
+    with assert_max_queries(2):
+        client.get("/api/metrics/summary", headers=headers)
+    with assert_max_queries(3):
+        client.get("/api/export", headers=headers)
+    # Header user, metrics, recent analyses, recent answers, analysis answers.
+    with assert_max_queries(5):
+        client.get(f"/api/dashboard?resume_analysis_id={analysis_id}", headers=headers)
+    # Header user plus one statement for the page of matches.
+    with assert_max_queries(2):
+        client.get("/api/resume/search?skills=Python&skills=SQL&match=any", headers=headers)
+    # Header user plus one statement for the whole series.
+    with assert_max_queries(2):
+        client.get("/api/metrics/timeseries?bucket=day&scope=user", headers=headers)
+
+
+def test_debug_query_headers(client: TestClient, monkeypatch):
+    monkeypatch.setattr(middleware.settings, "debug_query_headers", True)
+
+    resp = client.get("/status")
+    assert resp.headers["x-db-query-count"] == "1"
+    assert float(resp.headers["x-db-time-ms"]) >= 0
+
+
+def test_repeated_statement_is_flagged(monkeypatch):
+    monkeypatch.setattr(middleware.settings, "n_plus_one_threshold", 3)
+    context = RequestContext(request_id="n-plus-one")
+    for _ in range(3):
+        context.record_query("SELECT * FROM interview_answers WHERE id = ?", 0.1)
+
+    before = runtime_metrics.snapshot()["counters"].get("db.n_plus_one_requests", 0)
+    middleware._check_repeated_statements({"method": "GET", "path": "/x"}, context)
+    after = runtime_metrics.snapshot()["counters"]["db.n_plus_one_requests"]
+
+    assert after == before + 1
@@ -0,0 +1,237 @@
+import json
+from datetime import date
+
+import pytest
+from fastapi.testclient import TestClient
+from openai import OpenAI
+
+from app.agents import job_assistant
+from app.agents.provider_pool import ProviderEndpoint, ProviderPool
+from app.core import rate_limit
+from app.core.config import settings
+from app.core.rate_limit import DailyQuota, TokenBucketLimiter
+from app.core.request_context import RequestContext, reset_request_context, set_request_context
+from benchmarks.fake_openai import FakeOpenAIConfig, create_fake_openai_app
+from tests.conftest import create_user
+
+
+@pytest.fixture
+def rate_limits(monkeypatch):
+    monkeypatch.setattr(settings, "rate_limit_enabled", True)
+    monkeypatch.setattr(settings, "generate_burst", 2)
+    monkeypatch.setattr(settings, "generate_rate_per_minute", 1)
+    monkeypatch.setattr(settings, "read_burst", 3)
+    monkeypatch.setattr(settings, "read_rate_per_minute", 1)
+    rate_limit.generate_limiter.reset()
+    rate_limit.read_limiter.reset()
+    rate_limit.llm_quota.reset()
+    yield
+    rate_limit.generate_limiter.reset()
+    rate_limit.read_limiter.reset()
+    rate_limit.llm_quota.reset()
+
+
+@pytest.fixture
+def fake_provider(monkeypatch):
+    fake_app = create_fake_openai_app(FakeOpenAIConfig(latency_ms=0, output_tokens=50))
+    openai_client = OpenAI(
+        api_key="fake", base_url="http://testserver/v1", http_client=TestClient(fake_app)
+    )
+    monkeypatch.setattr(
+        job_assistant,
+        "pool",
+        ProviderPool([ProviderEndpoint("fake", "fake", "gpt-4o-mini", client=openai_client)]),
+    )
+    monkeypatch.setattr(settings, "llm_provider", "openai")
+    monkeypatch.setattr(settings, "openai_api_key", "fake")
+
+
+def _analyze(client: TestClient, headers: dict[str, str], reuse_similar_summary: bool = True):
+    return client.post(
+        "/api/resume/analyze",
+        headers=headers,
+        json={
+            "resume_text": "Python developer with FastAPI and SQL experience.",
+            "reuse_similar_summary": reuse_similar_summary,
+        },
+    )
+
+
+def test_generate_limit_is_per_user_with_headers(client: TestClient, rate_limits):
+    alice = create_user(client, "limit_alice@example.com")
+    bob = create_user(client, "limit_bob@example.com")
+
+    first = _analyze(client, alice)
+    assert first.status_code == 201
+    assert first.headers["ratelimit-limit"] == "2"
+    assert first.headers["ratelimit-remaining"] == "1"
+    assert first.headers["ratelimit-policy"] == "2;w=120"
+
+    assert _analyze(client, alice).status_code == 201
+    limited = _analyze(client, alice)
+    assert limited.status_code == 429
+    assert limited.json()["detail"] == "Rate limit exceeded. Try again later."
+    assert limited.headers["ratelimit-remaining"] == "0"
+    assert 1 <= int(limited.headers["retry-after"]) <= 60
+
+    # Another user has an independent bucket, and reads use a separate limit.
+    assert _analyze(client, bob).status_code == 201
+    assert client.get("/api/resume", headers=alice).status_code == 200
+
+
+def test_read_limit(client: TestClient, rate_limits):
+    headers = create_user(client, "limit_reader@example.com")
+
+    statuses = [client.get("/api/answers", headers=headers).status_code for _ in range(4)]
+    assert statuses == [200, 200, 200, 429]
+
+
+def test_daily_llm_call_quota(client: TestClient, rate_limits, fake_provider, monkeypatch):
+    monkeypatch.setattr(settings, "generate_burst", 100)
+    monkeypatch.setattr(settings, "daily_llm_calls", 2)
+    headers = create_user(client, "limit_quota@example.com")
+
+    # Reused summaries make no LLM call, so every request opts out of reuse.
+    assert _analyze(client, headers, reuse_similar_summary=False).status_code == 201
+    assert _analyze(client, headers, reuse_similar_summary=False).status_code == 201
+    resp = _analyze(client, headers, reuse_similar_summary=False)
+
+    assert resp.status_code == 429
+    assert resp.json()["detail"] == "Daily LLM quota exceeded. Try again tomorrow."
+    assert 1 <= int(resp.headers["retry-after"]) <= 86400
+
+
+def test_daily_llm_token_quota_counts_provider_usage(
+    client: TestClient, rate_limits, fake_provider, monkeypatch
+):
+    monkeypatch.setattr(settings, "daily_llm_tokens", 60)
+    headers = create_user(client, "limit_tokens@example.com")
+
+    first = _analyze(client, headers)
+    assert first.status_code == 201
+    assert first.json()["provider"] == "openai"
+
+    calls, tokens = rate_limit.llm_quota.usage(f"user:{headers['X-User-Id']}")
+    assert calls == 1
+    assert tokens > 50
+
+    assert _analyze(client, headers).status_code == 429
+
+
+def test_stub_responses_are_not_charged(client: TestClient, rate_limits, monkeypatch):
+    monkeypatch.setattr(settings, "generate_burst", 100)
+    monkeypatch.setattr(settings, "daily_llm_calls", 1)
+    headers = create_user(client, "limit_stub@example.com")
+
+    for _ in range(3):
+        resp = _analyze(client, headers, reuse_similar_summary=False)
+        assert resp.status_code == 201
+        assert resp.json()["provider"] == "stub"
+    assert rate_limit.llm_quota.usage(f"user:{headers['X-User-Id']}") == (0, 0)
+
+
+def test_map_reduce_summaries_are_charged_per_provider_call(rate_limits, fake_provider, monkeypatch):
+    monkeypatch.setattr(settings, "summary_map_reduce_threshold_chars", 500)
+    monkeypatch.setattr(settings, "summary_chunk_chars", 200)
+    monkeypatch.setattr(settings, "daily_llm_calls", 0)
+    resume = "\n\n".join(
+        f"{heading}\n" + "\n".join(f"{heading} detail line {i} with some words." for i in range(4))
+        for heading in ("EXPERIENCE", "EDUCATION", "PROJECTS", "PUBLICATIONS")
+    )
+
+    token = set_request_context(RequestContext(request_id="quota", llm_quota_key="user:map"))
+    try:
+        _, provider = job_assistant.summarize_resume(resume)
+    finally:
+        reset_request_context(token)
+
+    assert provider == "openai"
+    chunks = len(job_assistant._chunk_resume(resume, 200))
+    assert chunks > 1
+    assert rate_limit.llm_quota.usage("user:map")[0] == chunks + 1
+
+
+def test_import_stops_calling_the_provider_at_the_quota(
+    client: TestClient, rate_limits, fake_provider, monkeypatch
+):
+    monkeypatch.setattr(settings, "daily_llm_calls", 2)
+    headers = create_user(client, "limit_import@example.com")
+    body = "".join(
+        json.dumps(
+            {
+                "record_type": "resume_analysis",
+                "resume_text": f"Imported resume number {i} for a Python developer.",
+            }
+        )
+        + "\n"
+        for i in range(5)
+    )
+
+    resp = client.post("/api/import", headers=headers, content=body.encode())
+
+    assert resp.status_code == 200
+    assert resp.json()["resume_analyses_imported"] == 5
+    assert resp.json()["summaries_pending"] == 3
+    assert rate_limit.llm_quota.usage(f"user:{headers['X-User-Id']}")[0] == 2
+
+
+def test_deferred_summary_backfill_is_charged_to_the_importer(
+    client: TestClient, rate_limits, fake_provider, monkeypatch
+):
+    monkeypatch.setattr(settings, "daily_llm_calls", 2)
+    headers = create_user(client, "limit_backfill@example.com")
+    body = "".join(
+        json.dumps(
+            {
+                "record_type": "resume_analysis",
+                "resume_text": f"Deferred resume number {i} for a Python developer.",
+            }
+        )
+        + "\n"
+        for i in range(3)
+    )
+
+    # TestClient runs the backfill background task before returning.
+    resp = client.post(
+        "/api/import?defer_summaries=true", headers=headers, content=body.encode()
+    )
+
+    assert resp.status_code == 200
+    assert resp.json()["summaries_pending"] == 3
+    assert rate_limit.llm_quota.usage(f"user:{headers['X-User-Id']}")[0] == 2
+    summaries = [a["summary"] for a in client.get("/api/resume", headers=headers).json()]
+    assert summaries.count("") == 1
+
+
+def test_token_bucket_refills_and_evicts_idle_buckets():
+    limiter = TokenBucketLimiter(max_keys=100, idle_seconds=10)
+
+    assert limiter.hit("a", capacity=1, refill_per_second=1, now=0).allowed
+    denied = limiter.hit("a", capacity=1, refill_per_second=1, now=0.5)
+    assert not denied.allowed
+    assert denied.retry_after == pytest.approx(0.5)
+    assert limiter.hit("a", capacity=1, refill_per_second=1, now=1.5).allowed
+
+    limiter.hit("b", capacity=1, refill_per_second=1, now=2)
+    assert len(limiter) == 2
+    limiter.hit("c", capacity=1, refill_per_second=1, now=11.8)
+    # "a" was last seen at 1.5 and has been idle for over 10 seconds.
+    assert len(limiter) == 2
+
+
+def test_limiter_and_quota_state_are_bounded():
+    limiter = TokenBucketLimiter(max_keys=3, idle_seconds=3600)
+    for i in range(10):
+        limiter.hit(f"user:{i}", capacity=5, refill_per_second=1, now=i)
+    assert len(limiter) == 3
+
+    quota = DailyQuota(max_keys=3)
+    for i in range(10):
+        quota.record(f"user:{i}", calls=1, tokens=10, today=date(2025, 1, 1))
+    assert len(quota) == 3
+
+    # Usage from a previous day is dropped when the day changes.
+    quota.record("user:new", calls=1, tokens=5, today=date(2025, 1, 2))
+    assert len(quota) == 1
+    assert quota.usage("user:9", today=date(2025, 1, 2)) == (0, 0)
+    assert quota.usage("user:new", today=date(2025, 1, 2)) == (1, 5)
@@ -0,0 +1,39 @@
+from fastapi.testclient import TestClient
+
+
+def _timing_names(header: str) -> set[str]:
+    return {part.split(";")[0].strip() for part in header.split(",")}
+
+
+def test_status_has_request_id_and_server_timing(client: TestClient):
+    resp = client.get("/status")
+    assert resp.status_code == 200
+
+    assert len(resp.headers["x-request-id"]) == 32
+    assert {"db", "total"} <= _timing_names(resp.headers["server-timing"])
+
+
+def test_incoming_request_id_is_echoed(client: TestClient):
+    resp = client.get("/status", headers={"X-Request-Id": "client-abc.123"})
+    assert resp.headers["x-request-id"] == "client-abc.123"
+
+    resp = client.get("/status", headers={"X-Request-Id": "bad id with spaces"})
+    assert resp.headers["x-request-id"] != "bad id with spaces"
+
+
+def test_analyze_resume_reports_auth_db_and_provider_timings(client: TestClient):
+    user_resp = client.post(
+        "/api/users",
+        json={"email": "timing_user@example.com", "full_name": "Timing User"},
+    )
+    user_id = user_resp.json()["id"]
+
+    resp = client.post(
+        "/api/resume/analyze",
+        headers={"X-User-Id": str(user_id)},
+        json={"resume_text": "Resume used to check Server-Timing sub-timings."},
+    )
+    assert resp.status_code == 201
+    assert {"auth", "db", "provider", "total"} <= _timing_names(
+        resp.headers["server-timing"]
+    )
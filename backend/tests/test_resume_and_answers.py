@@ -567,6 +567,46 @@ def test_list_resume_analyses_scoped_by_header_user(client: TestClient):
     assert all(item["provider"] in ("stub", "openai") for item in items)
 
 
+def test_list_resume_analyses_includes_answer_stats(client: TestClient):
+    user_resp = client.post(
+        "/api/users",
+        json={"email": "list_resume_stats@example.com", "full_name": "List Resume Stats"},
+    )
+    assert user_resp.status_code == 201
+    headers = {"X-User-Id": str(user_resp.json()["id"])}
+
+    analysis_ids = []
+    for i in range(2):
+        resp = client.post(
+            "/api/resume/analyze",
+            headers=headers,
+            json={"resume_text": f"Resume {i} for answer stats - Python backend developer."},
+        )
+        assert resp.status_code == 201
+        analysis_ids.append(resp.json()["id"])
+
+    answers = []
+    for question in ("Tell me about yourself.", "Why this company?"):
+        resp = client.post(
+            "/api/generate/answer",
+            headers=headers,
+            json={"resume_analysis_id": analysis_ids[0], "question": question},
+        )
+        assert resp.status_code == 201
+        answers.append(resp.json())
+
+    items = client.get("/api/resume", headers=headers).json()
+    assert [item["id"] for item in items] == analysis_ids[::-1]
+    assert items[0]["answer_count"] == 0
+    assert items[0]["last_answer_at"] is None
+    assert items[1]["answer_count"] == 2
+    assert items[1]["last_answer_at"] == max(answer["created_at"] for answer in answers)
+
+    # Stats are computed for the requested page.
+    page = client.get("/api/resume?limit=1&offset=1", headers=headers).json()
+    assert [(item["id"], item["answer_count"]) for item in page] == [(analysis_ids[0], 2)]
+
+
 def test_list_answers_scoped_by_header_user(client: TestClient):
     # Create two users
     user1_resp = client.post(
@@ -0,0 +1,133 @@
+import json
+from datetime import date
+
+from fastapi.testclient import TestClient
+
+from app.services.resume_parser import (
+    PARSER_VERSION,
+    compact_resume_text,
+    extract_years_experience,
+    parse_resume,
+    split_sections,
+)
+
+RESUME = """Jane Doe
+jane@example.com | +1 555 123 4567 | github.com/jane
+
+SUMMARY
+Senior Software Engineer with 7+ years of experience. I like to go hiking.
+
+EXPERIENCE
+Sr. Backend Engineer, Acme (2019 - Present)
+- Built REST APIs with FastAPI, PostgreSQL and Redis; CI/CD with GitHub Actions.
+Software Developer, Beta Corp (2015 – 2019)
+- Wrote Go services and some C++; used Node.js and .NET.
+
+Education
+B.Sc. in Computer Science, 2008 - 2012
+
+Technical Skills:
+Python, C#, Kubernetes, scikit-learn
+"""
+
+
+def test_parse_resume_extracts_skills_titles_and_degrees():
+    parsed = parse_resume(RESUME)
+
+    assert parsed.skills == [
+        "REST APIs",
+        "FastAPI",
+        "PostgreSQL",
+        "Redis",
+        "CI/CD",
+        "Go",
+        "C++",
+        "Node.js",
+        ".NET",
+        "Python",
+        "C#",
+        "Kubernetes",
+        "scikit-learn",
+    ]
+    assert parsed.titles == [
+        "Senior Software Engineer",
+        "Senior Backend Engineer",
+        "Software Developer",
+    ]
+    assert parsed.degrees == ["bachelor"]
+    assert [section["name"] for section in parsed.sections] == [
+        "header",
+        "summary",
+        "experience",
+        "education",
+        "skills",
+    ]
+
+
+def test_ambiguous_skills_need_exact_case():
+    assert "Go" not in parse_resume("I go to meetups and write C code in R&D.").skills
+    assert parse_resume("Languages: Go, R and C").skills == ["Go", "R", "C"]
+
+
+def test_everyday_words_are_not_skills():
+    prose = (
+        "I excel at getting some rest after a busy spring. Quick and swift, I bring\n"
+        "unity to every team, ci vous plait, one node at a time, carrying the torch."
+    )
+    assert parse_resume(prose).skills == []
+    assert parse_resume("Tools: Excel, REST, Spring, Swift, Unity, CI, Node, Torch").skills == [
+        "Excel",
+        "REST APIs",
+        "Spring",
+        "Swift",
+        "Unity",
+        "CI/CD",
+        "Node.js",
+        "PyTorch",
+    ]
+
+
+def test_years_experience_ignores_education_ranges():
+    sections = split_sections(RESUME)
+    today = date(2024, 6, 1)
+
+    # 2015 - Present covers nine years, more than the stated 7+.
+    assert extract_years_experience(RESUME, sections, today=today) == 9
+    assert extract_years_experience("Engineer with 12 years of backend experience.") == 12
+    assert extract_years_experience("Studied 2010 - 2014.\nEDUCATION\nBSc 2010 - 2014") == 4
+    assert extract_years_experience("No dates here at all.") is None
+
+
+def test_parsed_output_and_prompt_text_leave_out_contact_details():
+    parsed = parse_resume(RESUME)
+    stored = json.dumps(parsed.to_dict())
+    compact = compact_resume_text(RESUME, parsed)
+
+    for detail in ("Jane", "jane@example.com", "555", "github.com"):
+        assert detail not in stored
+    for detail in ("jane@example.com", "555 123", "Technical Skills", "Kubernetes"):
+        assert detail not in compact
+    assert compact.startswith("Jane Doe\nSUMMARY\n")
+    assert "Skills: REST APIs, FastAPI" in parsed.prompt_facts()
+
+
+def test_skills_lines_with_unknown_skills_stay_in_the_prompt_text():
+    text = RESUME + "Languages: Python and Haskell\n- Terraform, OCaml\nFrameworks: FastAPI, Django\n"
+    compact = compact_resume_text(text, parse_resume(text))
+
+    assert compact.endswith("\nSKILLS\nLanguages: Python and Haskell\nTerraform, OCaml")
+    assert "Kubernetes" not in compact and "Django" not in compact
+
+
+def test_analyze_stores_and_returns_parsed_resume(client: TestClient):
+    resp = client.post("/api/resume/analyze", json={"resume_text": RESUME})
+    assert resp.status_code == 201
+    data = resp.json()
+
+    assert data["parsed"]["skills"][:2] == ["REST APIs", "FastAPI"]
+    assert data["parsed"]["version"] == PARSER_VERSION
+    if data["provider"] == "stub":
+        assert "Skills: REST APIs, FastAPI" in data["summary"]
+
+    fetched = client.get(f"/api/resume/{data['id']}").json()
+    assert fetched["parsed"] == data["parsed"]
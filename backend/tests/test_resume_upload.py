@@ -0,0 +1,99 @@
+import io
+import zipfile
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+from app.services import resume_files
+from app.services.resume_files import extract_resume_text
+from tests.conftest import create_user
+
+RESUME = (
+    "Jane Example\n\nEXPERIENCE\nSenior Backend Engineer, Acme (2018 - 2024)\n"
+    "- Built Python and FastAPI services on PostgreSQL.\n"
+)
+_DOCUMENT = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+    "<w:body>{}</w:body></w:document>"
+)
+
+
+@pytest.fixture(scope="module", autouse=True)
+def extraction_pool():
+    yield
+    resume_files.shutdown_pool()
+
+
+def _docx(paragraphs: list[str]) -> bytes:
+    body = "".join(
+        f'<w:p><w:r><w:t xml:space="preserve">{text}</w:t></w:r></w:p>' for text in paragraphs
+    )
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr("[Content_Types].xml", "<Types/>")
+        archive.writestr("word/document.xml", _DOCUMENT.format(body))
+    return buffer.getvalue()
+
+
+def _upload(client: TestClient, filename: str, content: bytes, headers=None, **fields):
+    return client.post(
+        "/api/resume/upload",
+        headers=headers or {},
+        files={"file": (filename, content, "application/octet-stream")},
+        data=fields,
+    )
+
+
+def test_uploaded_files_are_analyzed(client: TestClient):
+    headers = create_user(client, "upload@example.com")
+
+    resp = _upload(client, "resume.txt", RESUME.encode("utf-16"), headers)
+    assert resp.status_code == 201
+    body = resp.json()
+    assert body["resume_text"] == RESUME.strip()
+    assert body["user_id"] == int(headers["X-User-Id"])
+    assert {"Python", "FastAPI", "PostgreSQL"} <= set(body["parsed"]["skills"])
+    assert "extract" in resp.headers["server-timing"]
+
+    resp = _upload(
+        client,
+        "Resume.DOCX",
+        _docx(["Jane Example", "EXPERIENCE", "Senior Backend Engineer, Acme (2018 - 2024)"]),
+        headers,
+        reuse_similar_summary="false",
+    )
+    assert resp.status_code == 201
+    assert resp.json()["resume_text"].splitlines() == [
+        "Jane Example",
+        "EXPERIENCE",
+        "Senior Backend Engineer, Acme (2018 - 2024)",
+    ]
+    assert client.get(f"/api/resume/{resp.json()['id']}").status_code == 200
+
+
+def test_upload_rejects_bad_files(client: TestClient, monkeypatch):
+    assert _upload(client, "resume.pdf", b"%PDF-1.7").status_code == 415
+    resp = client.post("/api/resume/upload", json={"resume_text": RESUME})
+    assert resp.status_code == 415
+
+    resp = _upload(client, "resume.docx", b"not a zip file at all")
+    assert resp.status_code == 400
+    assert resp.json()["detail"] == "The file is not a valid .docx document."
+
+    assert _upload(client, "resume.txt", b"Too short.").status_code == 422
+
+    monkeypatch.setattr(settings, "upload_max_bytes", 100)
+    resp = _upload(client, "resume.txt", RESUME.encode() * 10)
+    assert resp.status_code == 413
+    assert resp.json()["detail"] == "Uploaded file is too large."
+
+
+def test_extracted_text_is_normalized():
+    markdown = "# Jane Example\r\n\r\n\r\n\r\n**Senior** ﬁeld engineer at [Acme](https://acme.example)  \r\n"
+    assert extract_resume_text(markdown.encode(), ".md") == (
+        "Jane Example\n\nSenior field engineer at Acme"
+    )
+    # Not UTF-8: decoded as Windows-1252.
+    assert extract_resume_text("Café\u00a0lead\x00".encode("cp1252"), ".txt") == "Café lead"
@@ -0,0 +1,109 @@
+import argparse
+import json
+import os
+import threading
+import time
+
+from fastapi.testclient import TestClient
+
+from app.core.runtime_metrics import RuntimeMetrics, estimate_percentile
+from app.serve import build_uvicorn_options, prepare_metrics_dir
+
+
+def test_aggregate_merges_worker_files(tmp_path):
+    metrics = RuntimeMetrics(str(tmp_path))
+    metrics.incr("http.requests", 2)
+    metrics.observe("http.request", 20)
+
+    other = {
+        "counters": {"http.requests": 3},
+        "histograms": {
+            "http.request": {
+                "buckets": [0, 0, 0, 0, 3, 0, 0, 0, 0, 0, 0, 0],
+                "count": 3,
+                "sum": 240.0,
+            }
+        },
+    }
+    (tmp_path / "worker-999999.json").write_text(json.dumps(other))
+
+    merged = metrics.aggregate()
+    assert merged["workers"] == 2
+    assert merged["counters"]["http.requests"] == 5
+    assert merged["histograms"]["http.request"]["count"] == 4
+    assert merged["histograms"]["http.request"]["sum"] == 260.0
+
+
+def test_flush_writes_own_snapshot(tmp_path):
+    metrics = RuntimeMetrics(str(tmp_path))
+    metrics.incr("provider.calls")
+    # Recording a metric never writes the file itself.
+    assert not list(tmp_path.iterdir())
+
+    metrics.flush()
+    files = list(tmp_path.glob("worker-*.json"))
+    assert len(files) == 1
+    assert json.loads(files[0].read_text())["counters"] == {"provider.calls": 1}
+
+
+def test_background_flushing_and_concurrent_flushes(tmp_path):
+    metrics = RuntimeMetrics(str(tmp_path), flush_interval=0.01)
+    metrics.start_flushing()
+    try:
+        metrics.incr("provider.calls")
+        deadline = time.monotonic() + 2
+        while not list(tmp_path.glob("worker-*.json")) and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        threads = [threading.Thread(target=metrics.flush) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        metrics.incr("provider.calls")
+    finally:
+        metrics.stop_flushing()
+
+    files = list(tmp_path.iterdir())
+    assert [path.name for path in files] == [f"worker-{os.getpid()}.json"]
+    assert json.loads(files[0].read_text())["counters"] == {"provider.calls": 2}
+
+
+def test_estimate_percentile():
+    metrics = RuntimeMetrics()
+    for value in (1, 2, 3, 4, 60, 70, 80, 90, 95, 99):
+        metrics.observe("latency", value)
+    histogram = metrics.snapshot()["histograms"]["latency"]
+
+    assert estimate_percentile(histogram, 50) <= 100
+    assert 50 <= estimate_percentile(histogram, 95) <= 100
+
+
+def test_runtime_metrics_endpoint(client: TestClient):
+    client.get("/status")
+
+    resp = client.get("/api/metrics/runtime")
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data["workers"] >= 1
+    assert data["counters"]["http.requests"] >= 1
+    assert data["latencies"]["http.request"]["count"] >= 1
+
+
+def test_serve_options_and_metrics_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv("METRICS_MULTIPROC_DIR", str(tmp_path))
+    (tmp_path / "worker-1.json").write_text("{}")
+    monkeypatch.setattr("app.serve.settings.metrics_multiproc_dir", str(tmp_path))
+
+    assert prepare_metrics_dir(workers=4) == str(tmp_path)
+    assert not (tmp_path / "worker-1.json").exists()
+
+    args = argparse.Namespace(
+        host="127.0.0.1", port=9000, workers=4, backlog=1024, keep_alive=10
+    )
+    options = build_uvicorn_options(args)
+    assert options["workers"] == 4
+    assert options["backlog"] == 1024
+    assert options["timeout_keep_alive"] == 10
+    assert options["http"] in ("httptools", "h11")
+    assert options["loop"] in ("uvloop", "asyncio")
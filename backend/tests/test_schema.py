@@ -0,0 +1,50 @@
+import pytest
+from sqlalchemy import create_engine, inspect, text
+
+from app.core.schema import SchemaError, init_schema
+
+# resume_analyses as created before summary_pending and parsed existed.
+LEGACY_RESUME_ANALYSES = """
+CREATE TABLE resume_analyses (
+    id INTEGER NOT NULL PRIMARY KEY,
+    user_id INTEGER,
+    resume_text TEXT NOT NULL,
+    summary TEXT NOT NULL,
+    created_at DATETIME DEFAULT (CURRENT_TIMESTAMP) NOT NULL
+)
+"""
+
+
+def test_init_schema_adds_columns_missing_from_older_databases(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'old.db'}")
+    with engine.begin() as connection:
+        connection.exec_driver_sql(LEGACY_RESUME_ANALYSES)
+        connection.exec_driver_sql(
+            "INSERT INTO resume_analyses (resume_text, summary) VALUES ('Old resume', 'Old summary')"
+        )
+
+    assert init_schema(engine) == ["resume_analyses.summary_pending", "resume_analyses.parsed"]
+    # Running it again is a no-op.
+    assert init_schema(engine) == []
+
+    indexes = {index["name"] for index in inspect(engine).get_indexes("resume_analyses")}
+    assert "ix_resume_analyses_summary_pending" in indexes
+    with engine.begin() as connection:
+        row = connection.execute(
+            text("SELECT summary_pending, parsed FROM resume_analyses")
+        ).one()
+        assert tuple(row) == (0, None)
+        connection.execute(
+            text("INSERT INTO resume_analyses (resume_text, summary) VALUES ('New', 'New')")
+        )
+
+
+def test_init_schema_fails_fast_on_a_schema_it_cannot_upgrade(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'stale.db'}")
+    with engine.begin() as connection:
+        connection.exec_driver_sql(
+            "CREATE TABLE users (id INTEGER NOT NULL PRIMARY KEY, email VARCHAR NOT NULL)"
+        )
+
+    with pytest.raises(SchemaError, match="users.full_name, users.created_at"):
+        init_schema(engine)
@@ -0,0 +1,70 @@
+import json
+from datetime import datetime
+
+from fastapi.responses import JSONResponse
+from fastapi.testclient import TestClient
+
+from app.core.responses import FastJSONResponse, serialized_response
+from app.schemas import InterviewAnswerRead
+from app.schemas.answer import interview_answer_list_adapter
+
+
+def test_fast_json_response_matches_standard_renderer():
+    payloads = [
+        {"status": "ok", "environment": "test", "llm_provider": "stub"},
+        {"total_users": 3, "average": 1.5, "missing": None, "flags": [True, False]},
+        {"detail": "Résumé für Zoë — 履歴書 ✓"},
+        [{"id": 1, "nested": {"a": [1, 2, {"b": "c"}]}}],
+    ]
+    for payload in payloads:
+        assert FastJSONResponse(payload).body == JSONResponse(payload).body
+
+
+def test_serialized_response_matches_response_model_output():
+    rows = [
+        {
+            "id": i,
+            "user_id": None,
+            "resume_analysis_id": 2,
+            "question": f"Qué harías? {i}",
+            "job_title": None,
+            "company_name": "Acme",
+            "answer": "Answer ✓",
+            "created_at": datetime(2025, 1, 1, 9, 30, i),
+            "provider": "stub",
+        }
+        for i in range(3)
+    ]
+    expected = JSONResponse(
+        [InterviewAnswerRead(**row).model_dump(mode="json") for row in rows]
+    ).body
+
+    response = serialized_response(interview_answer_list_adapter, rows)
+    assert response.body == expected
+    assert response.media_type == "application/json"
+
+
+def test_list_endpoint_bytes_are_compact_json(client: TestClient):
+    user_resp = client.post(
+        "/api/users",
+        json={"email": "serialize@example.com", "full_name": "Serialize User"},
+    )
+    assert user_resp.status_code == 201
+    user_id = user_resp.json()["id"]
+
+    resume_resp = client.post(
+        "/api/resume/analyze",
+        headers={"X-User-Id": str(user_id)},
+        json={"resume_text": "Python developer with Ünïcode in the résumé."},
+    )
+    assert resume_resp.status_code == 201
+
+    resp = client.get("/api/resume", headers={"X-User-Id": str(user_id)})
+    assert resp.status_code == 200
+    assert resp.headers["content-type"] == "application/json"
+
+    data = resp.json()
+    assert any(item["id"] == resume_resp.json()["id"] for item in data)
+    assert resp.content == json.dumps(
+        data, ensure_ascii=False, separators=(",", ":")
+    ).encode("utf-8")
@@ -0,0 +1,82 @@
+import json
+
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+
+from app.models import ResumeAnalysis, ResumeSkill
+from app.services.skill_index import rebuild_skill_index
+from tests.conftest import TestingSessionLocal, create_user
+
+
+def _analyze(client: TestClient, headers: dict, resume_text: str) -> int:
+    resp = client.post("/api/resume/analyze", headers=headers, json={"resume_text": resume_text})
+    assert resp.status_code == 201
+    return resp.json()["id"]
+
+
+def _search(client: TestClient, headers: dict, query: str) -> list[int]:
+    resp = client.get(f"/api/resume/search?{query}", headers=headers)
+    assert resp.status_code == 200
+    return [item["id"] for item in resp.json()]
+
+
+def test_search_by_skills_with_and_or_and_user_scoping(client: TestClient):
+    headers = create_user(client, "skill_search@example.com")
+    other = create_user(client, "skill_search_other@example.com")
+    both = _analyze(client, headers, "Platform engineer running Go services on Kubernetes.")
+    go_only = _analyze(client, headers, "Backend developer writing Go and PostgreSQL.")
+    k8s_only = _analyze(client, headers, "Operator of large Kubernetes clusters with Terraform.")
+    _analyze(client, other, "Another user's resume with Go and Kubernetes experience.")
+
+    assert _search(client, headers, "skills=Kubernetes&skills=Go") == [both]
+    # Aliases resolve to the canonical skill; results are newest first.
+    assert _search(client, headers, "skills=k8s&skills=golang&match=any") == [
+        k8s_only,
+        go_only,
+        both,
+    ]
+    assert _search(client, headers, "skills=terraform&limit=1") == [k8s_only]
+
+    client.delete(f"/api/resume/{k8s_only}", headers=headers)
+    assert _search(client, headers, "skills=Kubernetes") == [both]
+
+
+def test_search_rejects_unknown_skills(client: TestClient):
+    resp = client.get("/api/resume/search?skills=Go&skills=basket%20weaving")
+    assert resp.status_code == 400
+    assert resp.json()["detail"] == "Unknown skills: basket weaving."
+
+    assert client.get("/api/resume/search").status_code == 422
+
+
+def test_import_and_rebuild_maintain_the_index(client: TestClient):
+    headers = create_user(client, "skill_index_import@example.com")
+    body = json.dumps(
+        {"record_type": "resume_analysis", "resume_text": "Data engineer with Airflow and Snowflake."}
+    )
+    resp = client.post("/api/import", headers=headers, content=body + "\n")
+    assert resp.status_code == 200
+    imported = _search(client, headers, "skills=Airflow&skills=Snowflake")
+    assert len(imported) == 1
+
+    # A row stored without index entries or parsed data, as before the index existed.
+    with TestingSessionLocal() as db:
+        legacy = ResumeAnalysis(
+            user_id=int(headers["X-User-Id"]),
+            resume_text="Legacy resume of an Airflow pipeline developer.",
+            summary="Legacy.",
+        )
+        db.add(legacy)
+        db.commit()
+        legacy_id = legacy.id
+    assert _search(client, headers, "skills=Airflow") == imported
+
+    with TestingSessionLocal() as db:
+        assert rebuild_skill_index(db, batch_size=2) >= 2
+        skills = db.scalars(
+            select(ResumeSkill.skill).where(ResumeSkill.resume_analysis_id == legacy_id)
+        ).all()
+        assert skills == ["Airflow"]
+        assert db.get(ResumeAnalysis, legacy_id).parsed["skills"] == ["Airflow"]
+
+    assert _search(client, headers, "skills=Airflow") == [legacy_id, *imported]
@@ -0,0 +1,79 @@
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+
+# Generous budgets so the check is stable on slow CI machines while still
+# catching regressions like heavy SDK imports or DB work at import time.
+IMPORT_BUDGET_SECONDS = 3.0
+READY_BUDGET_SECONDS = 1.0
+
+_STARTUP_SCRIPT = """
+import json, sys, time
+started = time.perf_counter()
+import app.main
+imported = time.perf_counter()
+from fastapi.testclient import TestClient
+with TestClient(app.main.app) as client:
+    ready = time.perf_counter()
+    status_code = client.get("/status").status_code
+print(json.dumps({
+    "import_seconds": imported - started,
+    "ready_seconds": ready - imported,
+    "openai_imported": "openai" in sys.modules,
+    "status_code": status_code,
+}))
+"""
+
+
+def _run_startup(tmp_path: Path) -> dict:
+    env = dict(os.environ)
+    env.update(
+        {
+            "LLM_PROVIDER": "stub",
+            "DATABASE_URL": f"sqlite:///{tmp_path / 'startup.db'}",
+            "LOG_DIR": str(tmp_path / "logs"),
+            "LOG_LEVEL": "WARNING",
+        }
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", _STARTUP_SCRIPT],
+        cwd=BACKEND_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def test_import_does_not_touch_database_or_openai(tmp_path: Path):
+    env = dict(os.environ)
+    env.update(
+        {
+            "LLM_PROVIDER": "stub",
+            "DATABASE_URL": f"sqlite:///{tmp_path / 'untouched.db'}",
+            "LOG_DIR": str(tmp_path / "logs"),
+        }
+    )
+    subprocess.run(
+        [sys.executable, "-c", "import app.main"],
+        cwd=BACKEND_DIR,
+        env=env,
+        check=True,
+    )
+
+    assert not (tmp_path / "untouched.db").exists()
+    assert not (tmp_path / "logs").exists()
+
+
+def test_startup_within_budget(tmp_path: Path):
+    timings = _run_startup(tmp_path)
+
+    assert timings["status_code"] == 200
+    assert not timings["openai_imported"]
+    assert timings["import_seconds"] < IMPORT_BUDGET_SECONDS, timings
+    assert timings["ready_seconds"] < READY_BUDGET_SECONDS, timings
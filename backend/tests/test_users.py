@@ -1,4 +1,26 @@
 from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.db import get_db
+from app.core.schema import init_schema
+from app.main import app
+from app.services.purge import purge_user_data
+from tests.conftest import TestingSessionLocal, override_get_db
+
+# interview_answers as created before its foreign keys had ON DELETE CASCADE.
+LEGACY_INTERVIEW_ANSWERS = """
+CREATE TABLE interview_answers (
+    id INTEGER NOT NULL PRIMARY KEY,
+    user_id INTEGER REFERENCES users (id),
+    resume_analysis_id INTEGER REFERENCES resume_analyses (id),
+    question TEXT NOT NULL,
+    job_title VARCHAR,
+    company_name VARCHAR,
+    answer TEXT NOT NULL,
+    created_at DATETIME DEFAULT (CURRENT_TIMESTAMP) NOT NULL
+)
+"""
 
 
 def test_create_and_get_user(client: TestClient):
@@ -40,3 +62,143 @@ def test_create_user_duplicate_email(client: TestClient):
     assert second.status_code == 400
     data = second.json()
     assert data["detail"] == "User with this email already exists."
+
+
+def _create_user_with_resume_and_answers(client: TestClient, email: str) -> tuple[int, int]:
+    user_resp = client.post(
+        "/api/users",
+        json={"email": email, "full_name": "Purge User"},
+    )
+    assert user_resp.status_code == 201
+    user_id = user_resp.json()["id"]
+
+    resume_resp = client.post(
+        "/api/resume/analyze",
+        headers={"X-User-Id": str(user_id)},
+        json={
+            "resume_text": "Resume for purge tests. Backend dev with Python and SQL.",
+        },
+    )
+    assert resume_resp.status_code == 201
+    analysis_id = resume_resp.json()["id"]
+
+    for i in range(3):
+        answer_resp = client.post(
+            "/api/generate/answer",
+            headers={"X-User-Id": str(user_id)},
+            json={
+                "resume_analysis_id": analysis_id,
+                "question": f"Purge question {i}?",
+            },
+        )
+        assert answer_resp.status_code == 201
+
+    return user_id, analysis_id
+
+
+def test_purge_user_data_removes_analyses_and_answers(client: TestClient):
+    user_id, analysis_id = _create_user_with_resume_and_answers(
+        client, "purge_owner@example.com"
+    )
+
+    # An anonymous answer attached to the user's resume is removed by cascade.
+    anon_resp = client.post(
+        "/api/generate/answer",
+        json={
+            "resume_analysis_id": analysis_id,
+            "question": "Anonymous purge question?",
+        },
+    )
+    assert anon_resp.status_code == 201
+
+    resp = client.delete(
+        f"/api/users/{user_id}/data",
+        headers={"X-User-Id": str(user_id)},
+    )
+    assert resp.status_code == 200
+    assert resp.json() == {
+        "user_id": user_id,
+        "resume_analyses_deleted": 1,
+        "answers_deleted": 4,
+    }
+
+    assert client.get(f"/api/resume/{analysis_id}").status_code == 404
+    assert client.get(f"/api/answers/{anon_resp.json()['id']}").status_code == 404
+    assert client.get(f"/api/answers?user_id={user_id}").json() == []
+
+    # The account itself is kept.
+    assert client.get(f"/api/users/{user_id}").status_code == 200
+
+
+def test_purge_user_data_in_small_batches(client: TestClient):
+    user_id, _ = _create_user_with_resume_and_answers(
+        client, "purge_batches@example.com"
+    )
+
+    with TestingSessionLocal() as db:
+        result = purge_user_data(db, user_id, batch_size=1)
+
+    assert result.resume_analyses_deleted == 1
+    assert result.answers_deleted == 3
+
+
+def test_purge_user_data_requires_matching_header_user(client: TestClient):
+    owner_id, _ = _create_user_with_resume_and_answers(client, "purge_target@example.com")
+    other_resp = client.post(
+        "/api/users",
+        json={"email": "purge_intruder@example.com", "full_name": "Intruder"},
+    )
+    other_id = other_resp.json()["id"]
+
+    assert client.delete(f"/api/users/{owner_id}/data").status_code == 401
+
+    resp = client.delete(
+        f"/api/users/{owner_id}/data",
+        headers={"X-User-Id": str(other_id)},
+    )
+    assert resp.status_code == 403
+    assert resp.json()["detail"] == "You do not have permission to delete this user's data."
+
+
+def test_deletes_work_on_a_database_without_cascading_keys(client: TestClient, tmp_path):
+    legacy_engine = create_engine(
+        f"sqlite:///{tmp_path / 'legacy.db'}", connect_args={"check_same_thread": False}
+    )
+    with legacy_engine.begin() as connection:
+        connection.exec_driver_sql(LEGACY_INTERVIEW_ANSWERS)
+    # Like a restart on an old database: existing keys are left as they are.
+    init_schema(legacy_engine)
+    LegacySession = sessionmaker(autocommit=False, autoflush=False, bind=legacy_engine)
+
+    def legacy_get_db():
+        with LegacySession() as db:
+            yield db
+
+    app.dependency_overrides[get_db] = legacy_get_db
+    try:
+        user_id, analysis_id = _create_user_with_resume_and_answers(
+            client, "legacy_schema@example.com"
+        )
+        headers = {"X-User-Id": str(user_id)}
+        resp = client.delete(f"/api/resume/{analysis_id}", headers=headers)
+        assert resp.status_code == 204
+        assert client.get(f"/api/answers?user_id={user_id}").json() == []
+
+        second_id = client.post(
+            "/api/resume/analyze",
+            headers=headers,
+            json={"resume_text": "Second resume for the legacy schema purge test."},
+        ).json()["id"]
+        anon_resp = client.post(
+            "/api/generate/answer",
+            json={"resume_analysis_id": second_id, "question": "Legacy question?"},
+        )
+        assert anon_resp.status_code == 201
+
+        resp = client.delete(f"/api/users/{user_id}/data", headers=headers)
+        assert resp.status_code == 200
+        assert resp.json()["resume_analyses_deleted"] == 1
+        assert resp.json()["answers_deleted"] == 1
+    finally:
+        app.dependency_overrides[get_db] = override_get_db
+        legacy_engine.dispose()
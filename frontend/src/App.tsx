@@ -40,6 +40,15 @@ type MetricsSummary = {
   user_answers: number | null;
 };
 
+type Dashboard = {
+  user_id: number;
+  metrics: MetricsSummary;
+  recent_analyses: ResumeAnalysis[];
+  recent_answers: InterviewAnswer[];
+  resume_analysis_id: number | null;
+  analysis_answers: InterviewAnswer[];
+};
+
 function App() {
   const [appStatus, setAppStatus] = useState<StatusResponse | null>(null);
   const [appStatusError, setAppStatusError] = useState<string | null>(null);
@@ -130,12 +139,33 @@ function App() {
     }
   };
 
-  const fetchMetrics = async (userId: number) => {
+  const applyDashboard = (dashboard: Dashboard) => {
+    setMetrics(dashboard.metrics);
+    setMetricsError(null);
+    if (dashboard.resume_analysis_id != null) {
+      setResumeAnswers(
+        dashboard.analysis_answers.map((item) => ({
+          id: item.id,
+          question: item.question,
+          answer: item.answer,
+          provider: item.provider,
+          created_at: item.created_at ?? null,
+        })),
+      );
+    }
+  };
+
+  // Metrics and the current analysis' answers in one request.
+  const fetchDashboard = async (userId: number, analysisId: number | null = null) => {
     setMetricsError(null);
     setMetricsLoading(true);
 
     try {
-      const response = await fetch(`${API_BASE_URL}/api/metrics/summary`, {
+      const params = new URLSearchParams({ limit: "10" });
+      if (analysisId != null) {
+        params.set("resume_analysis_id", String(analysisId));
+      }
+      const response = await fetch(`${API_BASE_URL}/api/dashboard?${params}`, {
         headers: {
           "X-User-Id": String(userId),
         },
@@ -146,8 +176,7 @@ function App() {
         return;
       }
 
-      const data = (await response.json()) as MetricsSummary;
-      setMetrics(data);
+      applyDashboard((await response.json()) as Dashboard);
     } catch {
       setMetricsError("Network error while fetching metrics.");
     } finally {
@@ -155,6 +184,11 @@ function App() {
     }
   };
 
+  // POST endpoints return the refreshed dashboard inline when a user is known;
+  // without one, the handlers fetch the resume's answers instead.
+  const withDashboard = (path: string) =>
+    currentUserId != null ? `${API_BASE_URL}${path}?include=dashboard` : `${API_BASE_URL}${path}`;
+
   useEffect(() => {
     const fetchStatus = async () => {
       try {
@@ -182,7 +216,7 @@ function App() {
 
   useEffect(() => {
     if (currentUserId != null) {
-      void fetchMetrics(currentUserId);
+      void fetchDashboard(currentUserId);
     }
   }, [currentUserId]);
 
@@ -209,7 +243,7 @@ function App() {
 
     setResumeLoading(true);
     try {
-      const response = await fetch(`${API_BASE_URL}/api/resume/analyze`, {
+      const response = await fetch(withDashboard("/api/resume/analyze"), {
         method: "POST",
         headers: buildHeaders({
           "Content-Type": "application/json",
@@ -237,11 +271,12 @@ function App() {
 
       if (typeof data.id === "number") {
         setResumeAnalysisId(data.id);
-        await fetchAnswersForResume(data.id);
       }
 
-      if (currentUserId != null) {
-        void fetchMetrics(currentUserId);
+      if (data.dashboard) {
+        applyDashboard(data.dashboard as Dashboard);
+      } else if (typeof data.id === "number") {
+        await fetchAnswersForResume(data.id);
       }
 
     } catch (error) {
@@ -264,7 +299,7 @@ function App() {
 
     setAnswerLoading(true);
     try {
-      const response = await fetch(`${API_BASE_URL}/api/generate/answer`, {
+      const response = await fetch(withDashboard("/api/generate/answer"), {
         method: "POST",
         headers: buildHeaders({
           "Content-Type": "application/json",
@@ -301,11 +336,12 @@ function App() {
 
       if (analysisIdFromResponse != null) {
         setResumeAnalysisId(analysisIdFromResponse);
-        await fetchAnswersForResume(analysisIdFromResponse);
       }
 
-      if (currentUserId != null) {
-        void fetchMetrics(currentUserId);
+      if (data.dashboard) {
+        applyDashboard(data.dashboard as Dashboard);
+      } else if (analysisIdFromResponse != null) {
+        await fetchAnswersForResume(analysisIdFromResponse);
       }
 
     } catch (error) {
@@ -315,6 +351,7 @@ function App() {
     }
   };
 
+  // Used when the response has no dashboard (no user is known).
   const fetchAnswersForResume = async (analysisId: number) => {
     try {
       const response = await fetch(
@@ -389,7 +426,7 @@ function App() {
       setResumeAnswers([]);
 
       if (currentUserId != null) {
-        void fetchMetrics(currentUserId);
+        void fetchDashboard(currentUserId);
       }
 
     } catch (error) {
@@ -425,7 +462,7 @@ function App() {
       setResumeAnswers((prev) => prev.filter((a) => a.id !== answerId));
 
       if (currentUserId != null) {
-        void fetchMetrics(currentUserId);
+        void fetchDashboard(currentUserId);
       }
     } catch (error) {
       setAnswerError("Network error while deleting answer.");